@@ -0,0 +1,221 @@
+# benchmarks/bench_analysis_modes.py
+"""
+/foods/analysis/{barcode} 부하 비교: ANALYSIS_PIPELINE_MODE=sync vs async
+- 콜드 미스 N개(느린 외부 API)와 캐시 히트 N개를 번갈아 한꺼번에 요청
+- sync : 동기 엔드포인트 스레드풀 크기(빠른 경로 몫 + upstream bulkhead)만큼의 스레드에서 FoodAnalysisService
+- async: 이벤트 루프 하나에서 AsyncFoodAnalysisService
+- 콜드 미스는 두 모드 모두 각자의 bulkhead 상한까지만 외부 API로 가고 나머지는 503 (서버와 같은 조건)
+- 핵심 지표: 콜드 미스를 몇 개나 받아냈는지(503 수), 캐시 히트 지연(p50/p99)이 얼마나 밀리는지
+- 스텁 외부 API 서버는 별도 프로세스 (같은 프로세스면 스텁 스레드가 GIL을 잡아서 측정이 왜곡됨)
+- DB는 migrations.upgrade로 만든 SQLite 파일(모드별 1개), Redis는 fakeredis (동기/비동기가 같은 서버)
+  호출량 한도는 끔 (스텁 서버라 의미 없음), 이미지 보강도 끔 (응답 뒤 백그라운드 작업이라 양쪽 모두 제외)
+
+실행: python benchmarks/bench_analysis_modes.py
+(필요: fakeredis, httpx, aiosqlite)
+"""
+import asyncio
+import contextlib
+import io
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("FOOD_API_KEY", "bench-food-key")
+os.environ.setdefault("DATA_GO_KR_API_KEY", "bench-data-key")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+import fakeredis
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import bulkhead
+import http_client
+import migrations
+from cache import LocalTTLCache
+from repositories.async_food_repository import AsyncFoodRepository
+from repositories.food_repository import FoodRepository
+from services.food_analysis_service import FoodAnalysisService, AsyncFoodAnalysisService
+from services.score_service import ScoreService
+from tests.stub_upstream import StubUpstream, sample_product
+
+COLD = 200           # 동시에 들어오는 콜드 미스 수
+HOT = 200            # 같은 시간에 들어오는 캐시 히트 수
+THREADS = bulkhead.BULKHEAD_FAST_THREADS + bulkhead.upstream_bulkhead.limit
+DELAYS = {"C005": 0.4, "I1250": 0.3, "C002": 0.3, "NUTRI": 0.8}
+HOT_BARCODE = "8801234567890"
+
+
+class _NoDbAdditiveService:
+    def calculate_count(self, raw_text: str):
+        return 0, ""
+
+
+async def _no_image_async(self, barcode, report_no):
+    return False
+
+
+def cold_barcodes(prefix: str):
+    return [f"{prefix}{i:010d}" for i in range(COLD)]
+
+
+def arrivals(prefix: str):
+    """콜드 미스와 캐시 히트를 번갈아 도착시킴 -> [(cold|hot, 바코드), ...]"""
+    cold = [("cold", b) for b in cold_barcodes(prefix)]
+    hot = [("hot", HOT_BARCODE)] * HOT
+    return [r for pair in zip(cold, hot) for r in pair] + cold[len(hot):] + hot[len(cold):]
+
+
+class _RemoteStub:
+    """별도 프로세스에서 도는 StubUpstream (point만 씀)"""
+    def __init__(self, url: str):
+        self.url = url
+
+    def point(self, repo):
+        return StubUpstream.point(self, repo)
+
+
+def _serve_stub(products, delays, urls, stop):
+    stub = StubUpstream(products=products, delays=delays).start()
+    urls.put(stub.url)
+    stop.wait()
+    stub.stop()
+
+
+def migrated_sqlite(db_path: str):
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False, "timeout": 30})
+    migrations.upgrade(engine)
+    with engine.connect() as conn:
+        # 읽기가 쓰기를 기다리지 않게 (MySQL InnoDB처럼) - 파일에 남으므로 비동기 엔진도 같은 모드
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    return engine
+
+
+def run_sync(stub: _RemoteStub, db_path: str) -> dict:
+    engine = migrated_sqlite(db_path)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    local_cache = LocalTTLCache(maxsize=10000, ttl=60)
+    analysis_cache = LocalTTLCache(maxsize=10000, ttl=60)
+
+    def request(barcode: str, started: float):
+        db = session_factory()
+        try:
+            repo = FoodRepository(db=db, additive_service=_NoDbAdditiveService(),
+                                  score_service=ScoreService(), redis=redis)
+            repo.local_cache, repo.analysis_local_cache = local_cache, analysis_cache
+            repo.session_factory = session_factory
+            stub.point(repo)
+            FoodAnalysisService(repo=repo, calculator=ScoreService()).get_analysis_scores_json(barcode)
+            status = 200
+        except HTTPException as he:
+            status = he.status_code
+        finally:
+            db.close()
+        return time.perf_counter() - started, status
+
+    request(HOT_BARCODE, time.perf_counter())  # 캐시 히트용 제품 미리 적재
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        started = time.perf_counter()
+        # 지연시간은 부하가 들어온 시점(스레드 대기 포함)부터 측정
+        futures = [(kind, pool.submit(request, barcode, started)) for kind, barcode in arrivals("81")]
+        results = {"cold": [], "hot": []}
+        for kind, future in futures:
+            results[kind].append(future.result())
+        total = time.perf_counter() - started
+    engine.dispose()
+    return {"total": total, **results}
+
+
+def run_async(stub: _RemoteStub, db_path: str) -> dict:
+    sync_engine = migrated_sqlite(db_path)
+    server = fakeredis.FakeServer()
+
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", connect_args={"timeout": 30})
+        repo = AsyncFoodRepository(additive_service=_NoDbAdditiveService(), score_service=ScoreService(),
+                                   redis=fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+                                   sync_redis=fakeredis.FakeRedis(server=server, decode_responses=True))
+        repo.session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        repo.sync_session_factory = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+        repo.local_cache = LocalTTLCache(maxsize=10000, ttl=60)
+        repo.analysis_local_cache = LocalTTLCache(maxsize=10000, ttl=60)
+        stub.point(repo)
+        service = AsyncFoodAnalysisService(repo=repo, calculator=ScoreService())
+
+        async def request(barcode: str, started: float):
+            try:
+                await service.get_analysis_scores_json(barcode)
+                status = 200
+            except HTTPException as he:
+                status = he.status_code
+            return time.perf_counter() - started, status
+
+        await request(HOT_BARCODE, time.perf_counter())
+        started = time.perf_counter()
+        tasks = [(kind, asyncio.create_task(request(barcode, started))) for kind, barcode in arrivals("82")]
+        results = {"cold": [], "hot": []}
+        for kind, task in tasks:
+            results[kind].append(await task)
+        total = time.perf_counter() - started
+        await http_client.close_async_http_client()
+        await engine.dispose()
+        return {"total": total, **results}
+
+    try:
+        return asyncio.run(main())
+    finally:
+        sync_engine.dispose()
+
+
+def p(results, q: float) -> float:
+    values = [elapsed for elapsed, _ in results]
+    return statistics.quantiles(values, n=100)[int(q) - 1] * 1000
+
+
+def served(results) -> str:
+    ok = sum(1 for _, status in results if status == 200)
+    return f"{ok}/{len(results)}"
+
+
+def main():
+    products = [sample_product(HOT_BARCODE, "19780001001123")]
+    products += [sample_product(b, f"R{b}") for b in cold_barcodes("81") + cold_barcodes("82")]
+    urls, stop = multiprocessing.Queue(), multiprocessing.Event()
+    server = multiprocessing.Process(target=_serve_stub, args=(products, DELAYS, urls, stop), daemon=True)
+    server.start()
+    stub = _RemoteStub(urls.get(timeout=10))
+    FoodRepository.schedule_image_enrichment = lambda self, barcode, report_no: False
+    AsyncFoodRepository.schedule_image_enrichment = _no_image_async
+    try:
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            results = {
+                "sync": run_sync(stub, os.path.join(tmp, "sync.db")),
+                "async": run_async(stub, os.path.join(tmp, "async.db")),
+            }
+
+        print(f"stub delays: {DELAYS}")
+        print(f"load       : {COLD} cold misses + {HOT} cache hits at once (interleaved)")
+        print(f"limits     : sync threads={THREADS} upstream bulkhead={bulkhead.upstream_bulkhead.limit}"
+              f" / async upstream bulkhead={bulkhead.async_upstream_bulkhead.limit}")
+        print(f"{'mode':6} {'total s':>8} {'cold ok':>8} {'cold p50':>9} {'cold p99':>9}"
+              f" {'hit p50':>9} {'hit p99':>9}  (ms)")
+        for mode, r in results.items():
+            print(f"{mode:6} {r['total']:8.2f} {served(r['cold']):>8} {p(r['cold'], 50):9.0f}"
+                  f" {p(r['cold'], 99):9.0f} {p(r['hot'], 50):9.1f} {p(r['hot'], 99):9.1f}")
+    finally:
+        stop.set()
+        server.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
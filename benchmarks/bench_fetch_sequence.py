@@ -0,0 +1,93 @@
+# benchmarks/bench_fetch_sequence.py
+"""
+콜드 미스(캐시/DB 모두 없음) 1건의 외부 API 조회 시간 비교
+- 순차: C005 -> 영양성분 표 -> I1250 -> C002 -> 영양성분 API (예전 방식)
+- 병렬: C005 -> 영양성분 표 -> (I1250 | C002 | 영양성분 API)  (현재 _fetch_full_data_sequence)
+- 양쪽 모두 같은 4단계만 호출 (이미지는 응답 뒤 백그라운드 보강이라 둘 다 제외)
+- DB는 migrations.upgrade로 만든 인메모리 SQLite, Redis는 fakeredis (호출량 한도 Lua 포함)
+
+실행: python benchmarks/bench_fetch_sequence.py
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("FOOD_API_KEY", "bench-food-key")
+os.environ.setdefault("DATA_GO_KR_API_KEY", "bench-data-key")
+
+import fakeredis
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import migrations
+from repositories.food_repository import FoodRepository
+from services.score_service import ScoreService
+from tests.stub_upstream import StubUpstream, sample_product
+
+BARCODE = "8801234567890"
+REPORT_NO = "19780001001123"
+# 실제 운영에서 관측되는 대략적인 응답시간 (초)
+DELAYS = {"C005": 0.4, "I1250": 0.3, "C002": 0.3, "NUTRI": 0.8}
+ROUNDS = 5
+
+
+class _NoDbAdditiveService:
+    def calculate_count(self, raw_text: str):
+        return 0, ""
+
+
+def run_sequential(repo: FoodRepository):
+    repo._fetch_c005(BARCODE)
+    repo._get_local_nutrition(REPORT_NO)
+    repo._fetch_i1250(REPORT_NO)
+    repo._fetch_c002(REPORT_NO)
+    repo._fetch_nutrition(REPORT_NO)
+
+
+def run_parallel(repo: FoodRepository):
+    repo._fetch_full_data_sequence(BARCODE)
+
+
+def measure(fn, repo) -> float:
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn(repo)
+        samples.append(time.perf_counter() - started)
+    return sum(samples) / len(samples)
+
+
+def main():
+    # 인메모리 SQLite는 연결마다 DB가 따로라서 연결 1개를 공유 (StaticPool)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    migrations.upgrade(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    stub = StubUpstream(products=[sample_product(BARCODE, REPORT_NO)], delays=DELAYS).start()
+    db = session_factory()
+    try:
+        repo = FoodRepository(db=db, additive_service=_NoDbAdditiveService(),
+                              score_service=ScoreService(), redis=fakeredis.FakeRedis(decode_responses=True))
+        repo.session_factory = session_factory
+        stub.point(repo)
+
+        seq = measure(run_sequential, repo)
+        par = measure(run_parallel, repo)
+
+        print(f"stub delays      : {DELAYS}")
+        print(f"sequential (avg) : {seq * 1000:8.1f} ms")
+        print(f"parallel   (avg) : {par * 1000:8.1f} ms")
+        print(f"speedup          : {seq / par:8.2f}x")
+    finally:
+        db.close()
+        stub.stop()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/bench_history_pagination.py
+"""
+스캔 기록 페이지 조회 시간 비교 (스캔 기록이 아주 많은 유저 1명)
+- offset: ORDER BY scanned_at DESC LIMIT 20 OFFSET n  (/history/me, 앞 페이지 행을 전부 읽고 버림)
+- 커서:   (scanned_at, scan_id) < 커서 ... LIMIT 21     (/history/me/page, 인덱스에서 커서 위치로 바로 들어감)
+
+SQLite 파일 DB에 마이그레이션(인덱스 포함)을 적용하고 HISTORY_BENCH_ROWS행(기본 100만)을 채운 뒤 측정
+실행: python benchmarks/bench_history_pagination.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import migrations
+from models.models import ScanHistory
+from repositories.history_repository import (
+    encode_history_cursor, history_list_query, history_page, history_page_query, history_to_dto
+)
+
+ROWS = int(os.getenv("HISTORY_BENCH_ROWS", "1000000"))
+PAGE_SIZE = 20
+ROUNDS = 5
+USER_ID = 1
+DEPTHS = [0, 1_000, 10_000, 100_000, 500_000, ROWS - PAGE_SIZE]
+
+
+def seed(engine):
+    """유저 1명 + 제품 1개 + 스캔 기록 ROWS개 (2개씩 같은 시각)"""
+    base = datetime(2020, 1, 1)
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.execute("INSERT INTO users (user_id, login_id, password_hash) VALUES (?, 'heavy_user', 'x')", (USER_ID,))
+        cur.execute("INSERT INTO foods (food_id, barcode, name) VALUES (1, '8801234567890', '벤치 음료')")
+        batch = 50_000
+        for start in range(0, ROWS, batch):
+            cur.executemany(
+                "INSERT INTO scan_history (scan_id, user_id, food_id, score_total, grade, scanned_at) "
+                "VALUES (?, ?, 1, 50, 'B', ?)",
+                [(i + 1, USER_ID, (base + timedelta(seconds=i // 2)).strftime("%Y-%m-%d %H:%M:%S.000000"))
+                 for i in range(start, min(start + batch, ROWS))]
+            )
+        raw.commit()
+        cur.execute("ANALYZE")
+    finally:
+        raw.close()
+
+
+def measure(fn) -> float:
+    fn()  # 첫 실행(캐시 데우기)은 빼고 측정
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def offset_page(db, depth: int) -> list:
+    """HistoryRepository.get_user_scan_history와 같은 쿼리 (동기 세션으로 측정)"""
+    return [history_to_dto(row) for row in db.execute(history_list_query(USER_ID, depth, PAGE_SIZE))]
+
+
+def cursor_page(db, cursor: str) -> list:
+    """HistoryRepository.get_user_scan_history_page와 같은 쿼리"""
+    return history_page(db.execute(history_page_query(USER_ID, cursor, PAGE_SIZE)).all(), PAGE_SIZE).items
+
+
+def cursor_at(db, depth: int) -> str:
+    """depth번째 행 바로 앞에서 끝난 페이지의 next_cursor (depth=0이면 None = 첫 페이지)"""
+    if depth == 0:
+        return None
+    row = db.execute(
+        select(ScanHistory).where(ScanHistory.user_id == USER_ID)
+        .order_by(ScanHistory.scanned_at.desc(), ScanHistory.scan_id.desc())
+        .offset(depth - 1).limit(1)
+    ).scalar_one()
+    return encode_history_cursor(row)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/history.db")
+        migrations.upgrade(engine)
+        started = time.perf_counter()
+        seed(engine)
+        print(f"Seeded {ROWS:,} scan_history rows in {time.perf_counter() - started:.1f}s\n")
+
+        db = sessionmaker(bind=engine)()
+        print(f"{'depth':>10} | {'offset (ms)':>12} | {'cursor (ms)':>12}")
+        print("-" * 42)
+        for depth in DEPTHS:
+            cursor = cursor_at(db, depth)
+            offset_ids = [r.scan_id for r in offset_page(db, depth)]
+            cursor_ids = [r.scan_id for r in cursor_page(db, cursor)]
+            assert offset_ids == cursor_ids, f"page mismatch at depth {depth}"
+
+            offset_ms = measure(lambda: offset_page(db, depth))
+            cursor_ms = measure(lambda: cursor_page(db, cursor))
+            print(f"{depth:>10,} | {offset_ms:>12.2f} | {cursor_ms:>12.2f}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/bench_history_projection.py
+"""
+스캔 기록 한 페이지 조회 비용 비교 (CPU 시간 / 메모리 할당)
+- ORM:  select(ScanHistory) + joinedload(food) -> ScanHistory/Food 객체 생성, identity map 등록 -> DTO (예전 방식)
+- 컬럼: select(필요한 6개 컬럼) + LEFT JOIN -> Row -> DTO (현재 HistoryRepository와 같은 쿼리)
+
+SQLite 파일 DB에 마이그레이션(인덱스 포함)을 적용하고 유저 1명의 기록 HISTORY_BENCH_ROWS행(기본 1만)을 채운 뒤 측정
+실행: python benchmarks/bench_history_projection.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import joinedload, sessionmaker
+
+import migrations
+from models.dtos import ScanHistoryDTO
+from models.models import ScanHistory
+from repositories.history_repository import history_list_query, history_to_dto
+
+ROWS = int(os.getenv("HISTORY_BENCH_ROWS", "10000"))
+PAGE_SIZES = [20, 100]
+ROUNDS = 200
+USER_ID = 1
+
+
+def seed(engine):
+    base = datetime(2020, 1, 1)
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.execute("INSERT INTO users (user_id, login_id, password_hash) VALUES (?, 'heavy_user', 'x')", (USER_ID,))
+        cur.executemany(
+            "INSERT INTO foods (food_id, barcode, name, image_url) VALUES (?, ?, ?, ?)",
+            [(i, f"88{i:011d}", f"벤치 제품 {i}", f"http://img.test/{i}.jpg") for i in range(1, 501)]
+        )
+        cur.executemany(
+            "INSERT INTO scan_history (scan_id, user_id, food_id, score_total, grade, nutrition_score, "
+            "packaging_score, additives_score, nutrition_weight, packaging_weight, additives_weight, scanned_at) "
+            "VALUES (?, ?, ?, 70, 'C', 70, 70, 70, 0.33, 0.33, 0.33, ?)",
+            [(i + 1, USER_ID, i % 500 + 1, (base + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S.000000"))
+             for i in range(ROWS)]
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def orm_page(db, limit: int):
+    """예전 get_user_scan_history (ORM 객체 + joinedload)"""
+    rows = db.execute(
+        select(ScanHistory).options(joinedload(ScanHistory.food))
+        .where(ScanHistory.user_id == USER_ID)
+        .order_by(ScanHistory.scanned_at.desc(), ScanHistory.scan_id.desc())
+        .limit(limit)
+    ).scalars().all()
+    return [
+        ScanHistoryDTO(scan_id=r.scan_id, product_name=r.food.name if r.food else "알 수 없음",
+                       image_url=r.food.image_url if r.food else None, total_score=r.score_total,
+                       grade=r.grade, created_at=r.scanned_at)
+        for r in rows
+    ]
+
+
+def projected_page(db, limit: int):
+    """HistoryRepository.get_user_scan_history와 같은 쿼리/변환 (동기 세션으로 측정)"""
+    return [history_to_dto(row) for row in db.execute(history_list_query(USER_ID, 0, limit))]
+
+
+def measure(session_factory, fn, limit: int):
+    """요청마다 새 세션 (엔드포인트와 같은 조건) -> 페이지당 CPU ms 중앙값, 할당 최대 KiB"""
+    cpu = []
+    for _ in range(ROUNDS):
+        db = session_factory()
+        started = time.process_time()
+        fn(db, limit)
+        cpu.append(time.process_time() - started)
+        db.close()
+
+    db = session_factory()
+    tracemalloc.start()
+    fn(db, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    return statistics.median(cpu) * 1000, peak / 1024
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/history.db")
+        migrations.upgrade(engine)
+        seed(engine)
+        session_factory = sessionmaker(bind=engine)
+        assert orm_page(session_factory(), 20) == projected_page(session_factory(), 20)
+
+        print(f"{ROWS:,} scan_history rows, median of {ROUNDS} pages\n")
+        print(f"{'page':>5} | {'ORM cpu ms':>10} | {'cols cpu ms':>11} | {'ORM peak KiB':>12} | {'cols peak KiB':>13}")
+        print("-" * 64)
+        for limit in PAGE_SIZES:
+            orm_cpu, orm_mem = measure(session_factory, orm_page, limit)
+            col_cpu, col_mem = measure(session_factory, projected_page, limit)
+            print(f"{limit:>5} | {orm_cpu:>10.3f} | {col_cpu:>11.3f} | {orm_mem:>12.1f} | {col_mem:>13.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
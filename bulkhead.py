@@ -0,0 +1,202 @@
+# bulkhead.py
+"""
+빠른 경로(캐시/DB 히트)와 느린 경로(외부 API 콜드 조회)의 동시 실행 자원 분리 (bulkhead)
+- 콜드 미스는 수 초, 캐시/DB 히트는 수 ms -> 같은 anyio 스레드풀 / DB 연결 풀을 그대로 나눠 쓰면
+  모르는 바코드가 몰릴 때(외부 API 장애 포함) 캐시 히트까지 줄을 섬
+- upstream: 외부 API 콜드 조회(single-flight 대기 포함) 동시 실행 상한
+  자리가 없으면 UPSTREAM_MAX_WAIT_SEC만 기다리고, 그래도 없으면 바로 503 + Retry-After (스레드를 잡고 줄 서지 않음)
+- fast: anyio 스레드풀 크기 = FAST_THREADS + upstream 상한 (main.py lifespan에서 설정)
+  -> 콜드 조회가 upstream 상한을 다 써도 빠른 경로용 스레드는 항상 FAST_THREADS개 남음
+- DB 연결: 콜드 조회에 들어가기 전에 요청 세션의 연결을 풀에 돌려줌 (외부 API 기다리는 동안 잡지 않음)
+  콜드 조회 중 DB 확인은 짧은 세션으로만, upstream 상한은 DB 연결 풀(DB_POOL_SIZE + DB_MAX_OVERFLOW)보다 작게
+  -> 콜드 조회가 한꺼번에 저장하러 와도 빠른 경로용 연결이 남음
+- batch: POST /foods/analysis/batch의 외부 API 조회 동시 실행 상한 (모든 배치 요청 합산)
+  upstream 상한의 절반 이하 -> 배치가 몰려도 단건 콜드 조회 몫의 upstream 자리가 남음
+  자리가 없으면 BATCH_MAX_WAIT_SEC까지 기다림 (배치 안의 바코드끼리 줄 서는 것)
+- async_upstream: 비동기 분석 경로(ANALYSIS_PIPELINE_MODE=async)의 콜드 조회 상한
+  외부 API를 기다리는 동안 스레드도 DB 연결도 잡지 않으므로 upstream보다 크게 (이벤트 루프에서 async_slot으로)
+- 워커(프로세스)마다 따로 셈 (Redis 공유 없음)
+
+설정 (.env): BULKHEAD_FAST_THREADS, BULKHEAD_UPSTREAM_LIMIT, BULKHEAD_UPSTREAM_MAX_WAIT_SEC, BULKHEAD_RETRY_AFTER_SEC,
+            BATCH_FETCH_CONCURRENCY, BULKHEAD_BATCH_MAX_WAIT_SEC, BULKHEAD_ASYNC_UPSTREAM_LIMIT
+"""
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from database import DB_MAX_OVERFLOW, DB_POOL_SIZE
+
+load_dotenv()
+
+BULKHEAD_FAST_THREADS = int(os.getenv("BULKHEAD_FAST_THREADS", "32"))
+BULKHEAD_UPSTREAM_LIMIT = int(os.getenv("BULKHEAD_UPSTREAM_LIMIT", "8"))
+BULKHEAD_UPSTREAM_MAX_WAIT_SEC = float(os.getenv("BULKHEAD_UPSTREAM_MAX_WAIT_SEC", "0"))
+BULKHEAD_RETRY_AFTER_SEC = int(os.getenv("BULKHEAD_RETRY_AFTER_SEC", "2"))
+# 배치 분석에서 외부 API를 동시에 몇 개까지 조회할지 (upstream 상한의 절반으로 줄어들 수 있음)
+BATCH_FETCH_CONCURRENCY = int(os.getenv("BATCH_FETCH_CONCURRENCY", "8"))
+BULKHEAD_BATCH_MAX_WAIT_SEC = float(os.getenv("BULKHEAD_BATCH_MAX_WAIT_SEC", "10"))
+BULKHEAD_ASYNC_UPSTREAM_LIMIT = int(os.getenv("BULKHEAD_ASYNC_UPSTREAM_LIMIT", "64"))
+
+# async_slot이 자리를 다시 확인하는 간격 (이벤트 루프를 막지 않으려고 Condition 대신 짧게 폴링)
+_ASYNC_POLL_SEC = 0.02
+
+
+class BulkheadFull(Exception):
+    """느린 경로 자리가 없어서 외부 API 조회를 시작하지 않은 경우"""
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"{name} bulkhead full (retry after {retry_after}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class Bulkhead:
+    def __init__(self, name: str, limit: int, max_wait: float = 0.0, retry_after: int = 2):
+        self.name = name
+        self.limit = limit
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self._cond = threading.Condition()
+        self.active = 0
+        self.peak = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    @contextmanager
+    def slot(self, max_wait: Optional[float] = None):
+        """자리 1개 사용 (max_wait 안에 못 얻으면 BulkheadFull)"""
+        wait = self.max_wait if max_wait is None else min(self.max_wait, max_wait)
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.active < self.limit, timeout=wait):
+                self._reject()
+            self._enter()
+        try:
+            yield
+        finally:
+            self._leave()
+
+    @asynccontextmanager
+    async def async_slot(self, max_wait: Optional[float] = None):
+        """slot의 비동기 버전 (기다리는 동안 이벤트 루프를 막지 않음)"""
+        wait = self.max_wait if max_wait is None else min(self.max_wait, max_wait)
+        give_up_at = time.monotonic() + wait
+        while True:
+            with self._cond:
+                if self.active < self.limit:
+                    self._enter()
+                    break
+                if time.monotonic() >= give_up_at:
+                    self._reject()
+            await asyncio.sleep(_ASYNC_POLL_SEC)
+        try:
+            yield
+        finally:
+            self._leave()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "active": self.active,
+                "peak": self.peak,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+            }
+
+    def reset(self):
+        with self._cond:
+            self.peak = self.active
+            self.admitted = 0
+            self.rejected = 0
+
+    def _enter(self):
+        self.active += 1
+        self.admitted += 1
+        self.peak = max(self.peak, self.active)
+
+    def _reject(self):
+        self.rejected += 1
+        print(f"[Bulkhead] {self.name} full ({self.active}/{self.limit}), rejecting")
+        raise BulkheadFull(self.name, self.retry_after)
+
+    def _leave(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+
+def upstream_limit(configured: int, pool_size: int, max_overflow: int) -> int:
+    """upstream 상한은 DB 연결 풀보다 최소 1개 작게 (빠른 경로 몫을 남김)"""
+    cap = max(1, pool_size + max_overflow - 1)
+    if configured > cap:
+        print(f"[Bulkhead] BULKHEAD_UPSTREAM_LIMIT={configured} exceeds DB pool ({pool_size}+{max_overflow}), using {cap}")
+        return cap
+    return configured
+
+
+upstream_bulkhead = Bulkhead(
+    "upstream",
+    limit=upstream_limit(BULKHEAD_UPSTREAM_LIMIT, DB_POOL_SIZE, DB_MAX_OVERFLOW),
+    max_wait=BULKHEAD_UPSTREAM_MAX_WAIT_SEC,
+    retry_after=BULKHEAD_RETRY_AFTER_SEC,
+)
+
+
+def batch_limit(configured: int, upstream: int) -> int:
+    """배치 상한은 upstream 상한의 절반 이하 (최소 1) -> 나머지는 단건 콜드 조회 몫"""
+    cap = max(1, upstream // 2)
+    if configured > cap:
+        print(f"[Bulkhead] BATCH_FETCH_CONCURRENCY={configured} exceeds half the upstream limit ({upstream}), using {cap}")
+        return cap
+    return configured
+
+
+batch_bulkhead = Bulkhead(
+    "batch",
+    limit=batch_limit(BATCH_FETCH_CONCURRENCY, upstream_bulkhead.limit),
+    max_wait=BULKHEAD_BATCH_MAX_WAIT_SEC,
+    retry_after=BULKHEAD_RETRY_AFTER_SEC,
+)
+
+
+async_upstream_bulkhead = Bulkhead(
+    "async_upstream",
+    limit=BULKHEAD_ASYNC_UPSTREAM_LIMIT,
+    max_wait=BULKHEAD_UPSTREAM_MAX_WAIT_SEC,
+    retry_after=BULKHEAD_RETRY_AFTER_SEC,
+)
+
+
+def configure_threadpool():
+    """
+    anyio 기본 스레드풀(동기 엔드포인트 실행) 크기 = 빠른 경로 몫 + 느린 경로 상한
+    (이벤트 루프 안에서 호출 - main.py lifespan)
+    """
+    import anyio.to_thread
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = BULKHEAD_FAST_THREADS + upstream_bulkhead.limit
+    print(f"[Bulkhead] threadpool={limiter.total_tokens} (fast {BULKHEAD_FAST_THREADS} + upstream {upstream_bulkhead.limit})")
+
+
+def get_bulkhead_stats() -> dict:
+    """/status/bulkheads 응답"""
+    stats = {
+        "fast_threads": BULKHEAD_FAST_THREADS,
+        "upstream": upstream_bulkhead.snapshot(),
+        "batch": batch_bulkhead.snapshot(),
+        "async_upstream": async_upstream_bulkhead.snapshot(),
+    }
+    try:
+        import anyio.to_thread
+
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        stats["threadpool"] = {"total": limiter.total_tokens, "borrowed": limiter.borrowed_tokens}
+    except Exception:
+        # 이벤트 루프 밖(스크립트/테스트)에서는 스레드풀 정보 없음
+        pass
+    return stats
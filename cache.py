@@ -1,15 +1,190 @@
 # cache.py
-from redis import Redis
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from dotenv import load_dotenv
+from redis import Redis, ConnectionPool
+from redis import asyncio as aioredis
+
+load_dotenv()
+
+# Redis 접속 설정 (.env에서 읽음)
+REDIS_HOST = os.getenv("REDIS_HOST", "4.236.184.102")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+REDIS_DB = int(os.getenv("REDIS_DB", "0"))
+REDIS_PASSWORD = os.getenv("REDIS_PASSWORD") or None
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2.0"))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "2.0"))
+
+# 워커(프로세스) 내부 제품 캐시 설정
+LOCAL_PRODUCT_CACHE_SIZE = int(os.getenv("LOCAL_PRODUCT_CACHE_SIZE", "2000"))
+LOCAL_PRODUCT_CACHE_TTL = float(os.getenv("LOCAL_PRODUCT_CACHE_TTL", "60"))
+
+# 앱 전체에서 공유하는 연결 풀 (main.py lifespan에서 생성/정리)
+_pool: Optional[ConnectionPool] = None
+# 비동기 경로용 풀 (처음 쓸 때 생성)
+_async_pool: Optional[aioredis.ConnectionPool] = None
+
+
+def init_redis_pool() -> ConnectionPool:
+    """연결 풀 생성 (이미 있으면 그대로 반환)"""
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            password=REDIS_PASSWORD,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+            decode_responses=True,  # 필수 (bytes -> str 자동 변환)
+        )
+        print(f"[Cache] Redis pool ready: {REDIS_HOST}:{REDIS_PORT}/{REDIS_DB} (max={REDIS_MAX_CONNECTIONS})")
+    return _pool
+
+
+def close_redis_pool():
+    """앱 종료 시 풀에 있는 연결 전부 정리"""
+    global _pool
+    if _pool is not None:
+        _pool.disconnect()
+        _pool = None
+
+
+def get_redis() -> Redis:
+    """공유 풀을 쓰는 Redis 클라이언트 (클라이언트 객체는 가볍고, 연결은 풀에서 빌림)"""
+    return Redis(connection_pool=init_redis_pool())
 
-# Redis 연결 풀 생성
-# (실제 환경에서는 host, port, db 등을 .env에서 읽어오세요)
-redis_client = Redis(host='localhost', port=6379, db=0, decode_responses=True)
 
 def get_redis_client():
     """FastAPI Depends로 주입하기 위한 함수"""
-    try:
-        yield redis_client
-    finally:
-        # (애플리케이션 종료 시 연결을 닫는 로직이 필요할 수 있으나,
-        #  보통 풀을 사용하면 유지합니다.)
-        pass
\ No newline at end of file
+    yield get_redis()
+
+
+def init_async_redis_pool() -> aioredis.ConnectionPool:
+    """redis.asyncio 연결 풀 생성 (설정은 동기 풀과 동일, 이벤트 루프 안에서 호출)"""
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = aioredis.ConnectionPool(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            password=REDIS_PASSWORD,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+            decode_responses=True,
+        )
+        print(f"[Cache] Async Redis pool ready: {REDIS_HOST}:{REDIS_PORT}/{REDIS_DB} (max={REDIS_MAX_CONNECTIONS})")
+    return _async_pool
+
+
+async def close_async_redis_pool():
+    global _async_pool
+    if _async_pool is not None:
+        await _async_pool.disconnect()
+        _async_pool = None
+
+
+def get_async_redis() -> aioredis.Redis:
+    return aioredis.Redis(connection_pool=init_async_redis_pool())
+
+
+def get_async_redis_client():
+    """FastAPI Depends로 주입하기 위한 함수 (비동기 경로)"""
+    yield get_async_redis()
+
+
+def get_pool_stats() -> dict:
+    """풀 크기 조정용 현황 (생성된 연결 수 / 놀고 있는 연결 / 사용 중인 연결)"""
+    if _pool is None:
+        return {"initialized": False, "max_connections": REDIS_MAX_CONNECTIONS}
+
+    return {
+        "initialized": True,
+        "host": f"{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}",
+        "max_connections": _pool.max_connections,
+        "created_connections": getattr(_pool, "_created_connections", None),
+        "available_connections": len(getattr(_pool, "_available_connections", [])),
+        "in_use_connections": len(getattr(_pool, "_in_use_connections", [])),
+    }
+
+
+# =========================================================
+# 워커 내부 LRU + TTL 캐시 (Redis 앞단 1차 캐시)
+# =========================================================
+class LocalTTLCache:
+    """
+    크기 제한(LRU)과 만료시간(TTL)이 있는 프로세스 내부 캐시
+    - 값은 이미 검증된 객체(DTO)를 그대로 보관 -> 히트 시 네트워크/파싱 없음
+    - 여러 스레드(anyio 워커)에서 같이 쓰므로 lock으로 보호
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)  # 최근 사용으로 갱신
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + (ttl if ttl is not None else self.ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)  # 가장 오래 안 쓴 것부터 버림
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_sec": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# 제품(RawProductAPIDTO) 1차 캐시 - 워커마다 하나
+product_local_cache = LocalTTLCache(LOCAL_PRODUCT_CACHE_SIZE, LOCAL_PRODUCT_CACHE_TTL)
+
+# 분석 결과(AnalysisScoresDTO JSON bytes) 1차 캐시 - 워커마다 하나
+analysis_local_cache = LocalTTLCache(LOCAL_PRODUCT_CACHE_SIZE, LOCAL_PRODUCT_CACHE_TTL)
+
@@ -2,7 +2,6 @@
 from contextlib import asynccontextmanager
 import os
 import re
-import requests
 import hashlib
 
 from dotenv import load_dotenv
@@ -14,6 +13,7 @@ from pydantic import BaseModel
 
 import capston_app.database as database
 import capston_app.models as models
+from http_client import http_get
 
 # 서버 재시작 전 어딘가 한 번 호출 (예: 앱 시작 직후)
 from capston_app.database import engine
@@ -228,7 +228,7 @@ def fetch_and_save_product(code: str, db: Session = Depends(get_db)):
         raise HTTPException(500, "FOOD_API_KEY not set in .env")
 
     url = f"{BASE_URL_FOOD}/{FOOD_API_KEY}/C005/json/1/5/BAR_CD={code}"
-    r = requests.get(url, timeout=10)
+    r = http_get(url, timeout=10)  # 본 앱과 같은 keep-alive 연결 풀 / 재시도 규칙
     if r.status_code != 200:
         raise HTTPException(502, f"Upstream error: {r.status_code}")
 
@@ -0,0 +1,183 @@
+# circuit_breaker.py
+"""
+외부 식품 API 단계별 서킷 브레이커 (C005, I1250, C002, NUTRI, IMG)
+- closed   : 정상. 최근 WINDOW_SEC 동안 호출이 MIN_CALLS개 이상이고 실패율이 FAILURE_RATE 이상이면 open
+- open     : OPEN_SEC 동안 외부 API를 부르지 않고 바로 실패 (타임아웃 3~5초를 기다리지 않음)
+- half_open: OPEN_SEC가 지나면 시험 호출을 HALF_OPEN_CALLS개만 내보냄
+             -> 전부 성공하면 closed, 하나라도 실패하면 다시 open
+- 실패 = 연결 오류/타임아웃, 5xx, 429 (404/422 같은 '제품 없음' 응답은 API가 살아있으므로 성공)
+- 워커(프로세스)마다 따로 판단 (Redis 공유 없음)
+
+설정 (.env): CIRCUIT_FAILURE_RATE, CIRCUIT_MIN_CALLS, CIRCUIT_WINDOW_SEC, CIRCUIT_OPEN_SEC, CIRCUIT_HALF_OPEN_CALLS
+단계별로 다르게 주려면 CIRCUIT_C005_OPEN_SEC 처럼 단계 이름을 붙임
+"""
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+UPSTREAM_STEPS = ("C005", "I1250", "C002", "NUTRI", "IMG")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _setting(step: str, name: str, default: str) -> float:
+    return float(os.getenv(f"CIRCUIT_{step}_{name}", os.getenv(f"CIRCUIT_{name}", default)))
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어서 외부 API를 호출하지 않은 경우"""
+    def __init__(self, step: str, retry_after: int):
+        super().__init__(f"{step} circuit open (retry after {retry_after}s)")
+        self.step = step
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_rate: float = 0.5, min_calls: int = 10,
+                 window_sec: float = 60, open_sec: float = 30, half_open_calls: int = 2,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_sec = window_sec
+        self.open_sec = open_sec
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls = deque()          # (시각, 성공 여부) - closed 상태에서만 쌓음
+        self._failures = 0
+        self.state = CLOSED
+        self._state_since = clock()
+        self._probes = 0               # half_open에서 내보낸 시험 호출 수
+        self._probe_successes = 0
+        self.rejected = 0              # open이라 바로 실패시킨 호출 수
+        self.opened_count = 0
+
+    def allow(self) -> bool:
+        """외부 API를 불러도 되는지 (False면 호출하지 말고 바로 실패 처리)"""
+        with self._lock:
+            now = self._clock()
+            if self.state == OPEN:
+                if now - self._state_since < self.open_sec:
+                    self.rejected += 1
+                    return False
+                self._move(HALF_OPEN, now)
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    # 시험 호출 결과가 OPEN_SEC 넘게 안 오면(요청 취소 등) 새로 내보냄
+                    if now - self._state_since < self.open_sec:
+                        self.rejected += 1
+                        return False
+                    self._move(HALF_OPEN, now)
+                self._probes += 1
+            return True
+
+    def record_success(self):
+        with self._lock:
+            now = self._clock()
+            if self.state == HALF_OPEN:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_calls:
+                    self._move(CLOSED, now)
+            elif self.state == CLOSED:
+                self._add(now, True)
+
+    def record_failure(self):
+        with self._lock:
+            now = self._clock()
+            if self.state == HALF_OPEN:
+                self._move(OPEN, now)
+            elif self.state == CLOSED:
+                self._add(now, False)
+
+    def retry_after(self) -> int:
+        """다시 시도해볼 수 있을 때까지 남은 초 (Retry-After 헤더용, 최소 1)"""
+        with self._lock:
+            remaining = self.open_sec - (self._clock() - self._state_since)
+        return max(1, math.ceil(remaining))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._trim(self._clock())
+            calls = len(self._calls)
+            return {
+                "state": self.state,
+                "calls": calls,
+                "failures": self._failures,
+                "failure_rate": round(self._failures / calls, 4) if calls else 0.0,
+                "rejected": self.rejected,
+                "opened_count": self.opened_count,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._move(CLOSED, self._clock())
+            self.rejected = 0
+            self.opened_count = 0
+
+    def _add(self, now: float, ok: bool):
+        self._calls.append((now, ok))
+        if not ok:
+            self._failures += 1
+        self._trim(now)
+        if len(self._calls) >= self.min_calls and self._failures / len(self._calls) >= self.failure_rate:
+            self._move(OPEN, now)
+
+    def _trim(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window_sec:
+            _, ok = self._calls.popleft()
+            if not ok:
+                self._failures -= 1
+
+    def _move(self, state: str, now: float):
+        if state != self.state:
+            print(f"[Circuit] {self.name}: {self.state} -> {state}")
+        if state == OPEN:
+            self.opened_count += 1
+        self.state = state
+        self._state_since = now
+        self._probes = 0
+        self._probe_successes = 0
+        self._calls.clear()
+        self._failures = 0
+
+
+_breakers: Dict[str, CircuitBreaker] = {
+    step: CircuitBreaker(
+        step,
+        failure_rate=_setting(step, "FAILURE_RATE", "0.5"),
+        min_calls=int(_setting(step, "MIN_CALLS", "10")),
+        window_sec=_setting(step, "WINDOW_SEC", "60"),
+        open_sec=_setting(step, "OPEN_SEC", "30"),
+        half_open_calls=int(_setting(step, "HALF_OPEN_CALLS", "2")),
+    )
+    for step in UPSTREAM_STEPS
+}
+
+
+def get_breaker(step: str) -> CircuitBreaker:
+    return _breakers[step]
+
+
+def get_breaker_stats() -> dict:
+    """/status/circuit-breakers 응답 (단계별 상태, 최근 실패율, open 중 남은 시간)"""
+    stats = {}
+    for step, breaker in _breakers.items():
+        entry = breaker.snapshot()
+        entry["retry_after"] = breaker.retry_after() if entry["state"] != CLOSED else 0
+        stats[step] = entry
+    return stats
+
+
+def reset_breakers():
+    for breaker in _breakers.values():
+        breaker.reset()
@@ -1,33 +1,85 @@
 # capston_app/database.py
+from fastapi import Depends, Request
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
+import itertools
 import os
+import threading
+from typing import Optional
+
+import cache
 
 # 본인 비번/호스트에 맞게 수정
 load_dotenv()
 DB_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(
-    DB_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    future=True,
-    connect_args={
-        "charset": "utf8mb4",
-        "use_unicode": True,
-    },
-)
+# 연결 풀 설정 (.env, 동기/비동기 엔진 각각 이 크기로 만듦)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+def _pool_kwargs(url: str) -> dict:
+    """풀 크기/대기/재활용 설정 (SQLite는 QueuePool이 아니라서 recycle만)"""
+    if url.startswith("sqlite"):
+        return {"pool_recycle": DB_POOL_RECYCLE}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
 
 # 모든 새 커넥션에서 문자셋 확실히 고정
-@event.listens_for(engine, "connect")
 def _set_names_utf8mb4(dbapi_conn, conn_rec):
     with dbapi_conn.cursor() as cur:
         cur.execute("SET NAMES utf8mb4 COLLATE utf8mb4_unicode_ci;")
 
+
+def _create_sync_engine(url: str):
+    """primary / 읽기 복제본 공용 엔진 설정 (로컬 테스트용 SQLite는 문자셋 설정 없이)"""
+    if url.startswith("sqlite"):
+        return create_engine(url, pool_pre_ping=True, future=True, **_pool_kwargs(url))
+    e = create_engine(
+        url,
+        pool_pre_ping=True,
+        future=True,
+        **_pool_kwargs(url),
+        connect_args={
+            "charset": "utf8mb4",
+            "use_unicode": True,
+        },
+    )
+    event.listen(e, "connect", _set_names_utf8mb4)
+    return e
+
+
+engine = _create_sync_engine(DB_URL)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
 
+# =========================================================
+# 읽기 복제본 (.env READ_REPLICA_URLS, 쉼표로 여러 개 -> 세션마다 돌아가며 사용)
+# - 없으면 모든 읽기가 primary (기존과 같음)
+# - 복제 지연 때문에 방금 기록을 남긴 유저는 READ_YOUR_WRITES_SEC 동안 primary에서 읽음
+#   (Redis ryw:user:{user_id} 표시 -> 어느 워커로 가도 같은 판단)
+# - 요청의 유저는 request.state.user_id (인증 단계 / history 라우터에서 넣음, 클라이언트가 따로 지정할 수 없음)
+# =========================================================
+READ_REPLICA_URLS = [u.strip() for u in os.getenv("READ_REPLICA_URLS", "").split(",") if u.strip()]
+READ_YOUR_WRITES_SEC = int(os.getenv("READ_YOUR_WRITES_SEC", "5"))
+
+replica_engines = [_create_sync_engine(url) for url in READ_REPLICA_URLS]
+_replica_sessionmakers = [
+    sessionmaker(autocommit=False, autoflush=False, bind=e, future=True) for e in replica_engines
+]
+_replica_turn = itertools.count()
+_read_routing_stats = {"primary": 0, "replica": 0, "sticky": 0}
+# 동기 엔드포인트는 스레드풀에서 동시에 돌기 때문에 카운터는 락 안에서만 바꿈
+_read_routing_lock = threading.Lock()
+
 # =========================================================
 # DB 세션 DI
 # =========================================================
@@ -36,4 +88,182 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db(request: Request, db=Depends(get_db)):
+    """
+    읽기 전용 조회용 세션 (FastAPI Depends)
+    - 복제본이 있으면 복제본 세션, 없거나 요청 유저가 방금 기록을 남긴 유저면 요청의 primary 세션(get_db) 그대로
+    """
+    if not _replica_sessionmakers:
+        _count_route("primary")
+        yield db
+        return
+    if _recently_wrote(request_user_id(request)):
+        _count_route("sticky")
+        yield db
+        return
+    _count_route("replica")
+    replica = _replica_sessionmakers[next(_replica_turn) % len(_replica_sessionmakers)]()
+    try:
+        yield replica
+    finally:
+        replica.close()
+
+
+def request_user_id(request: Request) -> Optional[int]:
+    """이 요청의 유저 (없으면 None -> 유저별 read-your-writes 없이 복제본)"""
+    return getattr(request.state, "user_id", None)
+
+
+def mark_user_write(user_id: int):
+    """유저가 기록을 남김 -> READ_YOUR_WRITES_SEC 동안 그 유저의 읽기는 primary로 (복제본이 없으면 아무것도 안 함)"""
+    if not _replica_sessionmakers:
+        return
+    try:
+        cache.get_redis().set(_ryw_key(user_id), "1", ex=READ_YOUR_WRITES_SEC)
+    except Exception as e:
+        print(f"Redis Error (Ignored): {e}")
+
+
+def _recently_wrote(user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    try:
+        return bool(cache.get_redis().exists(_ryw_key(user_id)))
+    except Exception as e:
+        # 확인할 수 없으면 안전하게 primary
+        print(f"Redis Error (Ignored): {e}")
+        return True
+
+
+def _ryw_key(user_id: int) -> str:
+    return f"ryw:user:{user_id}"
+
+
+def _count_route(route: str):
+    with _read_routing_lock:
+        _read_routing_stats[route] += 1
+
+
+def get_read_routing_stats() -> dict:
+    """/status/db-routing 응답 (이 워커 기준, 동기 + 비동기 경로)"""
+    with _read_routing_lock:
+        return {"replicas": len(_replica_sessionmakers), **_read_routing_stats}
+
+
+# =========================================================
+# 비동기 엔진 (history / auth 엔드포인트, get_async_db)
+# - AsyncSession -> 워커 1개에서 스레드풀 크기보다 많은 요청이 DB를 기다릴 수 있음
+# - ASYNC_DATABASE_URL이 없으면 DATABASE_URL의 드라이버만 바꿔서 사용
+#   mysql+pymysql -> mysql+aiomysql (ASYNC_DB_DRIVER=asyncmy면 mysql+asyncmy) / sqlite -> sqlite+aiosqlite
+# - 처음 쓸 때 생성 (main.py lifespan 시작 시)
+# - 풀 크기는 동기 엔진과 같은 DB_POOL_* 설정 (프로세스당 동기 풀 + 비동기 풀)
+# =========================================================
+ASYNC_DB_DRIVER = os.getenv("ASYNC_DB_DRIVER", "aiomysql")
+_async_engine = None
+_async_sessionmaker = None
+# 읽기 복제본의 비동기 엔진 (READ_REPLICA_URLS와 같은 순서, 처음 쓸 때 생성)
+_async_replica_engines = None
+_async_replica_sessionmakers = None
+
+
+def _to_async_url(url: str) -> str:
+    if url.startswith("mysql+pymysql://"):
+        return f"mysql+{ASYNC_DB_DRIVER}://" + url[len("mysql+pymysql://"):]
+    if url.startswith("mysql://"):
+        return f"mysql+{ASYNC_DB_DRIVER}://" + url[len("mysql://"):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+def _create_async_engine(url: str):
+    """primary / 읽기 복제본 공용 비동기 엔진 설정"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    connect_args = {"charset": "utf8mb4"} if url.startswith("mysql") else {}
+    return create_async_engine(
+        url,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+        **_pool_kwargs(url),
+    )
+
+
+def get_async_sessionmaker():
+    """AsyncSession 생성기 (엔진은 프로세스당 1개)"""
+    global _async_engine, _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_engine = _create_async_engine(os.getenv("ASYNC_DATABASE_URL") or _to_async_url(DB_URL))
+        _async_sessionmaker = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker
+
+
+def _get_async_replica_sessionmakers() -> list:
+    global _async_replica_engines, _async_replica_sessionmakers
+    if _async_replica_sessionmakers is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_replica_engines = [_create_async_engine(_to_async_url(url)) for url in READ_REPLICA_URLS]
+        _async_replica_sessionmakers = [
+            async_sessionmaker(e, autoflush=False, expire_on_commit=False) for e in _async_replica_engines
+        ]
+    return _async_replica_sessionmakers
+
+
+async def get_async_db():
+    """get_db의 비동기 버전 (FastAPI Depends로 AsyncSession 주입)"""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request, db=Depends(get_async_db)):
+    """get_read_db의 비동기 버전 (라우팅 규칙 / 지표 동일, read-your-writes 확인은 redis.asyncio)"""
+    replicas = _get_async_replica_sessionmakers()
+    if not replicas:
+        _count_route("primary")
+        yield db
+        return
+    if await _recently_wrote_async(request_user_id(request)):
+        _count_route("sticky")
+        yield db
+        return
+    _count_route("replica")
+    async with replicas[next(_replica_turn) % len(replicas)]() as replica:
+        yield replica
+
+
+async def mark_user_write_async(user_id: int):
+    """mark_user_write의 비동기 버전"""
+    if not _replica_sessionmakers:
+        return
+    try:
+        await cache.get_async_redis().set(_ryw_key(user_id), "1", ex=READ_YOUR_WRITES_SEC)
+    except Exception as e:
+        print(f"Redis Error (Ignored): {e}")
+
+
+async def _recently_wrote_async(user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    try:
+        return bool(await cache.get_async_redis().exists(_ryw_key(user_id)))
+    except Exception as e:
+        print(f"Redis Error (Ignored): {e}")
+        return True
+
+
+async def close_async_engine():
+    global _async_engine, _async_sessionmaker, _async_replica_engines, _async_replica_sessionmakers
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_sessionmaker = None
+    for e in _async_replica_engines or []:
+        await e.dispose()
+    _async_replica_engines = None
+    _async_replica_sessionmakers = None
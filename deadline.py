@@ -0,0 +1,47 @@
+# deadline.py
+"""
+/foods/analysis 요청 하나의 전체 시간 예산 (콜드 미스 p99 상한)
+- 요청이 들어올 때 Deadline을 만들고, 외부 API 단계마다 같은 객체를 넘김
+- 단계별 타임아웃 = min(단계 기본 타임아웃, 남은 예산) / 재시도도 남은 예산 안에서만
+- 예산 안에 못 끝낸 단계는 기본값으로 두고 provisional로 표시해서 응답
+  (provisional 결과는 DB에 저장하지 않고 Redis에 잠깐만 둠 -> 다음 조회 때 뒤에서 전부 다시 채움)
+
+설정 (.env): ANALYSIS_DEADLINE_SEC (0이면 예산 없음)
+"""
+import os
+import time
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ANALYSIS_DEADLINE_SEC = float(os.getenv("ANALYSIS_DEADLINE_SEC", "6"))
+
+
+class DeadlineExceeded(Exception):
+    """남은 예산이 없어서 외부 API 단계를 끝내지 못한 경우"""
+    def __init__(self, step: str):
+        super().__init__(f"{step} skipped: analysis deadline exceeded")
+        self.step = step
+
+
+class Deadline:
+    def __init__(self, budget_sec: float, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.expires_at = clock() + budget_sec
+
+    @classmethod
+    def for_analysis(cls) -> Optional["Deadline"]:
+        """ANALYSIS_DEADLINE_SEC 예산으로 시작 (0 이하면 None = 기존처럼 단계별 타임아웃만)"""
+        return cls(ANALYSIS_DEADLINE_SEC) if ANALYSIS_DEADLINE_SEC > 0 else None
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, step_timeout: float) -> float:
+        """단계 타임아웃을 남은 예산에 맞춰 줄임"""
+        return min(step_timeout, self.remaining())
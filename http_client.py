@@ -0,0 +1,278 @@
+# http_client.py
+"""
+외부 식품 API(식약처 / 공공데이터포털) 공용 HTTP 클라이언트
+- 호스트별 연결 풀 + keep-alive: 콜드 바코드마다 TCP/TLS 연결을 새로 맺지 않음
+- 동기(requests.Session)와 비동기(httpx.AsyncClient, ANALYSIS_PIPELINE_MODE=async) 모두 같은 설정/재시도 규칙
+- GET(멱등) 요청만 재시도: 연결 실패 / 429 / 502 / 503 / 504 -> 지수 백오프 + 지터
+  (읽기 타임아웃은 이미 timeout만큼 기다린 뒤라 재시도하지 않음)
+- deadline(요청 전체 예산)을 넘기면 타임아웃/재시도 대기를 남은 예산 안으로 줄임
+- FoodRepository, AsyncFoodRepository, capston_app /barcode/{code}, 카탈로그 동기화가 같이 사용
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from deadline import Deadline
+
+try:
+    import httpx
+except ImportError:  # 동기 모드만 쓰는 환경에서는 없어도 됨
+    httpx = None
+
+load_dotenv()
+
+# 연결 풀 크기 (.env)
+# - POOL_HOSTS: 연결 풀을 유지할 호스트 수 / POOL_MAXSIZE: 호스트당 유지할 연결 수
+UPSTREAM_HTTP_POOL_HOSTS = int(os.getenv("UPSTREAM_HTTP_POOL_HOSTS", "10"))
+UPSTREAM_HTTP_POOL_MAXSIZE = int(os.getenv("UPSTREAM_HTTP_POOL_MAXSIZE", "32"))
+# 비동기 클라이언트 전체 연결 수 상한 (넘는 요청은 풀에서 순서대로 대기) / 쉬는 keep-alive 연결을 유지할 시간
+# httpcore 풀은 요청이 오갈 때마다 연결 전체를 훑으므로 연결이 많을수록 CPU를 더 씀
+# (bench_analysis_modes 콜드 미스 64개: 200개 9.4초 -> 32개 5.2초)
+UPSTREAM_HTTP_ASYNC_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_HTTP_ASYNC_MAX_CONNECTIONS", "32"))
+UPSTREAM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_HTTP_KEEPALIVE_EXPIRY", "30"))
+# 타임아웃 (읽기 타임아웃은 호출하는 쪽에서 단계별로 지정, 없으면 기본값)
+UPSTREAM_HTTP_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_HTTP_CONNECT_TIMEOUT", "3"))
+UPSTREAM_HTTP_READ_TIMEOUT = float(os.getenv("UPSTREAM_HTTP_READ_TIMEOUT", "10"))
+# 재시도 (attempt번째 대기시간 = 0 ~ min(MAX, BASE * 2^attempt) 사이 랜덤)
+UPSTREAM_HTTP_RETRIES = int(os.getenv("UPSTREAM_HTTP_RETRIES", "2"))
+UPSTREAM_HTTP_BACKOFF_BASE = float(os.getenv("UPSTREAM_HTTP_BACKOFF_BASE", "0.1"))
+UPSTREAM_HTTP_BACKOFF_MAX = float(os.getenv("UPSTREAM_HTTP_BACKOFF_MAX", "1.0"))
+
+RETRY_STATUSES = {429, 502, 503, 504}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_client = None
+
+
+# =========================================================
+# 지표 (호스트별 요청 수 / 새 연결 수 / 재시도 수)
+# =========================================================
+class UpstreamHttpStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def incr(self, host: str, field: str, n: int = 1):
+        with self._lock:
+            entry = self._hosts.setdefault(host, {})
+            entry[field] = entry.get(field, 0) + n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {host: dict(v) for host, v in self._hosts.items()}
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+# 비동기 클라이언트 요청 수 / 새 연결 수 (동기 쪽 연결 수는 urllib3 풀에서 직접 읽음)
+async_stats = UpstreamHttpStats()
+# 재시도/에러 수 (동기 + 비동기)
+retry_stats = UpstreamHttpStats()
+
+
+def _backoff(attempt: int) -> float:
+    """Full jitter: 여러 워커가 동시에 실패해도 재시도가 한꺼번에 몰리지 않게"""
+    return random.uniform(0, min(UPSTREAM_HTTP_BACKOFF_MAX, UPSTREAM_HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+
+def _timeout(timeout: Optional[float], deadline: Optional[Deadline] = None):
+    """(connect, read) 타임아웃 - deadline이 있으면 남은 예산보다 길게 기다리지 않음"""
+    connect = UPSTREAM_HTTP_CONNECT_TIMEOUT
+    read = timeout if timeout is not None else UPSTREAM_HTTP_READ_TIMEOUT
+    if deadline is not None:
+        connect, read = deadline.timeout(connect), deadline.timeout(read)
+    return connect, read
+
+
+def _retry_delay(attempt: int, deadline: Optional[Deadline]) -> Optional[float]:
+    """다음 재시도까지 대기시간 (남은 예산 안에 못 끝나면 None = 재시도 안 함)"""
+    delay = _backoff(attempt)
+    if deadline is not None and delay >= deadline.remaining():
+        return None
+    return delay
+
+
+# =========================================================
+# 동기 (requests)
+# =========================================================
+def get_http_session() -> requests.Session:
+    """프로세스 전체에서 공유하는 requests.Session (스레드 간 공유, 호스트별 urllib3 풀)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=UPSTREAM_HTTP_POOL_HOSTS,
+                    pool_maxsize=UPSTREAM_HTTP_POOL_MAXSIZE,
+                    max_retries=0,  # 재시도는 http_get에서 (지터/지표 때문)
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def close_http_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def http_get(url: str, params: Optional[dict] = None, timeout: Optional[float] = None,
+             session: Optional[requests.Session] = None,
+             deadline: Optional[Deadline] = None,
+             before_attempt: Optional[Callable[[], object]] = None) -> requests.Response:
+    """
+    공유 세션으로 GET (연결 실패 / 재시도 대상 상태코드면 백오프 후 재시도)
+    before_attempt: 첫 요청과 재시도마다 요청 직전에 부름 (호출량 한도 토큰 확보 - rate_limiter.acquire)
+                    여기서 난 예외(QuotaExceeded 등)는 그대로 밖으로 나감
+    """
+    session = session or get_http_session()
+    host = urlsplit(url).netloc
+    for attempt in range(UPSTREAM_HTTP_RETRIES + 1):
+        last = attempt == UPSTREAM_HTTP_RETRIES
+        if deadline is not None and deadline.expired():
+            raise requests.Timeout(f"analysis deadline exceeded ({host})")
+        if before_attempt is not None:
+            before_attempt()
+        try:
+            r = session.get(url, params=params, timeout=_timeout(timeout, deadline))
+        except requests.ConnectionError:
+            # ConnectTimeout 포함 / ReadTimeout은 ConnectionError가 아니라서 재시도 없이 그대로 나감
+            delay = None if last else _retry_delay(attempt, deadline)
+            if delay is None:
+                retry_stats.incr(host, "errors")
+                raise
+            retry_stats.incr(host, "retries")
+            time.sleep(delay)
+            continue
+        if r.status_code in RETRY_STATUSES and not last:
+            delay = _retry_delay(attempt, deadline)
+            if delay is None:
+                return r
+            retry_stats.incr(host, "retries")
+            r.close()
+            time.sleep(delay)
+            continue
+        return r
+
+
+# =========================================================
+# 비동기 (httpx)
+# =========================================================
+def get_async_http_client():
+    """워커 전체에서 공유하는 httpx.AsyncClient (ANALYSIS_PIPELINE_MODE=async)"""
+    global _async_client
+    if httpx is None:
+        raise RuntimeError("ANALYSIS_PIPELINE_MODE=async 에는 httpx가 필요합니다 (pip install httpx)")
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=UPSTREAM_HTTP_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=UPSTREAM_HTTP_ASYNC_MAX_CONNECTIONS,
+                keepalive_expiry=UPSTREAM_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(UPSTREAM_HTTP_READ_TIMEOUT, connect=UPSTREAM_HTTP_CONNECT_TIMEOUT),
+        )
+    return _async_client
+
+
+async def close_async_http_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+async def http_get_async(url: str, params: Optional[dict] = None, timeout: Optional[float] = None, client=None,
+                         deadline: Optional[Deadline] = None,
+                         before_attempt: Optional[Callable[[], Awaitable[object]]] = None):
+    """http_get의 비동기 버전 (재시도 규칙 / before_attempt 동일, before_attempt는 코루틴 함수)"""
+    client = client or get_async_http_client()
+    host = urlsplit(url).netloc
+
+    async def trace(event_name: str, info: dict):
+        # httpcore가 새 TCP 연결을 맺을 때만 발생 (풀에서 꺼낸 연결은 발생 안 함)
+        if event_name == "connection.connect_tcp.complete":
+            async_stats.incr(host, "new_connections")
+
+    for attempt in range(UPSTREAM_HTTP_RETRIES + 1):
+        last = attempt == UPSTREAM_HTTP_RETRIES
+        if deadline is not None and deadline.expired():
+            raise httpx.TimeoutException(f"analysis deadline exceeded ({host})")
+        if before_attempt is not None:
+            await before_attempt()
+        connect, read = _timeout(timeout, deadline)
+        async_stats.incr(host, "requests")
+        try:
+            r = await client.get(url, params=params, timeout=httpx.Timeout(read, connect=connect),
+                                 extensions={"trace": trace})
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            delay = None if last else _retry_delay(attempt, deadline)
+            if delay is None:
+                retry_stats.incr(host, "errors")
+                raise
+            retry_stats.incr(host, "retries")
+            await asyncio.sleep(delay)
+            continue
+        if r.status_code in RETRY_STATUSES and not last:
+            delay = _retry_delay(attempt, deadline)
+            if delay is None:
+                return r
+            retry_stats.incr(host, "retries")
+            await asyncio.sleep(delay)
+            continue
+        return r
+
+
+# =========================================================
+# 현황 (/status/upstream-http)
+# =========================================================
+def get_http_stats() -> dict:
+    """
+    호스트별 요청 수 / 새 연결 수 / 연결 재사용률 (동기 + 비동기 클라이언트 합계)
+    - reuse_ratio가 낮으면 keep-alive가 안 되고 있거나 POOL_MAXSIZE가 동시 요청 수보다 작은 것
+    """
+    hosts = {}
+    if _session is not None:
+        for adapter in set(_session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = f"{pool.host}:{pool.port}" if pool.port else pool.host
+                entry = hosts.setdefault(host, {"requests": 0, "new_connections": 0})
+                entry["requests"] += pool.num_requests
+                entry["new_connections"] += pool.num_connections
+    for host, counts in async_stats.snapshot().items():
+        entry = hosts.setdefault(host, {"requests": 0, "new_connections": 0})
+        entry["requests"] += counts.get("requests", 0)
+        entry["new_connections"] += counts.get("new_connections", 0)
+    for v in hosts.values():
+        v["reuse_ratio"] = round(1 - v["new_connections"] / v["requests"], 4) if v["requests"] else 0.0
+
+    return {
+        "config": {
+            "pool_hosts": UPSTREAM_HTTP_POOL_HOSTS,
+            "pool_maxsize": UPSTREAM_HTTP_POOL_MAXSIZE,
+            "connect_timeout": UPSTREAM_HTTP_CONNECT_TIMEOUT,
+            "retries": UPSTREAM_HTTP_RETRIES,
+        },
+        "hosts": hosts,
+        "retries": retry_stats.snapshot(),
+    }
@@ -0,0 +1,269 @@
+# jobs/catalog_sync.py
+"""
+[오프라인 카탈로그 동기화]
+식약처 C005/I1250/C002 + 공공데이터포털 영양성분 전체 목록을 큰 페이지 단위로 받아서
+보고번호로 메모리 조인 -> ScoreService로 점수 계산 -> DB에 배치 upsert
+
+- 스캔할 때마다 외부 API 5개를 부르는 대신, 미리 DB를 채워두는 용도
+- 중간에 끊겨도 workdir의 체크포인트(state.json + *.jsonl)에서 이어서 진행
+- 페이지 조회는 스캔과 같은 http_client.http_get (재시도/백오프) + 요청마다 호출량 한도(background)
+- 저장한 제품의 캐시(워커 내부 / Redis product:* / analysis:*)는 upsert_products에서 무효화
+
+실행: python -m jobs.catalog_sync --page-size 1000 --batch-size 2000
+처음부터 다시: python -m jobs.catalog_sync --reset
+"""
+import argparse
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+import rate_limiter
+from http_client import get_http_session, http_get
+from models.dtos import RawProductAPIDTO
+from repositories.food_repository import FoodRepository
+
+# 보고번호로 조인할 보조 데이터 (순서대로 먼저 전부 받아둠)
+LOOKUP_SERVICES = ["I1250", "C002", "NUTRI"]
+
+
+class CatalogSyncJob:
+    def __init__(
+        self,
+        repo: FoodRepository,
+        workdir: str = ".catalog_sync",
+        page_size: int = 1000,
+        batch_size: int = 2000,
+        http: Optional[requests.Session] = None,
+    ):
+        self.repo = repo
+        self.workdir = Path(workdir)
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.http = http or get_http_session()  # 앱과 같은 keep-alive 연결 풀
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        self.state = self._load_state()
+
+    # =====================================================
+    # 실행
+    # =====================================================
+    def run(self) -> dict:
+        # 1. 보조 데이터 (I1250 포장재질 / C002 원재료 / 영양성분) -> 보고번호별 dict
+        lookups = {service: self._load_lookup(service) for service in LOOKUP_SERVICES}
+        print(f"[Sync] Lookups ready: " + ", ".join(f"{k}={len(v)}" for k, v in lookups.items()))
+
+        # 2. C005 (바코드 목록)를 페이지로 돌면서 조인 -> 배치 upsert
+        saved, skipped = self._sync_products(lookups)
+        print(f"[Sync] Done. saved={saved}, skipped={skipped}")
+        return {"saved": saved, "skipped": skipped, **{k: len(v) for k, v in lookups.items()}}
+
+    # =====================================================
+    # 보조 데이터 적재 (페이지 단위로 jsonl에 이어쓰기)
+    # =====================================================
+    def _load_lookup(self, service: str) -> Dict[str, dict]:
+        path = self.workdir / f"{service}.jsonl"
+        progress = self.state.setdefault(service, {"next": 1, "done": False})
+
+        if not progress["done"]:
+            for start, rows in self._pages(service, progress["next"]):
+                with path.open("a", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                progress["next"] = start + len(rows)
+                self._save_state()
+            progress["done"] = True
+            self._save_state()
+
+        lookup: Dict[str, dict] = {}
+        if path.exists():
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    row = json.loads(line)
+                    report_no = row.get("PRDLST_REPORT_NO") or row.get("itemMnftrRptNo")
+                    if report_no and report_no not in lookup:
+                        lookup[report_no] = row
+        return lookup
+
+    # =====================================================
+    # C005 페이지 -> DTO 조립 -> 배치 upsert
+    # =====================================================
+    def _sync_products(self, lookups: Dict[str, Dict[str, dict]]) -> Tuple[int, int]:
+        progress = self.state.setdefault("C005", {"next": 1, "done": False, "saved": 0, "skipped": 0})
+        if progress["done"]:
+            return progress["saved"], progress["skipped"]
+
+        batch: Dict[str, RawProductAPIDTO] = {}
+        batch_end = progress["next"]
+        for start, rows in self._pages("C005", progress["next"]):
+            for row in rows:
+                dto = self._build_dto(row, lookups)
+                if dto is None:
+                    progress["skipped"] += 1
+                    continue
+                # 같은 바코드가 여러 번 나오면 보고번호가 큰 것(최신)을 사용 (실시간 조회와 동일)
+                current = batch.get(dto.barcode)
+                if current is None or (dto.report_no or "") > (current.report_no or ""):
+                    batch[dto.barcode] = dto
+            batch_end = start + len(rows)
+
+            if len(batch) >= self.batch_size:
+                self._flush(batch, progress, batch_end)
+                batch = {}
+
+        self._flush(batch, progress, batch_end)
+        progress["done"] = True
+        self._save_state()
+        return progress["saved"], progress["skipped"]
+
+    def _flush(self, batch: Dict[str, RawProductAPIDTO], progress: dict, next_start: int):
+        """배치 저장 후 체크포인트 갱신 (저장이 끝난 페이지까지만 기록)"""
+        saved = self.repo.upsert_products(list(batch.values())) if batch else 0
+        progress["saved"] += saved
+        progress["next"] = next_start
+        self._save_state()
+        if saved:
+            print(f"[Sync] Upserted {saved} products (next C005 row: {next_start})")
+
+    def _build_dto(self, row: dict, lookups: Dict[str, Dict[str, dict]]) -> Optional[RawProductAPIDTO]:
+        """
+        C005 1행 + 보조 데이터 -> RawProductAPIDTO
+        실시간 조회에서 404/422가 나는 경우(보조 데이터 없음, 포장재질 비어있음)는 건너뜀
+        """
+        barcode = row.get("BAR_CD")
+        report_no = row.get("PRDLST_REPORT_NO")
+        if not barcode or not report_no:
+            return None
+
+        pack = lookups["I1250"].get(report_no)
+        raw = lookups["C002"].get(report_no)
+        nut = lookups["NUTRI"].get(report_no)
+        if not pack or not raw or not nut:
+            return None
+        material = (pack.get("FRMLC_MTRQLT") or "").strip()
+        if not material:
+            return None
+
+        raw_materials = raw.get("RAWMTRL_NM")
+        additives_cnt, additive_list_str = 0, None
+        if raw_materials:
+            additives_cnt, additive_list_str = self.repo.additive_service.calculate_count(raw_materials)
+
+        return RawProductAPIDTO(
+            barcode=barcode,
+            name=row.get("PRDLST_NM"),
+            brand=row.get("BSSH_NM"),
+            report_no=report_no,
+            category_code=nut.get("foodLv4Cd"),
+            category_name=nut.get("foodLv4Nm"),
+            serving_size=nut.get("nutConSrtrQua") or "0",
+            sodium_mg=nut.get("nat") or "0",
+            sugar_g=nut.get("sugar") or "0",
+            sat_fat_g=nut.get("fasat") or "0",
+            trans_fat_g=nut.get("fatrn") or "0",
+            packaging_material=material,
+            additives_cnt=additives_cnt,
+            additive_list_str=additive_list_str,
+            raw_materials=raw_materials,
+        )
+
+    # =====================================================
+    # 페이지 조회
+    # =====================================================
+    def _pages(self, service: str, start: int) -> Iterator[Tuple[int, List[dict]]]:
+        """(시작 행 번호, 행 목록)을 끝까지 차례로 반환"""
+        while True:
+            rows, total = self._fetch_page(service, start)
+            if not rows:
+                return
+            yield start, rows
+            start += len(rows)
+            if total is not None and start > total:
+                return
+
+    def _fetch_page(self, service: str, start: int) -> Tuple[List[dict], Optional[int]]:
+        end = start + self.page_size - 1
+        # 스캔(interactive)과 같은 호출량 한도를 background 우선순위로 나눠 씀 (재시도도 요청마다 토큰 1개)
+        # (일일 한도의 BACKGROUND_DAILY_SHARE를 넘으면 QuotaExceeded로 멈춤 -> 다음 실행 때 체크포인트에서 이어서)
+        def acquire():
+            rate_limiter.acquire(self.repo.redis, service, self.repo._api_key(service), rate_limiter.BACKGROUND)
+
+        if service == "NUTRI":
+            # 공공데이터포털은 pageNo/numOfRows 방식 (start는 항상 page_size 단위로 증가)
+            params = {
+                "serviceKey": self.repo.data_go_kr_key,
+                "type": "json",
+                "pageNo": str((start - 1) // self.page_size + 1),
+                "numOfRows": str(self.page_size),
+            }
+            r = http_get(self.repo.base_url_nutri, params=params, timeout=30, session=self.http,
+                         before_attempt=acquire)
+            r.raise_for_status()
+            body = r.json().get("response", {}).get("body", {})
+            total = body.get("totalCount")
+            return body.get("items", []) or [], int(total) if total is not None else None
+
+        url = f"{self.repo.base_url_food}/{self.repo.food_api_key}/{service}/json/{start}/{end}"
+        r = http_get(url, timeout=30, session=self.http, before_attempt=acquire)
+        r.raise_for_status()
+        data = r.json().get(service, {})
+        total = data.get("total_count")
+        return data.get("row", []) or [], int(total) if total is not None else None
+
+    # =====================================================
+    # 체크포인트
+    # =====================================================
+    def _load_state(self) -> dict:
+        path = self.workdir / "state.json"
+        if path.exists():
+            state = json.loads(path.read_text(encoding="utf-8"))
+            if state.get("page_size") == self.page_size:
+                return state
+            print("[Sync] Page size changed, starting over")
+            self._clear_workdir()
+        return {"page_size": self.page_size}
+
+    def _save_state(self):
+        path = self.workdir / "state.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)  # 쓰다가 죽어도 이전 체크포인트는 남도록
+
+    def _clear_workdir(self):
+        for path in self.workdir.glob("*"):
+            path.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="식약처/공공데이터 제품 카탈로그 전체 동기화")
+    parser.add_argument("--workdir", default=".catalog_sync", help="체크포인트 저장 폴더")
+    parser.add_argument("--page-size", type=int, default=1000, help="API 1회 조회 행 수 (식약처 최대 1000)")
+    parser.add_argument("--batch-size", type=int, default=2000, help="DB upsert 1회당 제품 수")
+    parser.add_argument("--reset", action="store_true", help="체크포인트 지우고 처음부터")
+    args = parser.parse_args()
+
+    if args.reset:
+        shutil.rmtree(args.workdir, ignore_errors=True)
+
+    # 앱과 같은 DB/Redis 설정 사용
+    from cache import get_redis
+    from database import SessionLocal
+    from services.additive_service import AdditiveService
+    from services.score_service import ScoreService
+
+    db = SessionLocal()
+    try:
+        repo = FoodRepository(db=db, additive_service=AdditiveService(),
+                              score_service=ScoreService(), redis=get_redis())
+        CatalogSyncJob(repo, workdir=args.workdir, page_size=args.page_size,
+                       batch_size=args.batch_size).run()
+    except rate_limiter.QuotaExceeded as qe:
+        print(f"[Sync] Stopped by upstream quota: {qe} (다음 실행 때 체크포인트에서 이어서 진행)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
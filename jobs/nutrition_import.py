@@ -0,0 +1,186 @@
+# jobs/nutrition_import.py
+"""
+[영양성분 데이터셋 임포터]
+공공데이터포털에 올라와 있는 가공식품 영양성분 데이터셋 파일(CSV / JSON / JSON Lines)을
+한 줄씩 스트리밍으로 읽어서 nutrition_reference 표에 배치 upsert
+
+- 파일 크기와 상관없이 메모리는 배치 크기만큼만 사용
+- 같은 보고번호의 기존 제품은 NutritionFact, Food.category_*, 영양 점수까지 갱신
+- 적재 후에는 실시간 조회(Step 4)가 영양성분 API 대신 이 표를 먼저 사용
+
+컬럼명은 영양성분 API 필드명(itemMnftrRptNo, nutConSrtrQua, nat, sugar, fasat, fatrn, foodLv4Cd, foodLv4Nm)을 기준으로 함
+
+실행: python -m jobs.nutrition_import 영양성분.csv --batch-size 5000
+"""
+import argparse
+import csv
+import json
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from repositories.food_repository import FoodRepository
+
+# 데이터셋 필드명 -> nutrition_reference 컬럼명
+FIELD_MAP = {
+    "itemMnftrRptNo": "report_no",
+    "nutConSrtrQua": "serving_size",
+    "nat": "sodium_mg",
+    "sugar": "sugar_g",
+    "fasat": "sat_fat_g",
+    "fatrn": "trans_fat_g",
+    "foodLv4Cd": "category_code",
+    "foodLv4Nm": "category_name",
+}
+
+
+class NutritionImportJob:
+    def __init__(self, repo: FoodRepository, batch_size: int = 5000):
+        self.repo = repo
+        self.batch_size = batch_size
+
+    def run(self, path: str) -> dict:
+        imported, updated_foods, skipped = 0, 0, 0
+        batch: List[dict] = []
+
+        for record in iter_records(path):
+            row = to_reference_row(record)
+            if row is None:
+                skipped += 1
+                continue
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                n, m = self.repo.upsert_nutrition_reference(batch)
+                imported, updated_foods = imported + n, updated_foods + m
+                print(f"[Import] {imported} rows imported ({updated_foods} products updated)")
+                batch = []
+
+        n, m = self.repo.upsert_nutrition_reference(batch)
+        imported, updated_foods = imported + n, updated_foods + m
+        print(f"[Import] Done. imported={imported}, updated_foods={updated_foods}, skipped={skipped}")
+        return {"imported": imported, "updated_foods": updated_foods, "skipped": skipped}
+
+
+def to_reference_row(record: dict) -> Optional[dict]:
+    """데이터셋 1행 -> nutrition_reference 행 (보고번호 없으면 None)"""
+    row = {}
+    for field, column in FIELD_MAP.items():
+        value = record.get(field)
+        if isinstance(value, str):
+            value = value.strip() or None
+        row[column] = str(value) if value is not None else None
+    if not row["report_no"]:
+        return None
+    return row
+
+
+# =========================================================
+# 파일 스트리밍 (형식은 확장자/첫 글자로 판단)
+# =========================================================
+def iter_records(path: str) -> Iterator[dict]:
+    p = Path(path)
+    if p.suffix.lower() == ".csv":
+        yield from _iter_csv(p)
+        return
+
+    with p.open(encoding="utf-8-sig") as f:
+        first = _peek_non_space(f)
+    if first == "[":
+        yield from _iter_json_array(p)
+    elif first == "{" and p.suffix.lower() == ".json":
+        yield from _iter_json_array(p, key="records")
+    else:
+        yield from _iter_json_lines(p)
+
+
+def _iter_csv(path: Path) -> Iterator[dict]:
+    # utf-8-sig: 엑셀에서 저장한 BOM 포함 파일도 처리
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def _iter_json_lines(path: Path) -> Iterator[dict]:
+    with path.open(encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _iter_json_array(path: Path, key: Optional[str] = None, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """
+    큰 JSON 파일에서 객체 배열을 하나씩 꺼냄 (파일 전체를 메모리에 올리지 않음)
+    - [ {...}, {...} ] 형태
+    - {"fields": [...], "records": [ {...}, ... ]} 처럼 key 아래 배열이 있는 형태 (공공데이터 파일 다운로드 형식)
+    """
+    decoder = json.JSONDecoder()
+    # 배열 시작 위치를 찾을 때 쓰는 표시 (key가 있으면 "key" 다음의 첫 '[')
+    markers = ([f'"{key}"'] if key else []) + ["["]
+    with path.open(encoding="utf-8-sig") as f:
+        buf = ""
+        pos = 0
+        while markers:
+            idx = buf.find(markers[0], pos)
+            if idx == -1:
+                more = f.read(chunk_size)
+                if not more:
+                    return
+                # 표시가 청크 경계에 걸칠 수 있으므로 끝부분은 남겨둠
+                keep = max(pos, len(buf) - len(markers[0]))
+                buf, pos = buf[keep:] + more, 0
+                continue
+            pos = idx + len(markers.pop(0))
+
+        while True:
+            # 공백/쉼표 건너뛰기
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                more = f.read(chunk_size)
+                if not more:
+                    return
+                buf, pos = buf[pos:] + more, 0
+                continue
+
+            if isinstance(obj, dict):
+                yield obj
+            pos = end
+            # 읽은 부분은 버려서 버퍼가 커지지 않게 유지
+            if pos > chunk_size:
+                buf, pos = buf[pos:], 0
+
+
+def _peek_non_space(f) -> str:
+    while True:
+        ch = f.read(1)
+        if not ch or not ch.isspace():
+            return ch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="영양성분 데이터셋 파일 -> nutrition_reference 적재")
+    parser.add_argument("path", help="CSV / JSON / JSON Lines 파일 경로")
+    parser.add_argument("--batch-size", type=int, default=5000, help="DB upsert 1회당 행 수")
+    args = parser.parse_args()
+
+    # 앱과 같은 DB/Redis 설정 사용
+    from cache import get_redis
+    from database import SessionLocal
+    from services.additive_service import AdditiveService
+    from services.score_service import ScoreService
+
+    db = SessionLocal()
+    try:
+        repo = FoodRepository(db=db, additive_service=AdditiveService(),
+                              score_service=ScoreService(), redis=get_redis())
+        NutritionImportJob(repo, batch_size=args.batch_size).run(args.path)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,42 @@
 #main.py
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+import bulkhead
+import cache
 import database
-from models import models
-from routers import food_router, history_router, recommendation_router, user_router
+import migrations
+from repositories.async_food_repository import get_shared_additive_service
+from repositories.history_write_buffer import history_write_buffer
+from routers import food_router, history_router, recommendation_router, status_router, user_router
+import http_client
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-# 테이블 생성
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    models.Base.metadata.create_all(bind=database.engine)
+    # 테이블/인덱스는 배포 때 python -m migrations upgrade로 (워커 시작에서는 확인만)
+    migrations.warn_if_pending(database.engine)
+    # Redis 연결 풀 (앱 전체 공유)
+    cache.init_redis_pool()
+    # 동기 엔드포인트 스레드풀 = 빠른 경로 몫 + 외부 API 콜드 조회 상한 (bulkhead.py)
+    bulkhead.configure_threadpool()
+    # history / auth 엔드포인트용 AsyncSession 엔진
+    database.get_async_sessionmaker()
+    if food_router.ANALYSIS_PIPELINE_MODE == "async":
+        # 비동기 분석 경로 자원 (Redis 풀 / HTTP 클라이언트 / 첨가물 목록은 동기 DB 조회라 스레드에서)
+        cache.init_async_redis_pool()
+        http_client.get_async_http_client()
+        await run_in_threadpool(get_shared_additive_service)
     yield
+    # write-behind 스캔 기록: 큐에 남은 기록을 DB에 모두 저장한 뒤 종료
+    # (저장 스레드 join / 남은 배치 INSERT는 블로킹 -> 이벤트 루프 밖 스레드에서)
+    await run_in_threadpool(history_write_buffer.close)
+    cache.close_redis_pool()
+    http_client.close_http_session()
+    await http_client.close_async_http_client()
+    await cache.close_async_redis_pool()
+    await database.close_async_engine()
 
 app = FastAPI(title="EcoNutri API", lifespan=lifespan, openapi_version="3.0.2")
 
@@ -34,6 +59,7 @@ app.include_router(food_router.router)
 app.include_router(history_router.router)
 app.include_router(recommendation_router.router)
 app.include_router(user_router.router)
+app.include_router(status_router.router)
 
 @app.get("/")
 def index():
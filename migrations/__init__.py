@@ -0,0 +1,74 @@
+# migrations/__init__.py
+"""
+[스키마 마이그레이션]
+버전 번호가 붙은 마이그레이션(migrations/versions)을 순서대로 적용하고 schema_migrations 표에 기록
+- 워커 시작(main.py lifespan)에서는 DDL을 실행하지 않음 -> 배포 때 한 번만 명시적으로 실행
+  (워커 여러 개가 동시에 create_all / CREATE INDEX를 돌리면 큰 표에서 시작이 느려지고 서로 부딪힘)
+- lifespan은 적용 안 된 버전이 있으면 경고만 출력
+
+실행: python -m migrations upgrade   (상태 확인: python -m migrations status)
+"""
+from typing import List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, inspect, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import func
+
+from migrations.versions import MIGRATIONS
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def migration_name(migration) -> str:
+    """모듈 docstring 첫 줄 = 마이그레이션 이름"""
+    return (migration.__doc__ or migration.__name__).strip().splitlines()[0]
+
+
+def applied_versions(engine: Engine) -> List[int]:
+    if not inspect(engine).has_table(schema_migrations.name):
+        return []
+    with engine.connect() as conn:
+        return list(conn.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(engine: Engine) -> list:
+    applied = set(applied_versions(engine))
+    return [m for m in MIGRATIONS if m.VERSION not in applied]
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[int]:
+    """
+    적용 안 된 마이그레이션을 버전 순서대로 적용 (target이 있으면 그 버전까지)
+    - 버전마다 트랜잭션 1개 (MySQL은 DDL이 바로 커밋되므로 각 마이그레이션은 다시 실행해도 안전하게 작성)
+    """
+    schema_migrations.create(engine, checkfirst=True)
+    done = []
+    for migration in pending_migrations(engine):
+        if target is not None and migration.VERSION > target:
+            break
+        name = migration_name(migration)
+        print(f"[Migrate] Applying {migration.VERSION:04d} {name}")
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(insert(schema_migrations).values(version=migration.VERSION, name=name))
+        done.append(migration.VERSION)
+    print(f"[Migrate] Up to date (applied {len(done)})")
+    return done
+
+
+def warn_if_pending(engine: Engine):
+    """워커 시작 시 확인용 (DDL은 실행하지 않음)"""
+    try:
+        pending = pending_migrations(engine)
+    except Exception as e:
+        print(f"[Migrate] Could not check schema version: {e}")
+        return
+    if pending:
+        versions = ", ".join(f"{m.VERSION:04d}" for m in pending)
+        print(f"[Migrate] WARNING: pending migrations ({versions}) - run `python -m migrations upgrade`")
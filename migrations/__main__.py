@@ -0,0 +1,28 @@
+# migrations/__main__.py
+import argparse
+
+import database
+from migrations import applied_versions, migration_name, upgrade
+from migrations.versions import MIGRATIONS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션")
+    sub = parser.add_subparsers(dest="command", required=True)
+    up = sub.add_parser("upgrade", help="적용 안 된 마이그레이션 적용")
+    up.add_argument("--target", type=int, default=None, help="이 버전까지만 적용")
+    sub.add_parser("status", help="버전별 적용 여부 출력")
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        upgrade(database.engine, args.target)
+        return
+
+    applied = set(applied_versions(database.engine))
+    for migration in MIGRATIONS:
+        mark = "applied" if migration.VERSION in applied else "pending"
+        print(f"{migration.VERSION:04d} [{mark}] {migration_name(migration)}")
+
+
+if __name__ == "__main__":
+    main()
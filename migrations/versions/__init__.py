@@ -0,0 +1,10 @@
+# migrations/versions/__init__.py
+# 새 마이그레이션은 vNNNN_이름.py로 추가하고 아래 목록 끝에 붙임 (VERSION은 파일 번호와 같게)
+# 표/인덱스는 models를 import하지 말고 그 버전 파일 안에 Table/Index로 직접 적음 (나중에 모델이 바뀌어도 같은 DDL)
+from migrations.versions import v0001_baseline, v0002_hot_path_indexes, v0003_history_cursor_index
+
+MIGRATIONS = [
+    v0001_baseline,
+    v0002_hot_path_indexes,
+    v0003_history_cursor_index,
+]
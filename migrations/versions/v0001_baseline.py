@@ -0,0 +1,107 @@
+"""기본 테이블 (기존 create_all 스키마)"""
+# 원래 워커 시작 때 하던 models.Base.metadata.create_all과 같은 표 (인덱스는 v0002부터)
+# - 이미 운영 중인 DB는 있는 테이블을 건너뛰고 버전만 기록됨
+# - 이 시점의 정의를 그대로 적어둠 (모델을 바꿔도 이 버전의 DDL은 바뀌지 않아야 다시 적용해도 같은 결과)
+from sqlalchemy import (
+    Column, DateTime, DECIMAL, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text,
+)
+from sqlalchemy.sql import func
+
+VERSION = 1
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("user_id", Integer, primary_key=True, autoincrement=True),
+    Column("login_id", String(64), nullable=False, unique=True),
+    Column("password_hash", String(255), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "foods", metadata,
+    Column("food_id", Integer, primary_key=True, autoincrement=True),
+    Column("barcode", String(50), unique=True, nullable=False),
+    Column("prdlst_report_no", String(50)),
+    Column("name", String(300)),
+    Column("brand", String(300)),
+    Column("category_code", String(32)),
+    Column("category_name", String(100)),
+    Column("image_url", String(1000)),
+    Column("base_nutrition_score", Float),
+    Column("base_packaging_score", Float),
+    Column("base_additives_score", Float),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "nutrition_facts", metadata,
+    Column("nf_id", Integer, primary_key=True, autoincrement=True),
+    Column("barcode", String(50), ForeignKey("foods.barcode", ondelete="CASCADE"), unique=True),
+    Column("serving_size", String(50)),
+    Column("sodium_mg", Integer),
+    Column("sugar_g", Integer),
+    Column("sat_fat_g", Float),
+    Column("trans_fat_g", Float),
+    Column("additives_cnt", Integer),
+)
+
+Table(
+    "recycling_info", metadata,
+    Column("recy_id", Integer, primary_key=True, autoincrement=True),
+    Column("barcode", String(50), ForeignKey("foods.barcode", ondelete="CASCADE"), unique=True),
+    Column("material", String(50)),
+)
+
+Table(
+    "ingredients", metadata,
+    Column("ing_id", Integer, primary_key=True, autoincrement=True),
+    Column("barcode", String(50), ForeignKey("foods.barcode", ondelete="CASCADE")),
+    Column("name", String(300)),
+    Column("raw_materials", Text, nullable=True),
+    Column("additives_list", Text, nullable=True),
+)
+
+Table(
+    "nutrition_reference", metadata,
+    Column("ref_id", Integer, primary_key=True, autoincrement=True),
+    Column("report_no", String(50), unique=True, nullable=False),
+    Column("serving_size", String(50)),
+    Column("sodium_mg", String(20)),
+    Column("sugar_g", String(20)),
+    Column("sat_fat_g", String(20)),
+    Column("trans_fat_g", String(20)),
+    Column("category_code", String(32)),
+    Column("category_name", String(100)),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "scan_history", metadata,
+    Column("scan_id", Integer, primary_key=True, autoincrement=True),
+    Column("user_id", Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False),
+    Column("food_id", Integer, ForeignKey("foods.food_id", ondelete="CASCADE"), nullable=False),
+    Column("nutrition_weight", DECIMAL(4, 2)),
+    Column("packaging_weight", DECIMAL(4, 2)),
+    Column("additives_weight", DECIMAL(4, 2)),
+    Column("nutrition_score", DECIMAL(7, 2)),
+    Column("packaging_score", DECIMAL(7, 2)),
+    Column("additives_score", DECIMAL(7, 2)),
+    Column("score_total", DECIMAL(8, 2)),
+    Column("grade", String(2)),
+    Column("scanned_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+additives = Table(
+    "additives", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(200), nullable=False),
+)
+# 모델의 unique=True, index=True -> 유니크 인덱스 1개
+Index("ix_additives_name", additives.c.name, unique=True)
+
+
+def upgrade(conn):
+    metadata.create_all(bind=conn, checkfirst=True)
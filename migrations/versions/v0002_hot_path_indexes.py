@@ -0,0 +1,43 @@
+"""조회 경로 인덱스 (foods 보고번호/카테고리, scan_history 유저별 최신순)"""
+# - ix_foods_prdlst_report_no         : get_food_by_report_no
+# - ix_foods_category_code_report_no  : find_alternatives (category_code = ? AND prdlst_report_no != ?)
+# - ix_scan_history_user_scanned      : get_user_scan_history (user_id = ? ORDER BY scanned_at DESC)
+#   목록 컬럼(food_id, score_total, grade)까지 넣은 커버링 인덱스 -> 표 본문을 읽지 않고 목록을 만듦
+#   (v0003에서 ix_scan_history_user_cursor로 교체)
+# 인덱스는 이 시점 정의로 여기 적어둠 (모델의 __table_args__와 따로, 이미 있으면 checkfirst로 건너뜀)
+from sqlalchemy import Column, DateTime, DECIMAL, Index, Integer, MetaData, String, Table
+
+VERSION = 2
+
+metadata = MetaData()
+
+_foods = Table(
+    "foods", metadata,
+    Column("food_id", Integer, primary_key=True),
+    Column("prdlst_report_no", String(50)),
+    Column("category_code", String(32)),
+)
+_scan_history = Table(
+    "scan_history", metadata,
+    Column("scan_id", Integer, primary_key=True),
+    Column("user_id", Integer),
+    Column("food_id", Integer),
+    Column("score_total", DECIMAL(8, 2)),
+    Column("grade", String(2)),
+    Column("scanned_at", DateTime(timezone=True)),
+)
+
+INDEXES = [
+    Index("ix_foods_prdlst_report_no", _foods.c.prdlst_report_no),
+    Index("ix_foods_category_code_report_no", _foods.c.category_code, _foods.c.prdlst_report_no),
+    Index(
+        "ix_scan_history_user_scanned",
+        _scan_history.c.user_id, _scan_history.c.scanned_at, _scan_history.c.food_id,
+        _scan_history.c.score_total, _scan_history.c.grade,
+    ),
+]
+
+
+def upgrade(conn):
+    for index in INDEXES:
+        index.create(conn, checkfirst=True)
@@ -0,0 +1,34 @@
+"""스캔 기록 커서 페이지 인덱스 (user_id, scanned_at, scan_id, ...)"""
+# /history/me/page 커서 조건 (scanned_at, scan_id) < (?, ?)와 정렬 순서를 인덱스 그대로 따르도록
+# v0002의 ix_scan_history_user_scanned를 scan_id를 scanned_at 바로 뒤에 둔 인덱스로 교체
+# (scan_id가 뒤쪽에 있으면 같은 시각 행을 다시 정렬해야 함)
+# 지울 인덱스 / 만들 인덱스 모두 이 시점 정의로 여기 적어둠 (모델과 따로)
+from sqlalchemy import Column, DateTime, DECIMAL, Index, Integer, MetaData, String, Table
+
+VERSION = 3
+
+_scan_history = Table(
+    "scan_history", MetaData(),
+    Column("scan_id", Integer, primary_key=True),
+    Column("user_id", Integer),
+    Column("food_id", Integer),
+    Column("score_total", DECIMAL(8, 2)),
+    Column("grade", String(2)),
+    Column("scanned_at", DateTime(timezone=True)),
+)
+_old_index = Index(
+    "ix_scan_history_user_scanned",
+    _scan_history.c.user_id, _scan_history.c.scanned_at, _scan_history.c.food_id,
+    _scan_history.c.score_total, _scan_history.c.grade,
+)
+_new_index = Index(
+    "ix_scan_history_user_cursor",
+    _scan_history.c.user_id, _scan_history.c.scanned_at, _scan_history.c.scan_id,
+    _scan_history.c.food_id, _scan_history.c.score_total, _scan_history.c.grade,
+)
+
+
+def upgrade(conn):
+    _new_index.create(conn, checkfirst=True)
+    # 새 인덱스를 먼저 만든 뒤 지움 (user_id 외래키가 쓸 인덱스가 비는 순간이 없게 - MySQL)
+    _old_index.drop(conn, checkfirst=True)
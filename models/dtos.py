@@ -45,6 +45,8 @@ class RawProductAPIDTO(BaseModel):
     additives_cnt: Optional[int] = None
     raw_materials: Optional[str] = None
     additive_list_str: Optional[str] = None
+    # 분석 시간 예산 안에 못 채워서 기본값으로 둔 항목 (packaging, additives, nutrition)
+    provisional: List[str] = Field(default_factory=list)
     model_config = ConfigDict(from_attributes=True, extra='ignore')
 
 
@@ -89,10 +91,53 @@ class AnalysisScoresDTO(BaseModel):
     nutrition: NutritionDetail
     packaging: PackagingDetail
     additives: AdditivesDetail
+
+    # 임시 값인 항목 (응답 시간 예산 때문에 건너뜀 -> 잠시 뒤 다시 조회하면 채워짐)
+    provisional: List[str] = Field(default_factory=list)
     
     model_config = ConfigDict(from_attributes=True)
 
 
+class BatchAnalysisRequest(BaseModel):
+    """
+    [API 1단계 배치 요청] /foods/analysis/batch
+    매대 점검 등 여러 바코드를 한 번에 분석할 때 사용
+    """
+    barcodes: List[str] = Field(..., min_length=1, max_length=200)
+
+class BatchAnalysisItem(BaseModel):
+    """바코드 1개의 분석 결과 (실패 시 result 없이 status/error만)"""
+    barcode: str
+    status: int                              # 200, 404, 422 ...
+    result: Optional[AnalysisScoresDTO] = None
+    error: Optional[str] = None
+
+class BatchAnalysisResponse(BaseModel):
+    """[API 1단계 배치 응답] 요청한 순서대로"""
+    results: List[BatchAnalysisItem]
+
+class ImageStatusDTO(BaseModel):
+    """
+    [API] /foods/image-status/{barcode}
+    제품 이미지는 저장 후 백그라운드에서 채워지므로, 앱은 이걸로 가볍게 확인
+    """
+    barcode: str
+    status: Literal['ready', 'pending', 'none']   # none: 이미지 없음 (잠시 뒤 다시 조회 시도)
+    image_url: Optional[str] = None
+
+class AnalysisJobDTO(BaseModel):
+    """
+    [API] 콜드 미스 202 응답 / GET /foods/analysis/jobs/{job_id}
+    외부 API 조회가 끝나면 status=done + result (실패 시 failed + error_status/error)
+    """
+    job_id: str
+    barcode: str
+    status: Literal['pending', 'running', 'done', 'failed']
+    result: Optional[AnalysisScoresDTO] = None
+    error: Optional[str] = None
+    error_status: Optional[int] = None   # 404, 422, 503 ...
+
+
 # ===================================================================
 # 4. [2단계 입력] 가중치 및 최종 계산 요청 (Frontend -> API)
 # ===================================================================
@@ -130,7 +175,9 @@ class GradeResult(BaseModel):
     """
     [API 2단계 응답] 최종 계산 결과
     """
-    scan_id: Optional[int] = None # DB 저장 시 생성된 ID
+    # DB 저장 시 생성된 ID
+    # HISTORY_WRITE_MODE=buffered로 큐에 넣은 경우 / save_history=false면 None (기록은 /history/me에서 확인)
+    scan_id: Optional[int] = None
     user_id: int
     food_id: Optional[int] = None
     
@@ -187,6 +234,14 @@ class ScanHistoryDTO(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class ScanHistoryPageDTO(BaseModel):
+    """
+    [API] /history/me/page 커서 페이지 조회용
+    - next_cursor를 다음 요청의 cursor로 그대로 보내면 이어서 조회 (None이면 마지막 페이지)
+    """
+    items: List[ScanHistoryDTO]
+    next_cursor: Optional[str] = None
+
 # [회원가입/로그인 요청]
 class UserAuthRequest(BaseModel):
     login_id: str
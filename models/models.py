@@ -1,5 +1,5 @@
 #models/models.py
-from sqlalchemy import Column, ForeignKey, Integer, String, Float, DateTime, Text, DECIMAL
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Float, DateTime, Text, DECIMAL
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -45,6 +45,14 @@ class Food(Base):
     
     scan_histories = relationship("ScanHistory", back_populates="food", cascade="all, delete-orphan")
 
+    # 인덱스는 migrations/versions/v0002_hot_path_indexes.py로 기존 DB에도 추가됨
+    __table_args__ = (
+        # get_food_by_report_no (보고번호로 제품 찾기)
+        Index("ix_foods_prdlst_report_no", "prdlst_report_no"),
+        # find_alternatives (같은 카테고리 + 현재 제품 제외)
+        Index("ix_foods_category_code_report_no", "category_code", "prdlst_report_no"),
+    )
+
 # =========================================================
 # 3. 영양성분 (nutrition_facts)
 # =========================================================
@@ -91,6 +99,25 @@ class Ingredient(Base):
     additives_list = Column(Text, nullable=True)
     food = relationship("Food", back_populates="ingredients")
 
+# =========================================================
+# 5-1. 영양성분 참조 데이터 (nutrition_reference)
+# =========================================================
+# 공공데이터포털 영양성분 데이터셋 파일을 그대로 적재한 표 (보고번호 기준)
+# - 실시간 조회 시 영양성분 API보다 먼저 여기서 찾음
+class NutritionReference(Base):
+    __tablename__ = "nutrition_reference"
+
+    ref_id = Column(Integer, primary_key=True, autoincrement=True)
+    report_no = Column(String(50), unique=True, nullable=False)   # itemMnftrRptNo
+    serving_size = Column(String(50))                              # nutConSrtrQua
+    sodium_mg = Column(String(20))                                 # nat
+    sugar_g = Column(String(20))                                   # sugar
+    sat_fat_g = Column(String(20))                                 # fasat
+    trans_fat_g = Column(String(20))                               # fatrn
+    category_code = Column(String(32))                             # foodLv4Cd
+    category_name = Column(String(100))                            # foodLv4Nm
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 # =========================================================
 # 6. 스캔 기록 (scan_history)
 # =========================================================
@@ -120,6 +147,12 @@ class ScanHistory(Base):
     food = relationship("Food", back_populates="scan_histories")
     user = relationship("User", back_populates="scan_histories")
 
+    __table_args__ = (
+        # get_user_scan_history / 커서 페이지 (유저별 (scanned_at, scan_id) 최신순)
+        # 목록에 쓰는 컬럼까지 포함한 커버링 인덱스 (migrations v0003)
+        Index("ix_scan_history_user_cursor", "user_id", "scanned_at", "scan_id", "food_id", "score_total", "grade"),
+    )
+
 class Additive(Base):
     __tablename__ = "additives"
 
@@ -0,0 +1,282 @@
+# rate_limiter.py
+"""
+외부 식품 API 호출량 제한 (API 키 + 서비스별 토큰 버킷, Redis 공유 -> 모든 워커/배치 작업이 같은 한도를 씀)
+- 초당 한도: 토큰 버킷 (PER_SEC만큼 채워지고 BURST까지 쌓임)
+- 일일 한도: 날짜(KST)별 카운터 (DAILY, 0이면 제한 없음)
+- 우선순위
+  - interactive(스캔 콜드 미스): 버킷을 끝까지 쓸 수 있음, 최대 RATE_LIMIT_MAX_WAIT_SEC만 줄 서고 넘으면 바로 포기(shed)
+  - background(SWR 새로고침, 이미지 보강, 카탈로그 동기화): 버킷의 BACKGROUND_RESERVE 비율은 남겨둠,
+    일일 한도도 BACKGROUND_DAILY_SHARE까지만 -> 배치가 한도를 다 써서 스캔이 막히는 일 방지
+- Redis 장애 시에는 제한 없이 통과 (조회 자체는 막지 않음)
+
+설정 (.env): RATE_LIMIT_{STEP}_PER_SEC / _BURST / _DAILY (STEP = C005, I1250, C002, NUTRI, IMG)
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") != "0"
+RATE_LIMIT_MAX_WAIT_SEC = float(os.getenv("RATE_LIMIT_MAX_WAIT_SEC", "1.0"))
+RATE_LIMIT_BACKGROUND_MAX_WAIT_SEC = float(os.getenv("RATE_LIMIT_BACKGROUND_MAX_WAIT_SEC", "60"))
+RATE_LIMIT_BACKGROUND_RESERVE = float(os.getenv("RATE_LIMIT_BACKGROUND_RESERVE", "0.5"))
+RATE_LIMIT_BACKGROUND_DAILY_SHARE = float(os.getenv("RATE_LIMIT_BACKGROUND_DAILY_SHARE", "0.8"))
+
+# 단계 -> 쓰는 API 키 (지표에서 키별로 묶어 보기 위함)
+STEP_API_KEY_ENV = {
+    "C005": "FOOD_API_KEY", "I1250": "FOOD_API_KEY", "C002": "FOOD_API_KEY",
+    "NUTRI": "DATA_GO_KR_API_KEY", "IMG": "DATA_GO_KR_API_KEY",
+}
+
+# KEYS[1]: 토큰 버킷 (hash: tokens, ts) / KEYS[2]: 오늘 사용량
+# ARGV: 초당 충전량, 최대 토큰, 현재 시각, 남겨둘 토큰, 일일 한도(0=무제한), 버킷 TTL
+# 반환: {1=허용 / 0=대기 필요 / -1=일일 한도 초과, 기다릴 초, 오늘 사용량}
+_ACQUIRE_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local reserve = tonumber(ARGV[4])
+local daily_limit = tonumber(ARGV[5])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+if now > ts then
+    tokens = math.min(burst, tokens + (now - ts) * rate)
+    ts = now
+end
+local used = tonumber(redis.call('GET', KEYS[2]) or '0')
+if daily_limit > 0 and used >= daily_limit then
+    return {-1, '0', used}
+end
+local allowed = 0
+local wait = 0
+if tokens - 1 >= reserve then
+    tokens = tokens - 1
+    allowed = 1
+    used = redis.call('INCR', KEYS[2])
+    if used == 1 then
+        redis.call('EXPIRE', KEYS[2], 172800)
+    end
+else
+    wait = (reserve + 1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(ts))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[6]))
+return {allowed, tostring(wait), used}
+"""
+
+
+# 위 스크립트의 redis-py Script 객체 (첫 acquire 때 1번만 등록, 이후에는 클라이언트만 넘겨서 EVALSHA)
+_acquire_script = None
+# 비동기 분석 경로(redis.asyncio)용 - 동기 Script로는 await 할 수 없어서 따로 등록
+_async_acquire_script = None
+
+
+def _get_acquire_script(redis):
+    global _acquire_script
+    if _acquire_script is None:
+        _acquire_script = redis.register_script(_ACQUIRE_LUA)
+    return _acquire_script
+
+
+def _get_async_acquire_script(redis):
+    global _async_acquire_script
+    if _async_acquire_script is None:
+        _async_acquire_script = redis.register_script(_ACQUIRE_LUA)
+    return _async_acquire_script
+
+
+class QuotaExceeded(Exception):
+    """한도 때문에 외부 API를 부르지 않은 경우 (reason: rate = 초당 한도 대기 초과, daily = 일일 한도)"""
+    def __init__(self, step: str, reason: str, retry_after: int):
+        super().__init__(f"{step} upstream quota exceeded ({reason}, retry after {retry_after}s)")
+        self.step = step
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RateLimitPolicy:
+    def __init__(self, per_sec: float, burst: float, daily: int):
+        self.per_sec = per_sec
+        self.burst = burst
+        self.daily = daily
+
+    @classmethod
+    def from_env(cls, step: str, per_sec: str) -> "RateLimitPolicy":
+        rate = float(os.getenv(f"RATE_LIMIT_{step}_PER_SEC", per_sec))
+        return cls(
+            per_sec=rate,
+            burst=float(os.getenv(f"RATE_LIMIT_{step}_BURST", str(rate * 2))),
+            daily=int(os.getenv(f"RATE_LIMIT_{step}_DAILY", "0")),
+        )
+
+    def limits_for(self, priority: str):
+        """(남겨둘 토큰, 일일 한도) - background는 interactive 몫을 남겨둠"""
+        if priority == BACKGROUND:
+            return self.burst * RATE_LIMIT_BACKGROUND_RESERVE, int(self.daily * RATE_LIMIT_BACKGROUND_DAILY_SHARE)
+        return 0.0, self.daily
+
+
+_policies = {
+    "C005": RateLimitPolicy.from_env("C005", "10"),
+    "I1250": RateLimitPolicy.from_env("I1250", "10"),
+    "C002": RateLimitPolicy.from_env("C002", "10"),
+    "NUTRI": RateLimitPolicy.from_env("NUTRI", "30"),
+    "IMG": RateLimitPolicy.from_env("IMG", "30"),
+}
+
+
+# =========================================================
+# 지표 (이 워커 기준: 통과 / 줄 선 횟수 / 포기 / 줄 선 시간)
+# =========================================================
+class RateLimitStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._steps = {}
+
+    def incr(self, step: str, priority: str, field: str, n: float = 1):
+        with self._lock:
+            entry = self._steps.setdefault(step, {}).setdefault(priority, {})
+            entry[field] = entry.get(field, 0) + n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {step: {p: dict(v) for p, v in prios.items()} for step, prios in self._steps.items()}
+
+    def reset(self):
+        with self._lock:
+            self._steps.clear()
+
+
+stats = RateLimitStats()
+
+
+def _bucket_keys(step: str, api_key: Optional[str], now: float):
+    key_id = hashlib.sha1((api_key or "").encode("utf-8")).hexdigest()[:8]  # 키 원문은 Redis에 남기지 않음
+    day = time.strftime("%Y%m%d", time.gmtime(now + 9 * 3600))             # 공공 API 일일 한도는 KST 자정 기준
+    return f"ratelimit:{step}:{key_id}", f"ratelimit:{step}:{key_id}:day:{day}"
+
+
+def _max_wait(priority: str, max_wait: Optional[float]) -> float:
+    default = RATE_LIMIT_BACKGROUND_MAX_WAIT_SEC if priority == BACKGROUND else RATE_LIMIT_MAX_WAIT_SEC
+    return default if max_wait is None else min(default, max_wait)
+
+
+def _seconds_until_kst_midnight(now: float) -> int:
+    return int(86400 - (now + 9 * 3600) % 86400) + 1
+
+
+def _prepare(step: str, api_key: Optional[str], priority: str):
+    """Lua 스크립트의 키 + 인자 (버킷 TTL: 비어 있다가 가득 찰 때까지 + 여유)"""
+    policy = _policies[step]
+    now = time.time()
+    reserve, daily = policy.limits_for(priority)
+    bucket, counter = _bucket_keys(step, api_key, now)
+    ttl = int(policy.burst / policy.per_sec) + 60
+    return (
+        [bucket, counter],
+        [policy.per_sec, policy.burst, now, reserve, daily, ttl],
+        now,
+    )
+
+
+def _decide(step: str, priority: str, result, waited: float, deadline_at: float, now: float) -> Optional[float]:
+    """Lua 결과 해석 -> None(통과) / 잠깐 기다릴 초 / QuotaExceeded"""
+    allowed, wait, _ = int(result[0]), float(result[1]), result[2]
+    if allowed == 1:
+        stats.incr(step, priority, "allowed")
+        if waited:
+            stats.incr(step, priority, "queued")
+            stats.incr(step, priority, "wait_sec", waited)
+        return None
+    if allowed == -1:
+        stats.incr(step, priority, "shed")
+        raise QuotaExceeded(step, "daily", _seconds_until_kst_midnight(now))
+    if time.monotonic() + wait > deadline_at:
+        stats.incr(step, priority, "shed")
+        raise QuotaExceeded(step, "rate", max(1, int(wait + 0.999)))
+    return wait
+
+
+def acquire(redis, step: str, api_key: Optional[str], priority: str = INTERACTIVE,
+            max_wait: Optional[float] = None) -> float:
+    """
+    외부 API 1회 호출권 확보 (필요하면 줄 서서 기다림) -> 기다린 초
+    한도 안에 못 받으면 QuotaExceeded
+    재시도도 외부 API 호출 1회이므로 http_client.http_get의 before_attempt로 시도마다 부름
+    """
+    if not RATE_LIMIT_ENABLED or step not in _policies:
+        return 0.0
+    started = time.monotonic()
+    deadline_at = started + _max_wait(priority, max_wait)
+    waited = 0.0
+    while True:
+        try:
+            keys, args, now = _prepare(step, api_key, priority)
+            result = _get_acquire_script(redis)(keys=keys, args=args, client=redis)
+        except Exception as e:
+            print(f"Rate Limit Redis Error (Ignored): {e}")
+            return 0.0
+        wait = _decide(step, priority, result, waited, deadline_at, now)
+        if wait is None:
+            return waited
+        time.sleep(wait)
+        waited = time.monotonic() - started
+
+
+async def acquire_async(redis, step: str, api_key: Optional[str], priority: str = INTERACTIVE,
+                        max_wait: Optional[float] = None) -> float:
+    """acquire의 비동기 버전 (redis.asyncio 클라이언트, http_client.http_get_async의 before_attempt)"""
+    if not RATE_LIMIT_ENABLED or step not in _policies:
+        return 0.0
+    started = time.monotonic()
+    deadline_at = started + _max_wait(priority, max_wait)
+    waited = 0.0
+    while True:
+        try:
+            keys, args, now = _prepare(step, api_key, priority)
+            result = await _get_async_acquire_script(redis)(keys=keys, args=args, client=redis)
+        except Exception as e:
+            print(f"Rate Limit Redis Error (Ignored): {e}")
+            return 0.0
+        wait = _decide(step, priority, result, waited, deadline_at, now)
+        if wait is None:
+            return waited
+        await asyncio.sleep(wait)
+        waited = time.monotonic() - started
+
+
+def get_quota_stats(redis) -> dict:
+    """/status/upstream-quota 응답 (API 키 + 서비스별 오늘 사용량 / 한도 / 남은 토큰 + 이 워커의 대기/포기 수)"""
+    local = stats.snapshot()
+    now = time.time()
+    result = {}
+    for step, policy in _policies.items():
+        bucket, counter = _bucket_keys(step, os.getenv(STEP_API_KEY_ENV[step]), now)
+        entry = {
+            "api_key": STEP_API_KEY_ENV[step],
+            "per_sec": policy.per_sec,
+            "burst": policy.burst,
+            "daily_limit": policy.daily,
+            "background_daily_limit": policy.limits_for(BACKGROUND)[1],
+            "local": local.get(step, {}),
+        }
+        try:
+            used = redis.get(counter)
+            tokens = redis.hget(bucket, "tokens")
+            entry["used_today"] = int(used or 0)
+            entry["tokens"] = round(float(tokens), 2) if tokens is not None else policy.burst
+            entry["daily_usage_ratio"] = round(entry["used_today"] / policy.daily, 4) if policy.daily else None
+        except Exception as e:
+            entry["error"] = str(e)
+        result[step] = entry
+    return {"enabled": RATE_LIMIT_ENABLED, "steps": result}
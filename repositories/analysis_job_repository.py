@@ -0,0 +1,93 @@
+# repositories/analysis_job_repository.py
+import json
+import os
+import time
+import uuid
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi import Depends
+from redis import Redis
+
+from cache import get_redis_client
+
+load_dotenv()
+
+# 202 분석 작업 상태 보관 시간 (끝난 뒤에도 이 시간 동안은 결과 조회 가능)
+ANALYSIS_JOB_TTL_SEC = int(os.getenv("ANALYSIS_JOB_TTL", "600"))
+JOB_KEY_PREFIX = "analysis:job:"
+JOB_BARCODE_PREFIX = "analysis:job:barcode:"
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class AnalysisJobRepository:
+    """
+    콜드 미스 분석 작업 저장소 (Redis -> 어느 워커든 같은 작업 상태를 응답)
+    - analysis:job:{job_id}           : 작업 상태 JSON (status, result, error)
+    - analysis:job:barcode:{barcode}  : 진행 중인 작업 id (같은 바코드 작업은 하나만)
+    """
+    def __init__(self, redis: Redis = Depends(get_redis_client)):
+        self.redis = redis
+
+    def create_or_get(self, barcode: str) -> Tuple[dict, bool]:
+        """
+        바코드의 진행 중인 작업이 있으면 그걸, 없으면 새로 만듦 -> (작업, 새로 만들었는지)
+        """
+        job_id = uuid.uuid4().hex
+        pointer = f"{JOB_BARCODE_PREFIX}{barcode}"
+        if not self.redis.set(pointer, job_id, nx=True, ex=ANALYSIS_JOB_TTL_SEC):
+            existing = self.redis.get(pointer)
+            job = self.get(existing) if existing else None
+            if job and job["status"] in (PENDING, RUNNING):
+                return job, False
+            # 작업 상태가 만료됐거나 이미 끝난 작업 -> 새 작업으로 교체
+            self.redis.set(pointer, job_id, ex=ANALYSIS_JOB_TTL_SEC)
+
+        job = {
+            "job_id": job_id,
+            "barcode": barcode,
+            "status": PENDING,
+            "result": None,
+            "error": None,
+            "error_status": None,
+            "created_at": time.time(),
+        }
+        self._save(job)
+        return job, True
+
+    def get(self, job_id: str) -> Optional[dict]:
+        data = self.redis.get(f"{JOB_KEY_PREFIX}{job_id}")
+        return json.loads(data) if data else None
+
+    def mark_running(self, job: dict):
+        job["status"] = RUNNING
+        self._save(job)
+
+    def complete(self, job: dict, payload: bytes):
+        """분석 결과(JSON bytes) 저장 + 바코드 포인터 해제 (다음 조회부터는 분석 캐시에서 바로 나감)"""
+        job["status"] = DONE
+        job["result"] = json.loads(payload)
+        self._finish(job)
+
+    def fail(self, job: dict, status_code: int, detail: str):
+        """실패 기록 (404/422/503 ...) + 바코드 포인터 해제 (다음 요청은 새 작업으로 다시 시도)"""
+        job["status"] = FAILED
+        job["error"] = detail
+        job["error_status"] = status_code
+        self._finish(job)
+
+    def _finish(self, job: dict):
+        pipe = self.redis.pipeline()
+        pipe.set(f"{JOB_KEY_PREFIX}{job['job_id']}", json.dumps(job, ensure_ascii=False), ex=ANALYSIS_JOB_TTL_SEC)
+        # 그 사이 다른 작업으로 바뀌었으면 지우지 않음 (만료 후 재생성된 경우)
+        pipe.get(f"{JOB_BARCODE_PREFIX}{job['barcode']}")
+        _, pointer = pipe.execute()
+        if pointer == job["job_id"]:
+            self.redis.delete(f"{JOB_BARCODE_PREFIX}{job['barcode']}")
+
+    def _save(self, job: dict):
+        self.redis.set(f"{JOB_KEY_PREFIX}{job['job_id']}", json.dumps(job, ensure_ascii=False), ex=ANALYSIS_JOB_TTL_SEC)
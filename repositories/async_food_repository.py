@@ -0,0 +1,380 @@
+# repositories/async_food_repository.py
+"""
+FoodRepository의 비동기 버전 (ANALYSIS_PIPELINE_MODE=async)
+- Redis: redis.asyncio / DB: SQLAlchemy AsyncSession / 외부 API: http_client.http_get_async (httpx)
+- 콜드 미스가 외부 API를 기다리는 동안 스레드, DB 연결을 잡고 있지 않음
+  -> 워커 하나가 수백 개의 콜드 미스를 동시에 들고 있어도 캐시 히트 요청은 막히지 않음
+- 단계별 요청/해석, 조회 결과 조립, 캐시 키/값, 조회문, upsert 문은 FoodRepositoryBase 것을 그대로 씀
+  (여기에는 I/O를 await로 하는 부분만)
+- single-flight 표(_INFLIGHT)도 동기 리포지토리와 공유 -> 동기/비동기 요청이 섞여도 바코드당 조회 1번
+- 응답 뒤에 도는 일(stale 새로고침, 이미지 보강)은 동기 FoodRepository에 맡김 (background_repo)
+"""
+import asyncio
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from fastapi import Depends, HTTPException
+from redis import Redis
+from redis import asyncio as aioredis
+
+import rate_limiter
+from bulkhead import async_upstream_bulkhead, BulkheadFull
+from cache import get_async_redis_client, get_redis_client
+from database import get_async_sessionmaker, SessionLocal
+from deadline import Deadline, DeadlineExceeded
+from http_client import http_get_async
+from models.dtos import RawProductAPIDTO
+from models.models import Food
+from rate_limiter import QuotaExceeded
+from repositories.food_repository import (
+    FoodRepositoryBase, FoodRepository, ProductLookupError,
+    _join_inflight, _leave_inflight, _REFRESH_EXECUTOR, _IMAGE_EXECUTOR,
+    FETCH_LOCK_TTL_SEC, FETCH_LOCK_WAIT_SEC,
+    NEGATIVE_CACHE_TTL_SEC, NEGATIVE_CACHE_PREFIX,
+    IMAGE_STATUS_PREFIX, IMAGE_PENDING_TTL_SEC,
+)
+from services.additive_service import AdditiveService
+from services.score_service import ScoreService
+
+
+@lru_cache(maxsize=1)
+def get_shared_additive_service() -> AdditiveService:
+    """
+    워커 전체에서 공유하는 AdditiveService (첨가물 목록을 요청마다 DB에서 다시 읽지 않음)
+    DB를 동기로 읽으므로 이벤트 루프 밖에서 한 번 만들어 둠 (main.py lifespan)
+    """
+    return AdditiveService()
+
+
+class AsyncFoodRepository(FoodRepositoryBase):
+    def __init__(self, additive_service: AdditiveService = Depends(get_shared_additive_service),
+                 score_service: ScoreService = Depends(ScoreService),
+                 redis: aioredis.Redis = Depends(get_async_redis_client),
+                 sync_redis: Redis = Depends(get_redis_client)):
+        super().__init__(additive_service, score_service)
+        self.redis = redis
+        # 조회마다 짧게 세션을 열고 바로 반납 (API 기다리는 동안 DB 연결을 잡지 않음)
+        self.session_factory = get_async_sessionmaker()
+        # 백그라운드 작업(동기 FoodRepository)용
+        self.sync_redis = sync_redis
+        self.sync_session_factory = SessionLocal
+
+    async def get_raw_data(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        """
+        [흐름] 동기 FoodRepository.get_raw_data와 같음
+        캐시(워커 내부 -> Redis) -> DB -> 네거티브 캐시 -> 외부 API (single-flight, bulkhead 안에서만)
+        """
+        dto = await self.find_raw_data(barcode)
+        if dto:
+            return dto
+        return await self._fetch_cold(barcode, deadline)
+
+    async def find_raw_data(self, barcode: str) -> Optional[RawProductAPIDTO]:
+        """외부 API 없이 찾을 수 있는 데이터만 (None이면 콜드 조회가 필요한 바코드)"""
+        cached = await self._get_cached(barcode)
+        if cached:
+            return cached
+
+        dto = await self._get_from_db(barcode)
+        if dto:
+            await self._cache_data(barcode, dto)
+            return dto
+
+        await self._raise_if_known_missing(barcode)
+        return None
+
+    async def _fetch_cold(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        """
+        외부 API 콜드 조회는 async upstream bulkhead 자리가 있을 때만 (없으면 503)
+        스레드를 잡지 않으므로 상한은 동기보다 크게 (BULKHEAD_ASYNC_UPSTREAM_LIMIT)
+        """
+        try:
+            async with async_upstream_bulkhead.async_slot(deadline.remaining() if deadline else None):
+                return await self._fetch_single_flight(barcode, deadline)
+        except BulkheadFull as e:
+            raise self._bulkhead_rejected(e)
+
+    async def _get_cached(self, barcode: str) -> Optional[RawProductAPIDTO]:
+        local = self.local_cache.get(barcode)
+        if local:
+            return local
+
+        try:
+            cached_data, is_fresh = await self.redis.mget(f"product:{barcode}", f"product:fresh:{barcode}")
+            if cached_data:
+                print(f"[AsyncRepo] Redis Cache Hit: {barcode}")
+                dto = self._from_cache_entry(barcode, cached_data, is_fresh)
+                if not is_fresh:
+                    await self._schedule_refresh(barcode)
+                return dto
+        except Exception as e:
+            print(f"Redis Error (Ignored): {e}")
+        return None
+
+    async def _get_from_db(self, barcode: str) -> Optional[RawProductAPIDTO]:
+        async with self.session_factory() as db:
+            food_obj = (await db.scalars(self._food_select().where(Food.barcode == barcode))).first()
+            if food_obj:
+                print(f"[AsyncRepo] DB Hit (Joined): {barcode}")
+                return self._entity_to_dto(food_obj)
+        return None
+
+    # =====================================================
+    # 백그라운드 작업 (동기 FoodRepository에 위임)
+    # =====================================================
+    def background_repo(self) -> FoodRepository:
+        """
+        응답 뒤에 스레드풀에서 도는 일용 동기 리포지토리 (요청 세션 없이 session_factory의 짧은 세션만 씀)
+        새로고침 / 이미지 보강 / 202 분석 작업이 동기 모드와 같은 코드로 돔
+        """
+        repo = FoodRepository(
+            db=None,
+            additive_service=self.additive_service,
+            score_service=self.score_service,
+            redis=self.sync_redis
+        )
+        repo.session_factory = self.sync_session_factory
+        return self._copy_settings_to(repo)
+
+    async def _schedule_refresh(self, barcode: str):
+        """바코드당 새로고침 1개만 (Redis NX) -> 동기 리포지토리의 _refresh_in_background"""
+        try:
+            acquired = await self.redis.set(f"lock:refresh:{barcode}", "1", nx=True, ex=FETCH_LOCK_TTL_SEC)
+        except Exception as e:
+            print(f"Redis Error (Ignored): {e}")
+            return
+        if acquired:
+            print(f"[AsyncRepo] Stale cache, refreshing in background: {barcode}")
+            _REFRESH_EXECUTOR.submit(self.background_repo()._refresh_in_background, barcode)
+
+    async def schedule_image_enrichment(self, barcode: str, report_no: Optional[str]) -> bool:
+        """이미지 조회를 백그라운드 큐에 넣음 (바코드당 1개만 - Redis NX)"""
+        if not report_no:
+            return False
+        try:
+            acquired = await self.redis.set(f"{IMAGE_STATUS_PREFIX}{barcode}", "pending",
+                                            nx=True, ex=IMAGE_PENDING_TTL_SEC)
+        except Exception as e:
+            print(f"Redis Error (Ignored): {e}")
+            return False
+        if acquired:
+            _IMAGE_EXECUTOR.submit(self.background_repo()._enrich_image, barcode, report_no)
+        return bool(acquired)
+
+    # =====================================================
+    # 콜드 조회 (single-flight -> 워커 락 -> 외부 API -> 저장)
+    # =====================================================
+    async def _fetch_single_flight(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        """
+        같은 바코드 조회를 한 번으로 합침 (동기 리포지토리와 같은 _INFLIGHT 표)
+        - 기다리는 쪽은 Future를 await (스레드를 잡지 않음)
+        - 리더 요청이 취소되면(클라이언트 끊김) 기다리던 요청에는 503을 넘김
+        """
+        future, is_leader = _join_inflight(barcode)
+        if not is_leader:
+            print(f"[AsyncRepo] Waiting for in-flight fetch: {barcode}")
+            wait = FETCH_LOCK_WAIT_SEC + FETCH_LOCK_TTL_SEC
+            try:
+                # shield: 이 요청이 취소돼도 공유 Future는 그대로 둠
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)),
+                                              deadline.timeout(wait) if deadline else wait)
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=504, detail="Analysis deadline exceeded (waiting for in-flight fetch)")
+
+        try:
+            dto = await self._fetch_with_worker_lock(barcode, deadline)
+            future.set_result(dto)
+            return dto
+        except asyncio.CancelledError:
+            future.set_exception(HTTPException(
+                status_code=503,
+                detail="Product lookup was cancelled, please retry",
+                headers={"Retry-After": "1"}
+            ))
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            _leave_inflight(barcode)
+
+    async def _fetch_with_worker_lock(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        """Redis 락으로 여러 워커 중 하나만 외부 API를 호출하게 함 (동기 리포지토리와 같은 락 키)"""
+        lock = self.redis.lock(
+            f"lock:product:{barcode}",
+            timeout=FETCH_LOCK_TTL_SEC,
+            blocking_timeout=deadline.timeout(FETCH_LOCK_WAIT_SEC) if deadline else FETCH_LOCK_WAIT_SEC
+        )
+        try:
+            acquired = await lock.acquire()
+        except Exception as e:
+            print(f"Redis Lock Error (Ignored): {e}")
+            return await self._fetch_and_store(barcode, deadline)
+
+        if not acquired:
+            print(f"[AsyncRepo] Lock wait timed out, fetching anyway: {barcode}")
+            return await self._fetch_and_store(barcode, deadline)
+
+        try:
+            dto = await self._get_cached(barcode) or await self._get_from_db(barcode)
+            if dto:
+                return dto
+            await self._raise_if_known_missing(barcode)
+            return await self._fetch_and_store(barcode, deadline)
+        finally:
+            try:
+                await lock.release()
+            except Exception as e:
+                print(f"Redis Unlock Error (Ignored): {e}")
+
+    async def _fetch_and_store(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        print(f"[AsyncRepo] API Fetching sequence started for: {barcode}")
+        try:
+            api_dto = await self._fetch_full_data_sequence(barcode, deadline)
+        except ProductLookupError as le:
+            await self._cache_missing(barcode, le)
+            raise
+
+        if api_dto.provisional:
+            await self._cache_provisional(barcode, api_dto)
+            return api_dto
+
+        await self._save_to_db_split(api_dto)
+        await self._cache_data(barcode, api_dto)
+        await self.schedule_image_enrichment(barcode, api_dto.report_no)
+        return api_dto
+
+    async def _fetch_full_data_sequence(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        self._require_api_keys()
+
+        # --- Step 1: C005 (보고번호가 있어야 나머지 조회 가능) ---
+        try:
+            base_info = await self._call_step("C005", barcode, deadline)
+        except (DeadlineExceeded, QuotaExceeded) as e:
+            self._budget_exceeded("C005", e, [])
+        report_no = self._report_no(base_info)
+
+        # --- Step 2~4: 보고번호 기반 조회 동시 호출 (동기 버전의 _API_EXECUTOR 대신 gather) ---
+        local_nut = await self._get_local_nutrition(report_no)
+        steps = ["I1250", "C002"] + ([] if local_nut else ["NUTRI"])
+        results = await asyncio.gather(
+            *(self._call_step(step, report_no, deadline) for step in steps),
+            return_exceptions=True
+        )
+        return self._assemble(barcode, base_info, local_nut, dict(zip(steps, results)))
+
+    async def _get_local_nutrition(self, report_no: str) -> Optional[dict]:
+        """Step 4 대체: nutrition_reference 표"""
+        try:
+            async with self.session_factory() as db:
+                ref = (await db.scalars(self._nutrition_select(report_no))).first()
+                if not ref:
+                    return None
+                print(f"[AsyncRepo] Local nutrition hit: {report_no}")
+                return self._nutrition_dict(ref)
+        except Exception as e:
+            print(f"Nutrition Reference Error (Ignored): {e}")
+            return None
+
+    async def _acquire_quota(self, step: str, deadline: Optional[Deadline] = None):
+        """외부 API 1회 호출권 (동기 버전과 같은 Redis 토큰 버킷)"""
+        await rate_limiter.acquire_async(self.redis, step, self._api_key(step), self.call_priority,
+                                         max_wait=deadline.remaining() if deadline else None)
+
+    async def _call_step(self, step: str, key: str, deadline: Optional[Deadline] = None):
+        breaker = self._step_breaker(step, deadline)
+        url, params, timeout = self._step_request(step, key)
+        try:
+            r = await http_get_async(url, params=params, timeout=timeout, deadline=deadline,
+                                     before_attempt=lambda: self._acquire_quota(step, deadline))
+        except Exception as e:
+            return self._step_error(step, breaker, e, deadline)
+        return self._step_response(step, key, breaker, r)
+
+    async def _save_to_db_split(self, dto: RawProductAPIDTO):
+        """동기 버전과 같은 upsert 문 (테이블당 1번), 짧은 세션"""
+        try:
+            async with self.session_factory() as db:
+                for stmt in self._product_upsert_stmts([dto], db.get_bind().dialect.name):
+                    await db.execute(stmt)
+                await db.commit()
+            await self.invalidate_products([dto.barcode])
+            print(f"[AsyncRepo] Saved split data for {dto.name}")
+        except Exception as e:
+            print(f"DB Save Split Error: {e}")
+
+    # =====================================================
+    # 캐시 (키 / 값 형식은 FoodRepositoryBase)
+    # =====================================================
+    async def _raise_if_known_missing(self, barcode: str):
+        try:
+            cached_miss = await self.redis.get(f"{NEGATIVE_CACHE_PREFIX}{barcode}")
+        except Exception as e:
+            print(f"Redis Error (Ignored): {e}")
+            return
+        if not cached_miss:
+            return
+
+        error = self._miss_error(cached_miss)
+        print(f"[AsyncRepo] Negative Cache Hit: {barcode} (step={error.step})")
+        raise error
+
+    async def _cache_missing(self, barcode: str, error: ProductLookupError):
+        if NEGATIVE_CACHE_TTL_SEC <= 0:
+            return
+        try:
+            await self.redis.setex(f"{NEGATIVE_CACHE_PREFIX}{barcode}", NEGATIVE_CACHE_TTL_SEC, self._miss_value(error))
+        except Exception as e:
+            print(f"Redis Save Error: {e}")
+
+    async def _cache_provisional(self, barcode: str, dto: RawProductAPIDTO):
+        print(f"[AsyncRepo] Provisional result cached briefly: {barcode} {dto.provisional}")
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            self._stage_provisional(pipe, barcode, dto)
+            await pipe.execute()
+        except Exception as e:
+            print(f"Redis Save Error: {e}")
+
+    async def _cache_data(self, barcode: str, dto: RawProductAPIDTO):
+        await self._cache_many({barcode: dto})
+
+    async def _cache_many(self, dtos: Dict[str, RawProductAPIDTO]):
+        if not dtos:
+            return
+        self._cache_locally(dtos)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            self._stage_cache_many(pipe, dtos)
+            await pipe.execute()
+        except Exception as e:
+            print(f"Redis Save Error: {e}")
+
+    async def invalidate_products(self, barcodes: List[str]):
+        if not barcodes:
+            return
+        keys = self._product_keys(barcodes)
+        try:
+            await self.redis.delete(*keys)
+        except Exception as e:
+            print(f"Redis Delete Error: {e}")
+
+    async def get_cached_analysis(self, barcode: str) -> Optional[bytes]:
+        local = self.analysis_local_cache.get(barcode)
+        if local:
+            return local
+        try:
+            cached = await self.redis.get(self._analysis_key(barcode))
+            if cached:
+                return self._from_analysis_cache(barcode, cached)
+        except Exception as e:
+            print(f"Redis Error (Ignored): {e}")
+        return None
+
+    async def cache_analysis(self, barcode: str, payload: bytes):
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            self._stage_analysis_many(pipe, {barcode: payload})
+            await pipe.execute()
+        except Exception as e:
+            print(f"Redis Save Error: {e}")
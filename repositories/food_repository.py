@@ -1,27 +1,114 @@
 # repositories/food_repository.py
 import os
 import json
-import requests
-from typing import Optional, List
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, List, Tuple, Dict, Union
 from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.sql import text
 from redis import Redis
 from dotenv import load_dotenv
-from models.models import Food, NutritionFact, RecyclingInfo, Ingredient
+from models.models import Food, NutritionFact, RecyclingInfo, Ingredient, NutritionReference
 from models.dtos import RawProductAPIDTO 
-from database import get_db 
+from database import get_db, get_read_db, SessionLocal
+from http_client import http_get
+from circuit_breaker import get_breaker, CircuitBreaker, CircuitOpenError
+from bulkhead import batch_bulkhead, upstream_bulkhead, BulkheadFull
+from deadline import Deadline, DeadlineExceeded
+import rate_limiter
+from rate_limiter import QuotaExceeded, INTERACTIVE, BACKGROUND
+from cache import get_redis_client, product_local_cache, analysis_local_cache
 from dotenv import load_dotenv
 from services.additive_service import AdditiveService
-from services.score_service import ScoreService
+from services.score_service import ScoreService, SCORING_RULES_VERSION
 
 load_dotenv() 
 
-class FoodRepository:
-    def __init__(self, db: Session = Depends(get_db),
-                 additive_service: AdditiveService = Depends(AdditiveService),
-                 score_service: ScoreService = Depends(ScoreService)):
-        self.db = db
+# 보고번호 기반 후속 API(I1250, C002, 영양성분, 이미지) 동시 호출용 스레드풀
+# (요청마다 만들지 않고 프로세스 전체에서 공유)
+_API_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("FOOD_API_FANOUT_WORKERS", "16")),
+    thread_name_prefix="food-api"
+)
+
+# 같은 바코드 동시 조회 합치기 (single-flight)
+# - _INFLIGHT: 바코드 -> 진행 중인 조회의 Future (프로세스 내부)
+# - Redis 락: 워커(프로세스) 사이
+FETCH_LOCK_TTL_SEC = int(os.getenv("PRODUCT_FETCH_LOCK_TTL", "30"))
+FETCH_LOCK_WAIT_SEC = int(os.getenv("PRODUCT_FETCH_LOCK_WAIT", "20"))
+# (비동기 리포지토리도 같은 표를 씀 -> 동기/비동기 요청이 섞여도 바코드당 조회 1번)
+_INFLIGHT: dict = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _join_inflight(barcode: str) -> Tuple[Future, bool]:
+    """바코드의 진행 중 조회 Future와 내가 리더인지 (없으면 새로 만들고 리더)"""
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(barcode)
+        if future is not None:
+            return future, False
+        future = Future()
+        _INFLIGHT[barcode] = future
+        return future, True
+
+
+def _leave_inflight(barcode: str):
+    with _INFLIGHT_LOCK:
+        _INFLIGHT.pop(barcode, None)
+
+# product:{barcode} 캐시 만료 정책 (stale-while-revalidate)
+# - soft TTL이 지나면: 캐시 값은 바로 주고, 뒤에서 1번만 새로고침
+# - hard TTL이 지나면: Redis에서 삭제 (오래된 데이터가 나갈 수 있는 최대 시간)
+PRODUCT_CACHE_SOFT_TTL_SEC = int(os.getenv("PRODUCT_CACHE_SOFT_TTL", "3600"))
+PRODUCT_CACHE_HARD_TTL_SEC = int(os.getenv("PRODUCT_CACHE_HARD_TTL", "86400"))
+_REFRESH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PRODUCT_REFRESH_WORKERS", "4")),
+    thread_name_prefix="product-refresh"
+)
+
+# 외부 API에 없는 바코드(404/422) 결과를 잠깐 기억해두는 네거티브 캐시
+NEGATIVE_CACHE_TTL_SEC = int(os.getenv("NEGATIVE_CACHE_TTL", "600"))
+NEGATIVE_CACHE_PREFIX = "product:miss:"
+
+# 시간 예산 때문에 못 채운 단계 -> 응답의 provisional 항목 이름
+PROVISIONAL_FIELDS = {"I1250": "packaging", "C002": "additives", "NUTRI": "nutrition"}
+# provisional 결과는 DB에 저장하지 않고 이 시간만 Redis에 둠 (fresh 표시 없음 -> 다음 조회 때 뒤에서 새로고침)
+PROVISIONAL_CACHE_TTL_SEC = int(os.getenv("PROVISIONAL_CACHE_TTL", "300"))
+
+# 제품 이미지(CertImgList)는 응답을 막지 않고 저장 후 백그라운드에서 채움
+# - image:status:{barcode} = pending(조회 중) / none(이미지 없음 또는 실패 -> TTL 지나면 다시 시도)
+# - 채워지면 키를 지우고 Food.image_url에 저장 (상태 조회는 Food.image_url 먼저 확인)
+IMAGE_STATUS_PREFIX = "image:status:"
+IMAGE_PENDING_TTL_SEC = int(os.getenv("IMAGE_PENDING_TTL", "120"))
+IMAGE_RETRY_TTL_SEC = int(os.getenv("IMAGE_RETRY_TTL", "3600"))
+_IMAGE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("IMAGE_ENRICH_WORKERS", "4")),
+    thread_name_prefix="image-enrich"
+)
+
+
+class ProductLookupError(HTTPException):
+    """
+    외부 API가 '이 제품 없음/필수정보 없음'이라고 확정해준 경우의 404/422
+    - step: 실패한 단계 (C005, I1250, C002, NUTRI)
+    - 타임아웃/5xx 같은 일시적 장애는 그냥 HTTPException으로 던짐 (네거티브 캐시 X)
+    """
+    def __init__(self, status_code: int, detail: str, step: str):
+        super().__init__(status_code=status_code, detail=detail)
+        self.step = step
+
+class FoodRepositoryBase:
+    """
+    FoodRepository / AsyncFoodRepository의 I/O 없는 부분 (I/O는 각 리포지토리가 동기/await로)
+    - 외부 API 주소/키, 단계별 요청 정보와 응답 해석, 브레이커 기록, 조회 결과 조립
+    - 캐시 키 / TTL / 값 형식 (Redis 파이프라인에 명령만 쌓음)
+    - DB 조회문, DB 엔티티 <-> DTO 변환, upsert 문 생성
+    """
+    def __init__(self, additive_service: AdditiveService, score_service: ScoreService):
         self.food_api_key = os.getenv("FOOD_API_KEY")       # 식약처
         self.data_go_kr_key = os.getenv("DATA_GO_KR_API_KEY") # 공공데이터포털
         self.base_url_food = "http://openapi.foodsafetykorea.go.kr/api"
@@ -29,213 +116,307 @@ class FoodRepository:
         self.base_url_img = "https://apis.data.go.kr/B553748/CertImgListServiceV3/getCertImgListServiceV3"
         self.additive_service = additive_service
         self.score_service = score_service
-        # [Redis 연결] 
-        # 로컬/도커 환경에 맞게 호스트 설정 (기본: localhost)
-        # decode_responses=True 필수 (bytes -> str 자동 변환)
-        self.redis = Redis(host='4.236.184.102', port=6379, db=0, decode_responses=True)
+        # [1차 캐시] 워커 내부 LRU (검증된 DTO 보관, Redis 앞단)
+        self.local_cache = product_local_cache
+        self.analysis_local_cache = analysis_local_cache
+        # 호출량 한도 우선순위 (백그라운드 새로고침/이미지 보강은 BACKGROUND)
+        self.call_priority = INTERACTIVE
 
-    def get_raw_data(self, barcode: str) -> RawProductAPIDTO:
-        """
-        [흐름] 
-        1. Redis 캐시 확인 (제일 빠름)
-        2. DB 확인 (테이블 3개 조인)
-        3. API 확인 (외부 통신)
-        """
-        
-        # ---------------------------------------------------------
-        # 1. Redis 캐시 조회
-        # ---------------------------------------------------------
-        try:
-            cached_data = self.redis.get(f"product:{barcode}")
-            if cached_data:
-                print(f"[Repo] Redis Cache Hit: {barcode}")
-                # JSON 문자열 -> Pydantic DTO 변환
-                return RawProductAPIDTO.model_validate_json(cached_data)
-        except Exception as e:
-            print(f"Redis Error (Ignored): {e}")
+    def _api_key(self, step: str) -> Optional[str]:
+        """단계별로 쓰는 API 키 (호출량 한도가 키 + 서비스 단위)"""
+        return self.food_api_key if step in ("C005", "I1250", "C002") else self.data_go_kr_key
 
-        # ---------------------------------------------------------
-        # 2. DB 조회 (JOIN 사용)
-        # ---------------------------------------------------------
-        # Food + Nutrition + Recycling 정보를 한 번에 가져옴
-        food_obj = self.db.query(Food).options(
-            joinedload(Food.nutrition),
-            joinedload(Food.recycling)
-        ).filter(Food.barcode == barcode).first()
+    def _analysis_key(self, barcode: str) -> str:
+        return f"analysis:v{SCORING_RULES_VERSION}:{barcode}"
 
-        if food_obj:
-            print(f"[Repo] DB Hit (Joined): {barcode}")
-            dto = self._entity_to_dto(food_obj)
-            
-            # [캐싱] DB에서 찾은거 Redis에 저장 (1시간)
-            self._cache_data(barcode, dto)
-            return dto
+    def _copy_settings_to(self, repo: "FoodRepositoryBase") -> "FoodRepositoryBase":
+        """같은 워커 내부 캐시 / API 키 / 주소를 쓰도록 설정 복사 (동시 조회 / 백그라운드용 리포지토리)"""
+        repo.local_cache = self.local_cache
+        repo.analysis_local_cache = self.analysis_local_cache
+        repo.food_api_key = self.food_api_key
+        repo.data_go_kr_key = self.data_go_kr_key
+        repo.base_url_food = self.base_url_food
+        repo.base_url_nutri = self.base_url_nutri
+        repo.base_url_img = self.base_url_img
+        return repo
 
-        # ---------------------------------------------------------
-        # 3. API 호출
-        # ---------------------------------------------------------
-        print(f"[Repo] API Fetching sequence started for: {barcode}")
-        api_dto = self._fetch_full_data_sequence(barcode)
+    # =====================================================
+    # 외부 API 단계별 요청 / 응답 해석
+    # - step: C005(바코드), I1250 / C002 / NUTRI / IMG(보고번호)
+    # - 404/422 판정은 _parse_step에서 HTTPException으로 던짐
+    # - 그 외 에러(타임아웃, JSON 깨짐 등)는 _step_failed의 기본값으로 진행
+    # =====================================================
+    def _step_request(self, step: str, key: str) -> Tuple[str, Optional[dict], float]:
+        """(url, query params, timeout초)"""
+        if step == "C005":
+            return f"{self.base_url_food}/{self.food_api_key}/C005/json/1/5/BAR_CD={key}", None, 5
+        if step in ("I1250", "C002"):
+            return f"{self.base_url_food}/{self.food_api_key}/{step}/json/1/5/PRDLST_REPORT_NO={key}", None, 3
+        if step == "NUTRI":
+            params = {
+                "serviceKey": self.data_go_kr_key,
+                "itemMnftrRptNo": key,
+                "type": "json",
+                "numOfRows": "1"
+            }
+            return self.base_url_nutri, params, 5
+        params = { "serviceKey": self.data_go_kr_key, "prdlstReportNo": key, "returnType": "json" }
+        return self.base_url_img, params, 5
 
-        # 4. 저장 & 캐싱
-        self._save_to_db_split(api_dto)
-        self._cache_data(barcode, api_dto)
-        
-        return api_dto
+    def _parse_step(self, step: str, key: str, r):
+        """r: requests.Response / httpx.Response (status_code, json()만 사용)"""
+        if step == "C005":
+            return self._parse_c005(r)
+        if step == "I1250":
+            return self._parse_i1250(key, r)
+        if step == "C002":
+            return self._parse_c002(r)
+        if step == "NUTRI":
+            return self._parse_nutrition(r)
+        return self._parse_image(r)
 
-    def _cache_data(self, barcode: str, dto: RawProductAPIDTO):
-        """Redis에 데이터 저장 (TTL 3600초)"""
-        try:
-            self.redis.setex(
-                f"product:{barcode}", 
-                3600, 
-                dto.model_dump_json() # DTO -> JSON 문자열 변환
+    def _step_failed(self, step: str, e: Exception):
+        """404/422가 아닌 에러가 났을 때의 처리 (C005만 중단, 나머지는 기본값으로 진행)"""
+        if step == "C005":
+            print(f"C005 Error: {e}")
+            raise HTTPException(status_code=404, detail="Product not found (C005 Error)")
+        if step == "I1250":
+            print(f"I1250 Error: {e}")
+            # 알 수 없는 에러도 일단 넘길지, 멈출지 결정. (여기선 로그 찍고 진행)
+            return "기타"
+        if step == "C002":
+            print(f"C002 Error: {e}")
+            return None, 0, None
+        if step == "NUTRI":
+            print(f"Nutri API Error: {e}")
+            return {}
+        print(f"Img API Error: {e}")
+        return None
+
+    def _step_open(self, step: str, breaker: CircuitBreaker):
+        """
+        브레이커가 열려 있을 때 (외부 API 호출 없이 바로 처리)
+        - C005: 보고번호 없이는 진행 불가 -> 503 + Retry-After (네거티브 캐시 X)
+        - 나머지: CircuitOpenError -> 예산 초과와 같이 기본값 + provisional
+          (장애 중에 만든 기본값이 DB / 긴 TTL 캐시에 저장되지 않음)
+        (DB에 있는 제품은 get_raw_data에서 외부 API보다 먼저 반환되므로 장애 중에도 그대로 나감)
+        """
+        retry_after = breaker.retry_after()
+        if step == "C005":
+            print(f"[Repo] C005 circuit open, failing fast (retry after {retry_after}s)")
+            raise HTTPException(
+                status_code=503,
+                detail="Product API temporarily unavailable (C005 circuit open)",
+                headers={"Retry-After": str(retry_after)}
             )
-        except Exception as e:
-            print(f"Redis Save Error: {e}")
+        raise CircuitOpenError(step, retry_after)
+
+    def _budget_exceeded(self, step: str, e: Union[DeadlineExceeded, QuotaExceeded, CircuitOpenError],
+                         provisional: List[str]):
+        """
+        분석 시간 예산 / 외부 API 호출 한도 / 열린 브레이커 때문에 단계를 못 마친 경우
+        - C005: 보고번호 없이는 진행 불가 -> 504(예산) / 503 + Retry-After(호출 한도)
+        - 나머지: 기본값으로 진행하고 provisional에 항목 추가
+        """
+        if step == "C005" and isinstance(e, QuotaExceeded):
+            raise HTTPException(
+                status_code=503,
+                detail=f"Product API quota exceeded (C005, {e.reason})",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        if step == "C005":
+            raise HTTPException(status_code=504, detail="Analysis deadline exceeded (C005)")
+        provisional.append(PROVISIONAL_FIELDS[step])
+        return self._step_failed(step, e)
 
-    def _fetch_full_data_sequence(self, barcode: str) -> Optional[RawProductAPIDTO]:
+    def _require_api_keys(self):
+        """
+        외부 API 키(.env FOOD_API_KEY / DATA_GO_KR_API_KEY)가 없으면 조회 자체가 불가능 -> 503
+        (설정 문제라 Retry-After 없음, 네거티브 캐시 X)
+        """
         if not self.food_api_key or not self.data_go_kr_key:
             print("API Keys missing!")
-            return None
+            raise HTTPException(status_code=503, detail="Product API is not configured (API keys missing)")
 
-        # --- Step 1: C005 (기본 정보 & 보고번호 따기) ---
-        c005_url = f"{self.base_url_food}/{self.food_api_key}/C005/json/1/5/BAR_CD={barcode}"
-        try:
-            r = requests.get(c005_url, timeout=5)
-            row_c005 = r.json().get("C005", {}).get("row", [])
-            
-            if not row_c005:
-                # 데이터 없으면 404 던짐
-                raise HTTPException(status_code=404, detail="Product not found in External API (C005)")
-            row_c005.sort(key=lambda x: x.get("PRDLST_REPORT_NO", ""), reverse=True)
-            base_info = row_c005[0]
-            report_no = base_info.get("PRDLST_REPORT_NO")
-            product_name = base_info.get("PRDLST_NM")
-            brand_name = base_info.get("BSSH_NM")
-            
-            print(f"Step 1 Done. Report No: {report_no}")
+    def _bulkhead_rejected(self, e: BulkheadFull) -> HTTPException:
+        """느린 경로(외부 API 콜드 조회) 자리가 없을 때 -> 503 + Retry-After (네거티브 캐시 X)"""
+        return HTTPException(
+            status_code=503,
+            detail="Too many product lookups in progress, please retry",
+            headers={"Retry-After": str(e.retry_after)}
+        )
 
+    def _step_breaker(self, step: str, deadline: Optional[Deadline]) -> CircuitBreaker:
+        """단계 호출 전 확인 (예산이 이미 끝났으면 DeadlineExceeded, 브레이커가 열려 있으면 _step_open)"""
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded(step)
+        breaker = get_breaker(step)
+        if not breaker.allow():
+            self._step_open(step, breaker)
+        return breaker
+
+    def _step_error(self, step: str, breaker: CircuitBreaker, e: Exception, deadline: Optional[Deadline]):
+        """외부 API 호출 자체가 실패한 경우 (연결 실패 / 타임아웃 등)"""
+        if isinstance(e, QuotaExceeded):
+            # 외부 API 장애가 아니므로 브레이커에 기록하지 않음
+            raise e
+        if deadline is not None and deadline.expired():
+            # 예산에 맞춰 줄인 타임아웃이라 외부 API 장애로 보지 않음 (브레이커 기록 X)
+            raise DeadlineExceeded(step) from e
+        breaker.record_failure()
+        return self._step_failed(step, e)
+
+    def _step_response(self, step: str, key: str, breaker: CircuitBreaker, r):
+        """외부 API 응답 -> 브레이커 기록 + 해석"""
+        self._record_step_result(breaker, r)
+        try:
+            return self._parse_step(step, key, r)
         except HTTPException as he:
-            raise he # [중요] 404 에러는 잡지 말고 밖으로 던져야 함!
+            raise he # [중요] 404/422는 잡지 말고 밖으로 던져야 함!
         except Exception as e:
-            print(f"C005 Error: {e}")
-            raise HTTPException(status_code=404, detail="Product not found (C005 Error)")
+            return self._step_failed(step, e)
+
+    def _record_step_result(self, breaker: CircuitBreaker, r):
+        """5xx / 429만 실패로 기록 (404 등은 API가 응답한 것이므로 성공)"""
+        if r.status_code >= 500 or r.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
 
+    def _parse_c005(self, r) -> dict:
+        """Step 1: C005 (기본 정보 & 보고번호) -> 보고번호가 가장 큰 row 반환"""
+        row_c005 = r.json().get("C005", {}).get("row", [])
+
+        if not row_c005:
+            # 데이터 없으면 404 던짐
+            raise ProductLookupError(404, "Product not found in External API (C005)", step="C005")
+        row_c005.sort(key=lambda x: x.get("PRDLST_REPORT_NO", ""), reverse=True)
+        base_info = row_c005[0]
+
+        print(f"Step 1 Done. Report No: {base_info.get('PRDLST_REPORT_NO')}")
+        return base_info
+
+    def _parse_i1250(self, report_no: str, r) -> str:
+        """Step 2: I1250 (포장재질)"""
+        if r.status_code >= 400:
+            raise HTTPException(status_code=404, detail="External API Error (I1250)")
+
+        rows = r.json().get("I1250", {}).get("row", [])
+        if not rows:
+            # 데이터 없으면 404 던짐
+            raise ProductLookupError(404, "Product not found in External API (I1250)", step="I1250")
+        pack_material = rows[0].get("FRMLC_MTRQLT")
+        if not pack_material or pack_material.strip() == "":
+            print(f"❌ [Error] {report_no} 제품의 포장재질 정보가 비어있음.")
+            raise ProductLookupError(422, "Essential Data Missing: Packaging Material is empty", step="I1250")
+        return pack_material.strip()
+
+    def _parse_c002(self, r) -> Tuple[Optional[str], int, Optional[str]]:
+        """Step 3: C002 (원재료명) -> (원재료 원문, 첨가물 개수, 첨가물 목록)"""
+        if r.status_code >= 400:
+            raise HTTPException(status_code=404, detail="External API Error (C002)")
+
+        rows = r.json().get("C002", {}).get("row", [])
+        if not rows:
+            raise ProductLookupError(404, "Product not found in External API (C002)", step="C002")
+        raw_materials = rows[0].get("RAWMTRL_NM")
+        calculated_additives_cnt, additive_list_str = 0, None
+        if raw_materials:
+            calculated_additives_cnt, additive_list_str = self.additive_service.calculate_count(raw_materials)
+        return raw_materials, calculated_additives_cnt, additive_list_str
+
+    def _parse_nutrition(self, r) -> dict:
+        """Step 4: 공공데이터포털 영양성분 API"""
+        if r.status_code >= 400:
+            raise HTTPException(status_code=404, detail="External API Error (Nutri)")
+
+        data = r.json()
+        items = []
+        if "response" in data and "body" in data["response"]:
+            items = data["response"]["body"].get("items", [])
+        elif "body" in data:
+             items = data["body"].get("items", [])
+
+        if not items:
+            raise ProductLookupError(404, "Product not found in External API (Nutri)", step="NUTRI")
+        item = items[0]
+        return {
+            "serving_size": item.get("nutConSrtrQua"),
+            "sodium": item.get("nat"),
+            "sugar": item.get("sugar"),
+            "sat_fat": item.get("fasat"),
+            "trans_fat": item.get("fatrn"),
+            "category_code": item.get("foodLv4Cd"),
+            "category_name" : item.get("foodLv4Nm")
+        }
+
+    def _parse_image(self, r) -> Optional[str]:
+        """Step 5: 이미지 (이미지는 없어도 404 안 띄우고 진행)"""
+        items = r.json().get("body", {}).get("items", [])
+        if items:
+            return items[0].get("item", {}).get("imgurl1") or None
+        return None
+
+    # =====================================================
+    # 조회 결과 조립 (C005 -> 보고번호 -> I1250 | C002 | 영양성분)
+    # =====================================================
+    def _report_no(self, base_info: dict) -> str:
+        report_no = base_info.get("PRDLST_REPORT_NO")
         # 보고번호 없으면 200 리턴할지, 404 할지 결정 (여기선 일단 기존 로직 유지하거나 404)
         if not report_no:
              # 보고번호가 없으면 뒤에 API들 조회가 불가능하므로 여기서 404
-             raise HTTPException(status_code=404, detail="Product report number not found")
+             raise ProductLookupError(404, "Product report number not found", step="C005")
+        return report_no
 
-        # --- Step 2: I1250 (포장재질) ---
-        pack_material = "기타"
-        try:
-            i1250_url = f"{self.base_url_food}/{self.food_api_key}/I1250/json/1/5/PRDLST_REPORT_NO={report_no}"
-            r = requests.get(i1250_url, timeout=3)
-            
-            if r.status_code >= 400:
-                raise HTTPException(status_code=404, detail="External API Error (I1250)")
-                
-            rows = r.json().get("I1250", {}).get("row", [])
-            if rows:
-                pack_material = rows[0].get("FRMLC_MTRQLT")
-                if not pack_material or pack_material.strip() == "":
-                    print(f"❌ [Error] {report_no} 제품의 포장재질 정보가 비어있음.")
-                    raise HTTPException(status_code=422, detail="Essential Data Missing: Packaging Material is empty")
-                pack_material = pack_material.strip()
-            else:
-                # 데이터 없으면 404 던짐
-                raise HTTPException(status_code=404, detail="Product not found in External API (I1250)")
-        
-        except HTTPException as he:
-            raise he # [중요] 잡은 404를 다시 던져서 함수를 종료시킴
-        except Exception as e: 
-            print(f"I1250 Error: {e}")
-            # 알 수 없는 에러도 일단 넘길지, 멈출지 결정. (여기선 로그 찍고 진행한다고 가정하면 pass, 멈추려면 raise)
-            # 멈추고 싶으면 아래 주석 해제
-            # raise HTTPException(status_code=404, detail="Error in I1250")
+    def _step_outcome(self, step: str, outcome, provisional: List[str]):
+        """
+        후속 단계 결과 또는 예외 -> 값
+        (예산/호출 한도 초과, 열린 브레이커만 기본값 + provisional, 404/422 등은 그대로 던짐)
+        """
+        if isinstance(outcome, (DeadlineExceeded, QuotaExceeded, CircuitOpenError)):
+            return self._budget_exceeded(step, outcome, provisional)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
 
-        # --- Step 3: C002 (원재료명) ---
-        raw_materials = None
-        calculated_additives_cnt = 0
-        try:
-            c002_url = f"{self.base_url_food}/{self.food_api_key}/C002/json/1/5/PRDLST_REPORT_NO={report_no}"
-            r = requests.get(c002_url, timeout=3)
-            
-            if r.status_code >= 400:
-                raise HTTPException(status_code=404, detail="External API Error (C002)")
-
-            rows = r.json().get("C002", {}).get("row", [])
-            if rows:
-                raw_materials = rows[0].get("RAWMTRL_NM")
-                if raw_materials:
-                    calculated_additives_cnt, additive_list_str = self.additive_service.calculate_count(raw_materials)
-            else:
-                raise HTTPException(status_code=404, detail="Product not found in External API (C002)")
-        
-        except HTTPException as he:
-            raise he # [중요] 404 재발생
-        except Exception as e: 
-            print(f"C002 Error: {e}")
+    def _assemble(self, barcode: str, base_info: dict, local_nut: Optional[dict], outcomes: dict) -> RawProductAPIDTO:
+        """
+        outcomes: 단계 -> 결과 또는 예외 (I1250, C002, 로컬 영양성분이 없을 때만 NUTRI)
+        [중요] 결과는 기존 순차 호출과 같은 순서(I1250 -> C002 -> Nutri)로 꺼냄
+        -> 여러 단계가 동시에 실패해도 예전과 같은 단계의 404/422가 밖으로 나감
+        """
+        provisional: List[str] = []
+        pack_material = self._step_outcome("I1250", outcomes["I1250"], provisional)
+        c002 = self._step_outcome("C002", outcomes["C002"], provisional)
+        nut_dict = local_nut or self._step_outcome("NUTRI", outcomes["NUTRI"], provisional)
 
-        # --- Step 4: 공공데이터포털 영양성분 API ---
-        nut_dict = {}
-        try:
-            params = {
-                "serviceKey": self.data_go_kr_key,
-                "itemMnftrRptNo": report_no,
-                "type": "json",
-                "numOfRows": "1"
-            }
-            r = requests.get(self.base_url_nutri, params=params, timeout=5)
-            
-            if r.status_code >= 400:
-                raise HTTPException(status_code=404, detail="External API Error (Nutri)")
-
-            data = r.json()
-            items = []
-            if "response" in data and "body" in data["response"]:
-                items = data["response"]["body"].get("items", [])
-            elif "body" in data:
-                 items = data["body"].get("items", [])
-            
-            if items:
-                item = items[0]
-                nut_dict = {
-                    "serving_size": item.get("nutConSrtrQua"),
-                    "sodium": item.get("nat"),
-                    "sugar": item.get("sugar"),
-                    "sat_fat": item.get("fasat"),
-                    "trans_fat": item.get("fatrn"),
-                    "category_code": item.get("foodLv4Cd"),
-                    "category_name" : item.get("foodLv4Nm")
-                }
-            else:
-                raise HTTPException(status_code=404, detail="Product not found in External API (Nutri)")
-        
-        except HTTPException as he:
-            raise he # [중요] 404 재발생
-        except Exception as e: 
-            print(f"Nutri API Error: {e}")
+        # --- 최종 DTO 조립 ---
+        dto = self._build_dto(barcode, base_info, pack_material, c002, nut_dict, None)
+        dto.provisional = provisional
+        return dto
 
-        # --- Step 5: 이미지 (이미지는 없어도 404 안 띄우고 진행) ---
-        image_url = None
-        try:
-            params = { "serviceKey": self.data_go_kr_key, "prdlstReportNo": report_no, "returnType": "json" }
-            r = requests.get(self.base_url_img, params=params, timeout=5)
-            data = r.json()
-            items = data.get("body", {}).get("items", [])
-            if items:
-                new_img = items[0].get("item", {}).get("imgurl1")
-                if new_img: image_url = new_img
-        except Exception as e: print(f"Img API Error: {e}")
+    def _nutrition_dict(self, ref: NutritionReference) -> dict:
+        """nutrition_reference 행 -> 영양성분 API와 같은 키의 dict"""
+        return {
+            "serving_size": ref.serving_size,
+            "sodium": ref.sodium_mg,
+            "sugar": ref.sugar_g,
+            "sat_fat": ref.sat_fat_g,
+            "trans_fat": ref.trans_fat_g,
+            "category_code": ref.category_code,
+            "category_name": ref.category_name
+        }
 
-        # --- 최종 DTO 조립 ---
+    def _build_dto(self, barcode: str, base_info: dict, pack_material: str,
+                   c002: Tuple[Optional[str], int, Optional[str]],
+                   nut_dict: dict, image_url: Optional[str]) -> RawProductAPIDTO:
+        """단계별 결과 -> 최종 DTO 조립"""
+        raw_materials, calculated_additives_cnt, additive_list_str = c002
         return RawProductAPIDTO(
             barcode=barcode,
-            name=product_name,
-            brand=brand_name,
-            report_no=report_no,
+            name=base_info.get("PRDLST_NM"),
+            brand=base_info.get("BSSH_NM"),
+            report_no=base_info.get("PRDLST_REPORT_NO"),
             category_code=nut_dict.get("category_code"), 
             category_name=nut_dict.get("category_name"),
             image_url=image_url,
@@ -248,61 +429,161 @@ class FoodRepository:
             additives_cnt=calculated_additives_cnt,
             additive_list_str=additive_list_str,
             raw_materials=raw_materials
-        )   
+        )
 
-    def _save_to_db_split(self, dto: RawProductAPIDTO):
-        """[핵심] DTO 하나를 쪼개서 여러 테이블에 저장"""
-        try:
-            scores = self.score_service.calculate_all(dto)
-            # 1. Food 테이블
-            new_food = Food(
-                barcode=dto.barcode,
-                name=dto.name,                # PRDLST_NM -> name
-                brand=dto.brand,              # BSSH_NM -> brand
-                prdlst_report_no=dto.report_no, # PRDLST_REPORT_NO -> report_no
-                category_code=dto.category_code,
-                category_name=dto.category_name,
-                image_url=dto.image_url,       # IMG_URL -> image_url
-                base_nutrition_score=scores.nutrition.score,
-                base_packaging_score=scores.packaging.score,
-                base_additives_score=scores.additives.score
-            )
-            self.db.add(new_food)
-            
-            # 2. NutritionFact 테이블
-            new_nut = NutritionFact(
-                barcode=dto.barcode,
-                serving_size=dto.serving_size,
-                sodium_mg=self._safe_float(dto.sodium_mg),
-                sugar_g=self._safe_float(dto.sugar_g),
-                sat_fat_g=self._safe_float(dto.sat_fat_g),
-                trans_fat_g=self._safe_float(dto.trans_fat_g),
-                additives_cnt=dto.additives_cnt
-            )
-            self.db.add(new_nut)
-            
-            # 3. RecyclingInfo 테이블
-            new_recy = RecyclingInfo(
-                barcode=dto.barcode,
-                material=dto.packaging_material,
-            )
-            self.db.add(new_recy)
+    # =====================================================
+    # 캐시 (product:{b} + product:fresh:{b} / product:miss:{b} / analysis:v{규칙버전}:{b})
+    # - _stage_*: Redis 파이프라인에 명령만 쌓음 (execute는 각 리포지토리가)
+    # =====================================================
+    def _from_cache_entry(self, barcode: str, cached_data: str, is_fresh) -> RawProductAPIDTO:
+        """product:{b} 값 -> DTO (fresh 표시가 있으면 워커 내부 캐시에도, 없으면 호출한 쪽이 뒤에서 새로고침)"""
+        dto = RawProductAPIDTO.model_validate_json(cached_data)
+        if is_fresh:
+            self.local_cache.set(barcode, dto)
+        return dto
 
-            new_ing = Ingredient(
-                barcode=dto.barcode,
-                name=dto.name,  # 제품명과 동일하게 넣거나 생략 가능 (설계에 따라 다름)
-                raw_materials=dto.raw_materials,       # 원재료명 전체 텍스트
-                additives_list=dto.additive_list_str   # 분석된 첨가물 목록 문자열
+    def _cache_locally(self, dtos: Dict[str, RawProductAPIDTO]):
+        for barcode, dto in dtos.items():
+            self.local_cache.set(barcode, dto)
+            self.analysis_local_cache.delete(barcode)
+
+    def _stage_cache_many(self, pipe, dtos: Dict[str, RawProductAPIDTO]):
+        """데이터 (hard TTL) + soft TTL 표시"""
+        for barcode, dto in dtos.items():
+            pipe.setex(
+                f"product:{barcode}", 
+                PRODUCT_CACHE_HARD_TTL_SEC, 
+                dto.model_dump_json() # DTO -> JSON 문자열 변환
             )
-            self.db.add(new_ing)
+            pipe.setex(f"product:fresh:{barcode}", PRODUCT_CACHE_SOFT_TTL_SEC, "1")
+            # 원본이 바뀌었으니 계산된 분석 결과도 버림
+            pipe.delete(self._analysis_key(barcode))
 
-            self.db.commit()
-            print(f"[Repo] Saved split data for {dto.name}")
+    def _stage_provisional(self, pipe, barcode: str, dto: RawProductAPIDTO):
+        """provisional 결과: 짧은 TTL, fresh 표시 없음 (다음 조회 때 뒤에서 새로고침)"""
+        self.analysis_local_cache.delete(barcode)
+        pipe.setex(f"product:{barcode}", PROVISIONAL_CACHE_TTL_SEC, dto.model_dump_json())
+        pipe.delete(f"product:fresh:{barcode}")
+        pipe.delete(self._analysis_key(barcode))
 
-        except Exception as e:
-            self.db.rollback()
-            # 이미 있으면 패스하거나 로그만 찍음 (중복 저장 방지)
-            print(f"DB Save Split Error: {e}")
+    def _product_keys(self, barcodes: List[str]) -> List[str]:
+        """무효화할 키 (워커 내부 캐시도 여기서 지움)"""
+        for barcode in barcodes:
+            self.local_cache.delete(barcode)
+            self.analysis_local_cache.delete(barcode)
+        return [k for b in barcodes for k in (f"product:{b}", f"product:fresh:{b}", self._analysis_key(b))]
+
+    def _miss_value(self, error: ProductLookupError) -> str:
+        return json.dumps({
+            "status_code": error.status_code,
+            "detail": error.detail,
+            "step": error.step,
+        })
+
+    def _miss_error(self, cached_miss: str) -> ProductLookupError:
+        miss = json.loads(cached_miss)
+        return ProductLookupError(miss["status_code"], miss["detail"], step=miss["step"])
+
+    def _from_analysis_cache(self, barcode: str, cached: str) -> bytes:
+        payload = cached.encode("utf-8")
+        self.analysis_local_cache.set(barcode, payload)
+        return payload
+
+    def _stage_analysis_many(self, pipe, payloads: Dict[str, bytes]):
+        for barcode, payload in payloads.items():
+            self.analysis_local_cache.set(barcode, payload)
+            pipe.setex(self._analysis_key(barcode), PRODUCT_CACHE_SOFT_TTL_SEC, payload)
+
+    # =====================================================
+    # DB 조회문 / 저장용 행 / upsert 문
+    # =====================================================
+    def _food_select(self):
+        """
+        Food + Nutrition + Recycling 조인, 원재료는 selectin으로 한 번에 (N+1 방지)
+        (AsyncSession은 lazy load가 안 되므로 _entity_to_dto가 쓰는 관계를 전부 미리 로딩)
+        """
+        return select(Food).options(
+            joinedload(Food.nutrition),
+            joinedload(Food.recycling),
+            selectinload(Food.ingredients)
+        )
+
+    def _nutrition_select(self, report_no: str):
+        return select(NutritionReference).where(NutritionReference.report_no == report_no)
+
+    def _product_rows(self, dtos: List[RawProductAPIDTO]) -> Tuple[List[dict], List[dict], List[dict], List[dict]]:
+        """DTO 목록 -> (foods, nutrition_facts, recycling_info, ingredients) 행 목록 (점수는 여기서 계산)"""
+        food_rows, nut_rows, recy_rows, ing_rows = [], [], [], []
+        for dto in dtos:
+            scores = self.score_service.calculate_all(dto)
+            food_rows.append({
+                "barcode": dto.barcode,
+                "name": dto.name,
+                "brand": dto.brand,
+                "prdlst_report_no": dto.report_no,
+                "category_code": dto.category_code,
+                "category_name": dto.category_name,
+                "image_url": dto.image_url,
+                "base_nutrition_score": scores.nutrition.score,
+                "base_packaging_score": scores.packaging.score,
+                "base_additives_score": scores.additives.score,
+            })
+            nut_rows.append({
+                "barcode": dto.barcode,
+                "serving_size": dto.serving_size,
+                "sodium_mg": self._safe_float(dto.sodium_mg),
+                "sugar_g": self._safe_float(dto.sugar_g),
+                "sat_fat_g": self._safe_float(dto.sat_fat_g),
+                "trans_fat_g": self._safe_float(dto.trans_fat_g),
+                "additives_cnt": dto.additives_cnt,
+            })
+            recy_rows.append({"barcode": dto.barcode, "material": dto.packaging_material})
+            ing_rows.append({
+                "barcode": dto.barcode,
+                "name": dto.name,
+                "raw_materials": dto.raw_materials,
+                "additives_list": dto.additive_list_str,
+            })
+        return food_rows, nut_rows, recy_rows, ing_rows
+
+    def _upsert_stmt(self, model, rows: List[dict], dialect: str, key: str = "barcode",
+                     keep_existing: Tuple[str, ...] = ()):
+        """
+        unique 키(key) 기준 다중 행 upsert 문 (MySQL 운영 / SQLite 테스트)
+        keep_existing: 새 값이 NULL이면 기존 값을 그대로 두는 컬럼 (백그라운드로 채운 image_url 등)
+        """
+        update_cols = [c for c in rows[0] if c != key]
+        table = model.__table__
+        if dialect == "mysql":
+            stmt = mysql_insert(model).values(rows)
+            new = stmt.inserted
+        else:
+            stmt = sqlite_insert(model).values(rows)
+            new = stmt.excluded
+        values = {
+            c: func.coalesce(new[c], table.c[c]) if c in keep_existing else new[c]
+            for c in update_cols
+        }
+        if dialect == "mysql":
+            return stmt.on_duplicate_key_update(values)
+        return stmt.on_conflict_do_update(index_elements=[key], set_=values)
+
+    def _product_upsert_stmts(self, dtos: List[RawProductAPIDTO], dialect: str) -> list:
+        """
+        제품 저장 문 목록 (테이블당 1번씩, 한 트랜잭션에서 순서대로 실행)
+        - foods / nutrition_facts / recycling_info: barcode 기준 upsert
+        - ingredients: barcode에 unique가 없어서 해당 바코드 행 삭제 후 다시 insert
+        - 이미 있는 제품을 다시 저장해도 중복 에러 없음 (동시에 같은 바코드가 저장돼도 마지막 값으로 수렴)
+        """
+        food_rows, nut_rows, recy_rows, ing_rows = self._product_rows(dtos)
+        barcodes = [dto.barcode for dto in dtos]
+        return [
+            self._upsert_stmt(Food, food_rows, dialect, keep_existing=("image_url",)),
+            self._upsert_stmt(NutritionFact, nut_rows, dialect),
+            self._upsert_stmt(RecyclingInfo, recy_rows, dialect),
+            delete(Ingredient).where(Ingredient.barcode.in_(barcodes)),
+            insert(Ingredient).values(ing_rows),
+        ]
 
     def _entity_to_dto(self, entity: Food) -> RawProductAPIDTO:
         """JOIN된 객체 -> DTO 변환"""
@@ -337,6 +618,700 @@ class FoodRepository:
         try: return float(str(val).replace(",", ""))
         except: return 0
 
+
+class FoodRepository(FoodRepositoryBase):
+    def __init__(self, db: Session = Depends(get_db),
+                 additive_service: AdditiveService = Depends(AdditiveService),
+                 score_service: ScoreService = Depends(ScoreService),
+                 redis: Redis = Depends(get_redis_client)):
+        super().__init__(additive_service, score_service)
+        self.db = db
+        # 제품 조회(DB 단계 / 추천 후보) 세션 (get_food_repository로 만들면 읽기 복제본, 아니면 db와 같음)
+        self.read_db = db
+        # [Redis 연결] 앱 공용 연결 풀에서 빌려 씀 (cache.py, .env의 REDIS_* 설정)
+        self.redis = redis
+        # 백그라운드 새로고침용 세션 생성기 (요청 세션은 응답 후 닫히므로 따로 씀)
+        self.session_factory = SessionLocal
+
+    def get_raw_data(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        """
+        [흐름] 
+        1. Redis 캐시 확인 (제일 빠름)
+        2. DB 확인 (테이블 3개 조인)
+        3. API 확인 (외부 통신) - 같은 바코드는 동시에 한 번만 조회
+        deadline: 요청 전체 시간 예산 (외부 API 단계마다 남은 예산만큼만 기다림)
+        """
+        dto = self.find_raw_data(barcode)
+        if dto:
+            return dto
+
+        # ---------------------------------------------------------
+        # 4. API 호출 (single-flight, 느린 경로 bulkhead 안에서만)
+        # ---------------------------------------------------------
+        return self._fetch_cold(barcode, deadline)
+
+    def find_raw_data(self, barcode: str) -> Optional[RawProductAPIDTO]:
+        """
+        외부 API 없이 찾을 수 있는 데이터만 (캐시 -> DB -> 네거티브 캐시)
+        None이면 외부 API 콜드 조회가 필요한 바코드
+        """
+        # ---------------------------------------------------------
+        # 1. 캐시 조회 (워커 내부 LRU -> Redis)
+        # ---------------------------------------------------------
+        cached = self._get_cached(barcode)
+        if cached:
+            return cached
+
+        # ---------------------------------------------------------
+        # 2. DB 조회 (JOIN 사용)
+        # ---------------------------------------------------------
+        dto = self._get_from_db(barcode)
+        if dto:
+            # [캐싱] DB에서 찾은거 Redis에 저장 (1시간)
+            self._cache_data(barcode, dto)
+            return dto
+
+        # ---------------------------------------------------------
+        # 3. 네거티브 캐시 (최근에 외부 API에서 없다고 확인된 바코드)
+        # ---------------------------------------------------------
+        self._raise_if_known_missing(barcode)
+        return None
+
+    def get_raw_data_for_job(self, barcode: str) -> RawProductAPIDTO:
+        """
+        202 분석 작업용 조회 (services/analysis_job_service.py)
+        전용 작업 스레드에서 돌기 때문에 upstream bulkhead / 시간 예산 없이 외부 API 끝까지 기다림
+        """
+        return self.find_raw_data(barcode) or self._fetch_single_flight(barcode)
+
+    def _fetch_cold(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        """
+        외부 API 콜드 조회는 upstream bulkhead 자리가 있을 때만 (없으면 바로 503)
+        -> 모르는 바코드가 몰려도 캐시/DB 히트용 스레드와 DB 연결은 남아 있음
+        """
+        try:
+            with upstream_bulkhead.slot(deadline.remaining() if deadline else None):
+                # 외부 API 기다리는 동안 요청 세션의 DB 연결은 풀에 돌려둠 (저장할 때 다시 빌림)
+                # 그 사이 DB 확인(락 뒤 재확인 / 영양성분 표)은 session_factory의 짧은 세션으로만
+                self.db.rollback()
+                if self.read_db is not self.db:
+                    self.read_db.rollback()
+                return self._fetch_single_flight(barcode, deadline)
+        except BulkheadFull as e:
+            raise self._bulkhead_rejected(e)
+
+    def _get_cached(self, barcode: str) -> Optional[RawProductAPIDTO]:
+        # 1-1. 워커 내부 캐시 (네트워크 I/O, JSON 파싱 없음)
+        local = self.local_cache.get(barcode)
+        if local:
+            return local
+
+        # 1-2. Redis (데이터 + soft TTL 표시를 한 번에 조회)
+        try:
+            cached_data, is_fresh = self.redis.mget(f"product:{barcode}", f"product:fresh:{barcode}")
+            if cached_data:
+                print(f"[Repo] Redis Cache Hit: {barcode}")
+                # JSON 문자열 -> Pydantic DTO 변환
+                dto = self._from_cache_entry(barcode, cached_data, is_fresh)
+                if not is_fresh:
+                    # soft TTL 지남 -> 일단 그대로 주고 뒤에서 새로고침
+                    self._schedule_refresh(barcode)
+                return dto
+        except Exception as e:
+            print(f"Redis Error (Ignored): {e}")
+        return None
+
+    def _schedule_refresh(self, barcode: str):
+        """바코드당 새로고침 1개만 돌도록 Redis NX 키로 막고 백그라운드 실행"""
+        try:
+            acquired = self.redis.set(f"lock:refresh:{barcode}", "1", nx=True, ex=FETCH_LOCK_TTL_SEC)
+        except Exception as e:
+            print(f"Redis Error (Ignored): {e}")
+            return
+        if acquired:
+            print(f"[Repo] Stale cache, refreshing in background: {barcode}")
+            _REFRESH_EXECUTOR.submit(self._refresh_in_background, barcode)
+
+    def _refresh_in_background(self, barcode: str):
+        """DB에 있으면 DB에서, 없으면 외부 API에서 다시 가져와 캐시 갱신"""
+        db = self.session_factory()
+        try:
+            repo = self._sibling(db)
+            repo.call_priority = BACKGROUND
+            dto = repo._get_from_db(barcode)
+            if dto:
+                repo._cache_data(barcode, dto)
+            else:
+                repo._fetch_and_store(barcode)
+        except Exception as e:
+            # 실패해도 기존 캐시는 hard TTL까지 계속 사용됨
+            print(f"[Repo] Background refresh failed ({barcode}): {e}")
+        finally:
+            db.close()
+            try:
+                self.redis.delete(f"lock:refresh:{barcode}")
+            except Exception as e:
+                print(f"Redis Delete Error: {e}")
+
+    def _sibling(self, db: Session) -> "FoodRepository":
+        """
+        다른 DB 세션을 쓰는 같은 설정의 리포지토리
+        (Session은 스레드 간 공유 불가 -> 백그라운드/동시 조회 스레드마다 하나씩)
+        """
+        repo = FoodRepository(
+            db=db,
+            additive_service=self.additive_service,
+            score_service=self.score_service,
+            redis=self.redis
+        )
+        repo.session_factory = self.session_factory
+        return self._copy_settings_to(repo)
+
+    # =====================================================
+    # 여러 바코드 한 번에 조회 (배치 분석용)
+    # =====================================================
+    def get_raw_data_batch(self, barcodes: List[str]) -> Dict[str, Union[RawProductAPIDTO, HTTPException]]:
+        """
+        get_raw_data의 배치 버전 - 단계마다 왕복 1번
+        1. 워커 내부 캐시
+        2. Redis MGET (데이터 + fresh 표시)
+        3. DB IN (...) 조회 1번
+        4. 네거티브 캐시 MGET
+        5. 남은 것만 외부 API (동시 실행 개수 제한)
+        반환: 바코드 -> DTO 또는 해당 바코드의 에러(HTTPException)
+        """
+        results: Dict[str, Union[RawProductAPIDTO, HTTPException]] = {}
+        pending = list(dict.fromkeys(barcodes))  # 중복 제거 (순서 유지)
+
+        # 1. 워커 내부 캐시
+        for barcode in pending:
+            local = self.local_cache.get(barcode)
+            if local:
+                results[barcode] = local
+        pending = [b for b in pending if b not in results]
+
+        # 2. Redis MGET
+        if pending:
+            try:
+                keys = [k for b in pending for k in (f"product:{b}", f"product:fresh:{b}")]
+                values = self.redis.mget(keys)
+                for i, barcode in enumerate(pending):
+                    cached_data, is_fresh = values[2 * i], values[2 * i + 1]
+                    if not cached_data:
+                        continue
+                    results[barcode] = self._from_cache_entry(barcode, cached_data, is_fresh)
+                    if not is_fresh:
+                        self._schedule_refresh(barcode)
+            except Exception as e:
+                print(f"Redis Error (Ignored): {e}")
+            pending = [b for b in pending if b not in results]
+
+        # 3. DB 조회 (IN 쿼리 1번)
+        if pending:
+            found = self._get_many_from_db(pending)
+            self._cache_many(found)
+            results.update(found)
+            pending = [b for b in pending if b not in results]
+
+        # 4. 네거티브 캐시
+        if pending:
+            try:
+                misses = self.redis.mget([f"{NEGATIVE_CACHE_PREFIX}{b}" for b in pending])
+                for barcode, cached_miss in zip(pending, misses):
+                    if cached_miss:
+                        results[barcode] = self._miss_error(cached_miss)
+            except Exception as e:
+                print(f"Redis Error (Ignored): {e}")
+            pending = [b for b in pending if b not in results]
+
+        # 5. 외부 API (바코드마다 별도 세션, 동시 실행은 batch bulkhead 상한까지 = upstream 상한의 절반 이하)
+        if pending:
+            print(f"[Repo] Batch API fetch for {len(pending)} barcodes")
+            with ThreadPoolExecutor(max_workers=batch_bulkhead.limit, thread_name_prefix="batch-fetch") as pool:
+                for barcode, outcome in zip(pending, pool.map(self._fetch_isolated, pending)):
+                    results[barcode] = outcome
+
+        return results
+
+    def _fetch_isolated(self, barcode: str) -> Union[RawProductAPIDTO, HTTPException]:
+        """
+        별도 세션으로 single-flight 조회, 에러는 던지지 않고 반환
+        batch bulkhead 자리 안에서만 upstream 자리를 잡음 (여러 배치가 겹쳐도 upstream을 다 쓰지 않음)
+        """
+        db = self.session_factory()
+        try:
+            with batch_bulkhead.slot():
+                return self._sibling(db)._fetch_cold(barcode)
+        except BulkheadFull as e:
+            return self._bulkhead_rejected(e)
+        except HTTPException as he:
+            return he
+        except Exception as e:
+            print(f"[Repo] Batch fetch error ({barcode}): {e}")
+            return HTTPException(status_code=500, detail="Product lookup failed")
+        finally:
+            db.close()
+
+    def _get_many_from_db(self, barcodes: List[str]) -> Dict[str, RawProductAPIDTO]:
+        # get_raw_data와 같은 조회문 (IN 쿼리 1번)
+        foods = self.read_db.scalars(self._food_select().where(Food.barcode.in_(barcodes))).all()
+        return {food.barcode: self._entity_to_dto(food) for food in foods}
+
+    def _get_from_db(self, barcode: str, db: Optional[Session] = None) -> Optional[RawProductAPIDTO]:
+        # Food + Nutrition + Recycling (+ 원재료) 정보를 한 번에 가져옴 (db를 안 주면 조회용 세션)
+        food_obj = (db or self.read_db).scalars(self._food_select().where(Food.barcode == barcode)).first()
+
+        if food_obj:
+            print(f"[Repo] DB Hit (Joined): {barcode}")
+            return self._entity_to_dto(food_obj)
+        return None
+
+    def _get_from_primary(self, barcode: str) -> Optional[RawProductAPIDTO]:
+        """
+        콜드 조회 중 primary 확인용 (짧은 세션)
+        요청 세션(self.db)으로 읽으면 그 연결을 외부 API 응답까지 계속 잡고 있게 됨
+        """
+        db = self.session_factory()
+        try:
+            return self._get_from_db(barcode, db=db)
+        finally:
+            db.close()
+
+    def _fetch_single_flight(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        """
+        같은 바코드에 대한 API 조회를 한 번으로 합침
+        - 프로세스 안: 바코드당 Future 1개 (먼저 온 요청이 조회, 나머지는 결과 대기)
+        - 워커 사이: Redis 락 (락 잡은 워커만 조회, 나머지는 캐시에서 결과 수령)
+        """
+        future, is_leader = _join_inflight(barcode)
+        if not is_leader:
+            print(f"[Repo] Waiting for in-flight fetch: {barcode}")
+            # 리더가 던진 404/422도 그대로 전달됨
+            wait = FETCH_LOCK_WAIT_SEC + FETCH_LOCK_TTL_SEC
+            try:
+                return future.result(timeout=deadline.timeout(wait) if deadline else wait)
+            except FutureTimeoutError:
+                raise HTTPException(status_code=504, detail="Analysis deadline exceeded (waiting for in-flight fetch)")
+
+        try:
+            dto = self._fetch_with_worker_lock(barcode, deadline)
+            future.set_result(dto)
+            return dto
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            _leave_inflight(barcode)
+
+    def _fetch_with_worker_lock(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        """Redis 락으로 여러 gunicorn 워커 중 하나만 외부 API를 호출하게 함"""
+        lock = self.redis.lock(
+            f"lock:product:{barcode}",
+            timeout=FETCH_LOCK_TTL_SEC,          # 리더 워커가 죽어도 락은 풀림
+            blocking_timeout=deadline.timeout(FETCH_LOCK_WAIT_SEC) if deadline else FETCH_LOCK_WAIT_SEC
+        )
+        try:
+            acquired = lock.acquire()
+        except Exception as e:
+            # Redis 장애 시에는 락 없이 진행 (조회 자체는 막지 않음)
+            print(f"Redis Lock Error (Ignored): {e}")
+            return self._fetch_and_store(barcode, deadline)
+
+        if not acquired:
+            print(f"[Repo] Lock wait timed out, fetching anyway: {barcode}")
+            return self._fetch_and_store(barcode, deadline)
+
+        try:
+            # 락 대기 중에 다른 워커가 이미 저장했을 수 있으니 한 번 더 확인
+            # (방금 저장된 행은 복제본에 아직 없을 수 있으므로 primary에서)
+            dto = self._get_cached(barcode) or self._get_from_primary(barcode)
+            if dto:
+                return dto
+            self._raise_if_known_missing(barcode)
+            return self._fetch_and_store(barcode, deadline)
+        finally:
+            try:
+                lock.release()
+            except Exception as e:
+                print(f"Redis Unlock Error (Ignored): {e}")
+
+    def _fetch_and_store(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        print(f"[Repo] API Fetching sequence started for: {barcode}")
+        try:
+            api_dto = self._fetch_full_data_sequence(barcode, deadline)
+        except ProductLookupError as le:
+            self._cache_missing(barcode, le)
+            raise
+
+        if api_dto.provisional:
+            self._cache_provisional(barcode, api_dto)
+            return api_dto
+
+        # 4. 저장 & 캐싱 (이미지는 비워서 저장하고 뒤에서 채움)
+        self._save_to_db_split(api_dto)
+        self._cache_data(barcode, api_dto)
+        self.schedule_image_enrichment(barcode, api_dto.report_no)
+        
+        return api_dto
+
+    # =====================================================
+    # 네거티브 캐시 (product:miss:{barcode})
+    # =====================================================
+    def _raise_if_known_missing(self, barcode: str):
+        """최근에 404/422로 끝난 바코드면 외부 API 안 부르고 같은 에러를 바로 던짐"""
+        try:
+            cached_miss = self.redis.get(f"{NEGATIVE_CACHE_PREFIX}{barcode}")
+        except Exception as e:
+            print(f"Redis Error (Ignored): {e}")
+            return
+        if not cached_miss:
+            return
+
+        error = self._miss_error(cached_miss)
+        print(f"[Repo] Negative Cache Hit: {barcode} (step={error.step})")
+        raise error
+
+    def _cache_missing(self, barcode: str, error: ProductLookupError):
+        if NEGATIVE_CACHE_TTL_SEC <= 0:
+            return
+        try:
+            self.redis.setex(f"{NEGATIVE_CACHE_PREFIX}{barcode}", NEGATIVE_CACHE_TTL_SEC, self._miss_value(error))
+        except Exception as e:
+            print(f"Redis Save Error: {e}")
+
+    def purge_negative_cache(self, barcode: Optional[str] = None) -> int:
+        """
+        네거티브 캐시 삭제 (외부 데이터가 고쳐졌을 때 사용)
+        - barcode 지정: 해당 바코드만
+        - barcode 없음: 전부
+        반환값: 삭제된 키 개수
+        """
+        if barcode:
+            return self.redis.delete(f"{NEGATIVE_CACHE_PREFIX}{barcode}")
+
+        deleted = 0
+        keys = []
+        for key in self.redis.scan_iter(match=f"{NEGATIVE_CACHE_PREFIX}*", count=500):
+            keys.append(key)
+            if len(keys) >= 500:
+                deleted += self.redis.delete(*keys)
+                keys = []
+        if keys:
+            deleted += self.redis.delete(*keys)
+        return deleted
+
+    # =====================================================
+    # 제품 이미지 백그라운드 보강 (image:status:{barcode})
+    # =====================================================
+    def schedule_image_enrichment(self, barcode: str, report_no: Optional[str]) -> bool:
+        """이미지 조회를 백그라운드 큐에 넣음 (바코드당 1개만 - Redis NX)"""
+        if not report_no:
+            return False
+        try:
+            acquired = self.redis.set(f"{IMAGE_STATUS_PREFIX}{barcode}", "pending", nx=True, ex=IMAGE_PENDING_TTL_SEC)
+        except Exception as e:
+            print(f"Redis Error (Ignored): {e}")
+            return False
+        if acquired:
+            _IMAGE_EXECUTOR.submit(self._enrich_image, barcode, report_no)
+        return bool(acquired)
+
+    def _enrich_image(self, barcode: str, report_no: str):
+        """imgurl1 조회 -> Food.image_url 저장 -> 제품/분석 캐시 무효화 (다음 조회부터 이미지 포함)"""
+        status_key = f"{IMAGE_STATUS_PREFIX}{barcode}"
+        db = self.session_factory()
+        try:
+            repo = self._sibling(db)
+            repo.call_priority = BACKGROUND
+            image_url = repo._fetch_image(report_no)
+            if not image_url:
+                self.redis.set(status_key, "none", ex=IMAGE_RETRY_TTL_SEC)
+                return
+            db.query(Food).filter(Food.barcode == barcode).update(
+                {Food.image_url: image_url}, synchronize_session=False
+            )
+            db.commit()
+            self.redis.delete(status_key)
+            self.invalidate_product(barcode)
+            print(f"[Repo] Image enriched: {barcode}")
+        except (QuotaExceeded, CircuitOpenError) as qe:
+            # pending 키가 만료되면 상태 조회 때 다시 큐에 들어감
+            print(f"[Repo] Image enrichment deferred ({barcode}): {qe}")
+        except Exception as e:
+            db.rollback()
+            print(f"[Repo] Image enrichment failed ({barcode}): {e}")
+            try:
+                self.redis.set(status_key, "none", ex=IMAGE_RETRY_TTL_SEC)
+            except Exception as re:
+                print(f"Redis Error (Ignored): {re}")
+        finally:
+            db.close()
+
+    def get_image_status(self, barcode: str) -> dict:
+        """
+        이미지 상태 (ready / pending / none)
+        - 이미지가 없는데 진행 중인 조회도 없으면(워커 재시작 등으로 유실) 다시 큐에 넣고 pending
+        """
+        food = self.db.query(Food.prdlst_report_no, Food.image_url).filter(Food.barcode == barcode).first()
+        if food is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+        if food.image_url:
+            return {"barcode": barcode, "status": "ready", "image_url": food.image_url}
+
+        try:
+            status = self.redis.get(f"{IMAGE_STATUS_PREFIX}{barcode}")
+        except Exception as e:
+            print(f"Redis Error (Ignored): {e}")
+            status = None
+        if status is None and self.schedule_image_enrichment(barcode, food.prdlst_report_no):
+            status = "pending"
+        return {"barcode": barcode, "status": status or "none", "image_url": None}
+
+    def _cache_provisional(self, barcode: str, dto: RawProductAPIDTO):
+        """
+        예산 안에 못 채운 결과: DB에 저장하지 않고 Redis에 짧게 (fresh 표시 없음)
+        -> 다음 조회는 이 값을 바로 주면서 뒤에서 예산 없이 전부 다시 가져와 저장
+        """
+        print(f"[Repo] Provisional result cached briefly: {barcode} {dto.provisional}")
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            self._stage_provisional(pipe, barcode, dto)
+            pipe.execute()
+        except Exception as e:
+            print(f"Redis Save Error: {e}")
+
+    def _cache_data(self, barcode: str, dto: RawProductAPIDTO):
+        """Redis에 데이터 저장 (hard TTL) + soft TTL 표시 + 워커 내부 캐시 갱신"""
+        self._cache_many({barcode: dto})
+
+    def _cache_many(self, dtos: Dict[str, RawProductAPIDTO]):
+        """여러 제품을 파이프라인 1번으로 캐시"""
+        if not dtos:
+            return
+        self._cache_locally(dtos)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            self._stage_cache_many(pipe, dtos)
+            pipe.execute()
+        except Exception as e:
+            print(f"Redis Save Error: {e}")
+
+    def invalidate_product(self, barcode: str):
+        """제품 정보가 바뀌었을 때 캐시 무효화 (워커 내부 + Redis)"""
+        self.invalidate_products([barcode])
+
+    def invalidate_products(self, barcodes: List[str]):
+        if not barcodes:
+            return
+        keys = self._product_keys(barcodes)
+        try:
+            self.redis.delete(*keys)
+        except Exception as e:
+            print(f"Redis Delete Error: {e}")
+
+    # =====================================================
+    # 분석 결과 캐시 (analysis:v{규칙버전}:{barcode})
+    # =====================================================
+    def get_cached_analysis(self, barcode: str) -> Optional[bytes]:
+        """직렬화된 AnalysisScoresDTO JSON (워커 내부 -> Redis)"""
+        return self.get_cached_analysis_many([barcode]).get(barcode)
+
+    def get_cached_analysis_many(self, barcodes: List[str]) -> Dict[str, bytes]:
+        """여러 바코드의 분석 결과 캐시 조회 (Redis는 MGET 1번)"""
+        found: Dict[str, bytes] = {}
+        for barcode in barcodes:
+            local = self.analysis_local_cache.get(barcode)
+            if local:
+                found[barcode] = local
+
+        rest = [b for b in barcodes if b not in found]
+        if not rest:
+            return found
+        try:
+            for barcode, cached in zip(rest, self.redis.mget([self._analysis_key(b) for b in rest])):
+                if cached:
+                    found[barcode] = self._from_analysis_cache(barcode, cached)
+        except Exception as e:
+            print(f"Redis Error (Ignored): {e}")
+        return found
+
+    def cache_analysis(self, barcode: str, payload: bytes):
+        self.cache_analysis_many({barcode: payload})
+
+    def cache_analysis_many(self, payloads: Dict[str, bytes]):
+        if not payloads:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            self._stage_analysis_many(pipe, payloads)
+            pipe.execute()
+        except Exception as e:
+            print(f"Redis Save Error: {e}")
+
+    def _fetch_full_data_sequence(self, barcode: str, deadline: Optional[Deadline] = None) -> RawProductAPIDTO:
+        self._require_api_keys()
+
+        # --- Step 1: C005 (기본 정보 & 보고번호 따기) ---
+        # 나머지 API는 전부 보고번호가 있어야 조회 가능하므로 C005만 먼저 단독 호출
+        try:
+            base_info = self._fetch_c005(barcode, deadline)
+        except (DeadlineExceeded, QuotaExceeded) as e:
+            self._budget_exceeded("C005", e, [])
+        report_no = self._report_no(base_info)
+
+        # --- Step 2~4: 보고번호 기반 조회 (서로 의존성 없음 -> 동시 호출) ---
+        # 전체 소요시간 = C005 + (나머지 중 가장 느린 API 하나)
+        # 영양성분은 데이터셋 파일로 적재해둔 로컬 표를 먼저 보고, 없을 때만 API 호출
+        # (Step 5 이미지는 저장 후 schedule_image_enrichment에서 백그라운드로)
+        local_nut = self._get_local_nutrition(report_no)
+        f_i1250 = _API_EXECUTOR.submit(self._fetch_i1250, report_no, deadline)
+        f_c002 = _API_EXECUTOR.submit(self._fetch_c002, report_no, deadline)
+        f_nutri = None if local_nut else _API_EXECUTOR.submit(self._fetch_nutrition, report_no, deadline)
+
+        outcomes = {"I1250": self._future_outcome(f_i1250), "C002": self._future_outcome(f_c002)}
+        if f_nutri is not None:
+            outcomes["NUTRI"] = self._future_outcome(f_nutri)
+        return self._assemble(barcode, base_info, local_nut, outcomes)
+
+    def _future_outcome(self, future: Future):
+        """단계 결과 또는 그 단계에서 난 예외 (어떻게 처리할지는 _assemble에서 단계 순서대로)"""
+        try:
+            return future.result()
+        except Exception as e:
+            return e
+
+    def _get_local_nutrition(self, report_no: str) -> Optional[dict]:
+        """
+        Step 4 대체: nutrition_reference 표 (영양성분 API와 같은 키로 반환)
+        외부 API 호출 사이라서 짧은 세션으로 조회하고 연결은 바로 돌려줌
+        """
+        db = self.session_factory()
+        try:
+            ref = db.scalars(self._nutrition_select(report_no)).first()
+            if not ref:
+                return None
+            print(f"[Repo] Local nutrition hit: {report_no}")
+            return self._nutrition_dict(ref)
+        except Exception as e:
+            print(f"Nutrition Reference Error (Ignored): {e}")
+            return None
+        finally:
+            db.close()
+
+    def _fetch_c005(self, barcode: str, deadline: Optional[Deadline] = None) -> dict:
+        """Step 1: C005 (기본 정보 & 보고번호)"""
+        return self._call_step("C005", barcode, deadline)
+
+    def _fetch_i1250(self, report_no: str, deadline: Optional[Deadline] = None) -> str:
+        """Step 2: I1250 (포장재질)"""
+        return self._call_step("I1250", report_no, deadline)
+
+    def _fetch_c002(self, report_no: str, deadline: Optional[Deadline] = None) -> Tuple[Optional[str], int, Optional[str]]:
+        """Step 3: C002 (원재료명) -> (원재료 원문, 첨가물 개수, 첨가물 목록)"""
+        return self._call_step("C002", report_no, deadline)
+
+    def _fetch_nutrition(self, report_no: str, deadline: Optional[Deadline] = None) -> dict:
+        """Step 4: 공공데이터포털 영양성분 API"""
+        return self._call_step("NUTRI", report_no, deadline)
+
+    def _fetch_image(self, report_no: str, deadline: Optional[Deadline] = None) -> Optional[str]:
+        """Step 5: 이미지 (백그라운드 보강용, 이미지는 없어도 404 안 띄움)"""
+        return self._call_step("IMG", report_no, deadline)
+
+    def _acquire_quota(self, step: str, deadline: Optional[Deadline] = None):
+        """외부 API 1회 호출권 (한도 안에 못 받으면 QuotaExceeded) - http_get이 첫 요청/재시도마다 부름"""
+        rate_limiter.acquire(self.redis, step, self._api_key(step), self.call_priority,
+                             max_wait=deadline.remaining() if deadline else None)
+
+    def _call_step(self, step: str, key: str, deadline: Optional[Deadline] = None):
+        breaker = self._step_breaker(step, deadline)
+        url, params, timeout = self._step_request(step, key)
+        try:
+            # 호출량 한도는 재시도까지 포함해서 실제 요청마다 토큰 1개
+            r = http_get(url, params=params, timeout=timeout, deadline=deadline,
+                         before_attempt=lambda: self._acquire_quota(step, deadline))
+        except Exception as e:
+            return self._step_error(step, breaker, e, deadline)
+        return self._step_response(step, key, breaker, r)
+
+    def _save_to_db_split(self, dto: RawProductAPIDTO):
+        """[핵심] DTO 하나를 쪼개서 여러 테이블에 저장 (대량 저장과 같은 upsert 경로, 테이블당 1번)"""
+        try:
+            self.upsert_products([dto])
+            print(f"[Repo] Saved split data for {dto.name}")
+        except Exception as e:
+            # 저장에 실패해도 조회 결과는 캐시로 응답 (다음 콜드 미스 때 다시 저장)
+            print(f"DB Save Split Error: {e}")
+
+    # =====================================================
+    # 대량 저장 (카탈로그 동기화/임포터용)
+    # =====================================================
+    def upsert_products(self, dtos: List[RawProductAPIDTO]) -> int:
+        """
+        여러 제품을 테이블별 INSERT ... ON DUPLICATE KEY UPDATE 1번씩으로 저장 (_product_upsert_stmts)
+        - 점수(base_*_score)는 여기서 ScoreService로 계산
+        - 제품 1개(콜드 미스 저장)도 같은 경로
+        - 커밋 후 저장한 바코드의 제품/분석 캐시 무효화 (이전 값이 TTL까지 나가지 않게)
+        반환값: 저장한 제품 수
+        """
+        if not dtos:
+            return 0
+        # 같은 배치 안의 중복 바코드는 마지막 것만
+        dtos = list({dto.barcode: dto for dto in dtos}.values())
+
+        try:
+            for stmt in self._product_upsert_stmts(dtos, self._dialect()):
+                self.db.execute(stmt)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.invalidate_products([dto.barcode for dto in dtos])
+        return len(dtos)
+
+    def upsert_nutrition_reference(self, rows: List[dict]) -> Tuple[int, int]:
+        """
+        영양성분 데이터셋 행들을 nutrition_reference에 upsert 하고,
+        같은 보고번호의 기존 제품(NutritionFact, Food.category_*, 영양 점수)도 갱신
+        rows: NutritionReference 컬럼명 기준 dict 목록
+        반환값: (참조 행 수, 갱신된 제품 수)
+        """
+        if not rows:
+            return 0, 0
+        rows = list({row["report_no"]: row for row in rows}.values())
+        try:
+            self.db.execute(self._upsert_stmt(NutritionReference, rows, self._dialect(), key="report_no"))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        by_report_no = {row["report_no"]: row for row in rows}
+        foods = self.db.query(Food).options(
+            joinedload(Food.nutrition),
+            joinedload(Food.recycling),
+            selectinload(Food.ingredients)
+        ).filter(Food.prdlst_report_no.in_(list(by_report_no))).all()
+
+        updated = []
+        for food in foods:
+            ref = by_report_no[food.prdlst_report_no]
+            updated.append(self._entity_to_dto(food).model_copy(update={
+                "serving_size": ref.get("serving_size"),
+                "sodium_mg": ref.get("sodium_mg"),
+                "sugar_g": ref.get("sugar_g"),
+                "sat_fat_g": ref.get("sat_fat_g"),
+                "trans_fat_g": ref.get("trans_fat_g"),
+                "category_code": ref.get("category_code"),
+                "category_name": ref.get("category_name"),
+            }))
+        # 갱신된 제품의 캐시 무효화는 upsert_products에서
+        self.upsert_products(updated)
+        return len(rows), len(updated)
+
+    def _dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
     def _count_additives(self, text: str) -> int:
         """원재료명 텍스트를 쪼개서 DB 목록(Set)에 있는지 확인"""
         if not text: return 0
@@ -353,7 +1328,7 @@ class FoodRepository:
         """보고번호로 제품 찾기 (추천 서비스용)"""
         print(f"🔍 [Repo] 찾는 보고번호: '{report_no}' (길이: {len(report_no)})")
         
-        food_obj = self.db.query(Food).filter(Food.prdlst_report_no == report_no).first()
+        food_obj = self.read_db.query(Food).filter(Food.prdlst_report_no == report_no).first()
         
         if food_obj:
             print(f"✅ [Repo] 찾았다! ID: {food_obj.food_id}, 이름: {food_obj.name}")
@@ -367,7 +1342,7 @@ class FoodRepository:
         같은 카테고리(category_code)의 다른 제품들을 조회
         - exclude_report_no: 현재 보고 있는 제품은 제외
         """
-        foods = self.db.query(Food).options(
+        foods = self.read_db.query(Food).options(
             joinedload(Food.nutrition),
             joinedload(Food.recycling)
         ).filter(
@@ -376,4 +1351,15 @@ class FoodRepository:
         ).limit(limit).all()
 
         return foods
-    
\ No newline at end of file
+    
+
+
+def get_food_repository(db: Session = Depends(get_db),
+                        read_db: Session = Depends(get_read_db),
+                        additive_service: AdditiveService = Depends(AdditiveService),
+                        score_service: ScoreService = Depends(ScoreService),
+                        redis: Redis = Depends(get_redis_client)) -> FoodRepository:
+    """제품 조회(DB 단계, 추천 후보)는 읽기 복제본 세션, 저장은 primary 세션을 쓰는 FoodRepository (FastAPI Depends)"""
+    repo = FoodRepository(db=db, additive_service=additive_service, score_service=score_service, redis=redis)
+    repo.read_db = read_db
+    return repo
@@ -1,51 +1,137 @@
 # /repositories/history_repository.py
+import base64
+import json
+from datetime import datetime
 from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
-from database import get_db
+from sqlalchemy import Select, and_, delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from database import get_async_db, get_async_read_db, mark_user_write_async
 from models.models import ScanHistory, Food
-from models.dtos import ScanHistoryDTO
+from models.dtos import ScanHistoryDTO, ScanHistoryPageDTO
+
+# 목록/상세 응답(ScanHistoryDTO)에 필요한 컬럼만 조회
+# - ORM 객체(ScanHistory + Food)를 만들지 않음 -> identity map 등록 / 변경 추적 / joinedload 조립 없이 Row -> DTO
+# - scan_history 쪽 컬럼은 ix_scan_history_user_cursor 인덱스에 모두 있음 (표 본문은 안 읽음)
+HISTORY_COLUMNS = (
+    ScanHistory.scan_id,
+    ScanHistory.score_total,
+    ScanHistory.grade,
+    ScanHistory.scanned_at,
+    Food.name.label("product_name"),
+    Food.image_url,
+)
+
+
+def history_select() -> Select:
+    """스캔 기록 + 제품 이름/이미지 (food는 LEFT JOIN - 예전 joinedload와 같은 조인)"""
+    return select(*HISTORY_COLUMNS).outerjoin(Food, ScanHistory.food_id == Food.food_id)
+
+
+def history_list_query(user_id: int, skip: int, limit: int) -> Select:
+    """offset 목록 쿼리"""
+    return (
+        history_select()
+        .where(ScanHistory.user_id == user_id)
+        .order_by(ScanHistory.scanned_at.desc(), ScanHistory.scan_id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def history_detail_query(scan_id: int, user_id: int) -> Select:
+    """상세 쿼리 - 본인 기록만"""
+    return history_select().where(ScanHistory.scan_id == scan_id, ScanHistory.user_id == user_id)
+
+
+def history_to_dto(row) -> ScanHistoryDTO:
+    """history_select() 결과 Row -> ScanHistoryDTO"""
+    return ScanHistoryDTO(
+        scan_id=row.scan_id,
+        # 제품이 지워진 기록은 이름 대신 "알 수 없음"
+        product_name=row.product_name if row.product_name is not None else "알 수 없음",
+        image_url=row.image_url,
+        # [핵심] DB 컬럼명(score_total) -> DTO 필드명(total_score)
+        total_score=row.score_total,
+        grade=row.grade,
+        # [핵심] DB 컬럼명(scanned_at) -> DTO 필드명(created_at)
+        created_at=row.scanned_at
+    )
+
+def encode_history_cursor(row) -> str:
+    """다음 페이지 커서 = 마지막 행의 (scanned_at, scan_id) (앱에는 의미 없는 문자열로만 보임)"""
+    raw = json.dumps({"t": row.scanned_at.isoformat(), "id": row.scan_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), int(data["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid history cursor")
+
+
+def history_page_query(user_id: int, cursor: Optional[str], limit: int) -> Select:
+    """
+    커서(keyset) 페이지 쿼리
+    - (scanned_at, scan_id) 내림차순, 커서 다음 행부터 limit + 1개 (+1은 다음 페이지 유무 확인용)
+    - 몇 번째 페이지든 인덱스(ix_scan_history_user_cursor)에서 커서 위치로 바로 들어감
+      (offset은 앞 페이지 행을 전부 읽고 버림)
+    """
+    stmt = history_select().where(ScanHistory.user_id == user_id)
+    if cursor:
+        scanned_at, scan_id = decode_history_cursor(cursor)
+        stmt = stmt.where(
+            # scanned_at <= ?는 범위 검색용 (OR만 있으면 MySQL이 인덱스 범위를 못 잡는 경우가 있음)
+            ScanHistory.scanned_at <= scanned_at,
+            or_(
+                ScanHistory.scanned_at < scanned_at,
+                and_(ScanHistory.scanned_at == scanned_at, ScanHistory.scan_id < scan_id),
+            ),
+        )
+    return stmt.order_by(ScanHistory.scanned_at.desc(), ScanHistory.scan_id.desc()).limit(limit + 1)
+
+
+def history_page(rows: list, limit: int) -> ScanHistoryPageDTO:
+    """limit + 1개 조회 결과 -> 페이지 (남는 1개가 있으면 다음 커서)"""
+    items = rows[:limit]
+    next_cursor = encode_history_cursor(items[-1]) if len(rows) > limit else None
+    return ScanHistoryPageDTO(items=[history_to_dto(row) for row in items], next_cursor=next_cursor)
 
 class HistoryRepository:
-    def __init__(self, db: Session = Depends(get_db)):
+    """
+    스캔 기록 저장/조회 (AsyncSession, database.get_async_db)
+    - history 엔드포인트와 /foods/calculate-grade가 쓰는 유일한 구현 (쿼리는 위의 함수들)
+    """
+    def __init__(self, db: AsyncSession = Depends(get_async_db)):
         self.db = db
+        # 목록/상세 조회용 세션 (get_history_repository로 만들면 읽기 복제본, 아니면 db와 같음)
+        self.read_db = db
 
-    def get_user_scan_history(
+    async def get_user_scan_history(
         self, user_id: int, skip: int = 0, limit: int = 20
     ) -> List[ScanHistoryDTO]:
         """
         특정 사용자의 스캔 기록 조회 (최신순)
         """
-        rows = (
-            self.db.query(ScanHistory)
-            .options(joinedload(ScanHistory.food)) # food 테이블 정보도 로딩해라!
-            .filter(ScanHistory.user_id == user_id)
-            .order_by(ScanHistory.scanned_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        result = await self.read_db.execute(history_list_query(user_id, skip, limit))
 
         # 2. 변환 (Mapping)
-        result_list = []
-        for row in rows:
-            dto = ScanHistoryDTO(
-                scan_id = row.scan_id,
-                # [핵심] 다른 테이블(food)에 있는 이름을 가져옴
-                product_name = row.food.name if row.food else "알 수 없음",
-                image_url = row.food.image_url if row.food else None,
-                
-                # [핵심] DB 컬럼명(score_total) -> DTO 필드명(total_score)
-                total_score = row.score_total,
-                grade = row.grade,
-                
-                # [핵심] DB 컬럼명(scanned_at) -> DTO 필드명(created_at)
-                created_at = row.scanned_at
-            )
-            result_list.append(dto)
-            
-        return result_list
-    def create_scan_history(
+        return [history_to_dto(row) for row in result]
+
+    async def get_user_scan_history_page(
+        self, user_id: int, cursor: Optional[str] = None, limit: int = 20
+    ) -> ScanHistoryPageDTO:
+        """
+        특정 사용자의 스캔 기록 조회 (최신순, 커서 페이지)
+        - cursor: 이전 페이지 응답의 next_cursor (없으면 첫 페이지)
+        """
+        result = await self.read_db.execute(history_page_query(user_id, cursor, limit))
+        return history_page(result.all(), limit)
+
+    async def create_scan_history(
         self, 
         user_id: int, 
         barcode: str,          # 바코드를 받아서 food_id를 찾아야 함
@@ -64,15 +150,15 @@ class HistoryRepository:
     ) -> ScanHistory:
         
         # 1. barcode로 food_id 찾기
-        food = self.db.query(Food).filter(Food.barcode == barcode).first()
-        if not food:
+        food_id = await self.db.scalar(select(Food.food_id).where(Food.barcode == barcode))
+        if food_id is None:
             # 방금 1단계 분석을 마쳤으니 없을 리가 없지만, 안전장치
             raise HTTPException(404, "Food not found for history saving")
 
         # 2. 저장 (food_id 사용)
         db_history = ScanHistory(
             user_id=user_id,
-            food_id=food.food_id, #바코드 대신 ID 저장
+            food_id=food_id, #바코드 대신 ID 저장
             
             score_total=total_score,
             grade=grade,
@@ -87,51 +173,43 @@ class HistoryRepository:
         )
         
         self.db.add(db_history)
-        self.db.commit()
-        self.db.refresh(db_history)
+        await self.db.commit()
+        await self.db.refresh(db_history)
+        # 잠시 동안 이 유저의 기록 조회는 primary에서 (복제 지연으로 방금 기록이 안 보이는 문제)
+        await mark_user_write_async(user_id)
         
         return db_history
     
-    def get_scan_history_by_id(self, scan_id: int, user_id: int) -> Optional[ScanHistoryDTO]:
+    async def get_scan_history_by_id(self, scan_id: int, user_id: int) -> Optional[ScanHistoryDTO]:
         # 1. DB 조회
-        row = (
-            self.db.query(ScanHistory)
-            .options(joinedload(ScanHistory.food)) # 이름 가져오기 위해 조인
-            .filter(ScanHistory.scan_id == scan_id)
-            .filter(ScanHistory.user_id == user_id)
-            .first()
-        )
+        row = (await self.read_db.execute(history_detail_query(scan_id, user_id))).first()
         
         if not row:
             return None
 
         # 2. DTO 변환 (Mapping)
-        return ScanHistoryDTO(
-            scan_id=row.scan_id,
-            product_name=row.food.name if row.food else "알 수 없음",
-            image_url=row.food.image_url if row.food else None,
-            total_score=row.score_total,
-            grade=row.grade,
-            created_at=row.scanned_at
-        )
+        return history_to_dto(row)
     
-    def delete_scan_history(self, scan_id: int, user_id: int) -> bool:
+    async def delete_scan_history(self, scan_id: int, user_id: int) -> bool:
         """
         해당 scan_id의 기록을 삭제합니다. 
         단, user_id가 일치해야만 삭제됩니다. (본인 확인)
         반환값: 삭제 성공 여부 (True/False)
         """
-        # 1. 삭제 대상 조회 (내 기록인지 확인 포함)
-        record = self.db.query(ScanHistory).filter(
-            ScanHistory.scan_id == scan_id,
-            ScanHistory.user_id == user_id
-        ).first()
-
-        # 2. 없으면(내 거 아니거나 없는 ID면) False 반환
-        if not record:
+        # 조회 후 삭제 대신 DELETE 1번 (내 기록이 아니거나 없는 ID면 0행)
+        result = await self.db.execute(
+            delete(ScanHistory).where(ScanHistory.scan_id == scan_id, ScanHistory.user_id == user_id)
+        )
+        await self.db.commit()
+        if result.rowcount == 0:
             return False
+        await mark_user_write_async(user_id)
+        return True
+
 
-        # 3. 있으면 삭제 수행
-        self.db.delete(record)
-        self.db.commit()
-        return True
\ No newline at end of file
+def get_history_repository(db: AsyncSession = Depends(get_async_db),
+                           read_db: AsyncSession = Depends(get_async_read_db)) -> HistoryRepository:
+    """조회는 읽기 복제본 세션, 저장/삭제는 primary 세션을 쓰는 HistoryRepository (FastAPI Depends)"""
+    repo = HistoryRepository(db=db)
+    repo.read_db = read_db
+    return repo
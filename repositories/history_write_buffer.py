@@ -0,0 +1,209 @@
+# repositories/history_write_buffer.py
+"""
+스캔 기록 write-behind 저장 (HISTORY_WRITE_MODE=buffered)
+- /foods/calculate-grade는 기록을 메모리 큐에 넣고 바로 응답
+  -> 요청마다 하던 바코드 조회 + INSERT + 커밋 + refresh SELECT를 요청 경로에서 뺌
+  [응답 규약] 큐에 넣은 요청의 GradeResult.scan_id는 None (아직 INSERT 전이라 번호가 없음)
+  클라이언트는 scan_id가 None이면 상세 조회 대신 /history/me 목록으로 확인 (큐가 가득 차서 바로 저장하면 예전처럼 번호가 옴)
+- 백그라운드 스레드 1개가 큐에 쌓인 기록을 모아 여러 행 INSERT 1번 + 커밋 1번으로 저장
+  (바코드 -> food_id, user_id 존재 확인도 배치당 SELECT 1번씩
+   -> 제품이나 유저가 없는 기록만 빼고 저장, 하나 때문에 배치 전체가 FK 오류로 실패하지 않음)
+- 큐가 가득 차면 enqueue가 False -> 호출한 쪽이 예전처럼 바로 저장 (기록을 버리지 않음)
+- 정상 종료(main.py lifespan) 때 close()로 큐를 끝까지 비움
+  (프로세스가 강제 종료되면 아직 저장 안 된 기록은 사라짐)
+- 워커(프로세스)마다 큐 1개
+
+설정 (.env): HISTORY_WRITE_MODE, HISTORY_WRITE_QUEUE_SIZE, HISTORY_WRITE_BATCH_SIZE, HISTORY_WRITE_RETRIES
+"""
+import os
+import queue
+import threading
+import time
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import func, insert, select
+
+from database import SessionLocal
+from models.models import Food, ScanHistory, User
+
+load_dotenv()
+
+# sync: 요청마다 바로 저장 (기본) / buffered: 큐에 넣고 배치로 저장
+HISTORY_WRITE_MODE = os.getenv("HISTORY_WRITE_MODE", "sync").lower()
+HISTORY_WRITE_QUEUE_SIZE = int(os.getenv("HISTORY_WRITE_QUEUE_SIZE", "10000"))
+HISTORY_WRITE_BATCH_SIZE = int(os.getenv("HISTORY_WRITE_BATCH_SIZE", "500"))
+HISTORY_WRITE_RETRIES = int(os.getenv("HISTORY_WRITE_RETRIES", "3"))
+
+# 큐가 비어 있을 때 종료 신호를 다시 확인하는 간격
+_IDLE_POLL_SEC = 0.2
+_RETRY_BACKOFF_SEC = 0.5
+
+
+class HistoryWriteBuffer:
+    def __init__(self, session_factory=SessionLocal, maxsize: int = HISTORY_WRITE_QUEUE_SIZE,
+                 batch_size: int = HISTORY_WRITE_BATCH_SIZE, retries: int = HISTORY_WRITE_RETRIES):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.retries = retries
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.rejected = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        # 저장 시점에 제품이 없어서 빠진 기록 (동기 저장이면 404였을 요청)
+        self.missing_food = 0
+        # 저장 시점에 유저가 없어서 빠진 기록 (큐에 있는 동안 탈퇴한 유저 등)
+        self.missing_user = 0
+
+    def enqueue(self, **record) -> bool:
+        """
+        기록 1개를 큐에 넣음 (create_scan_history와 같은 인자)
+        큐가 가득 찼거나 종료 중이면 False (호출한 쪽이 바로 저장)
+        """
+        if self._stopping.is_set():
+            return False
+        self.start()
+        # 요청 시각 기준으로 정렬되도록 넣은 시각을 같이 보관 (저장 시 DB 시계로 환산)
+        record["enqueued_at"] = time.time()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+                self._thread.start()
+
+    def close(self, timeout: float = 10.0):
+        """종료: 새 기록은 받지 않고, 큐에 남은 기록을 모두 저장할 때까지 기다림"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        # 스레드를 시작한 적이 없거나 timeout 안에 못 끝낸 경우 -> 남은 것을 여기서 저장
+        while not self._queue.empty():
+            self._write(self._take_batch(block=False))
+        print(f"[HistoryWriter] Closed (written={self.written}, missing_food={self.missing_food}, "
+              f"missing_user={self.missing_user}, dropped={self.dropped})")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": HISTORY_WRITE_MODE,
+                "queued": self._queue.qsize(),
+                "enqueued": self.enqueued,
+                "rejected": self.rejected,
+                "written": self.written,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "missing_food": self.missing_food,
+                "missing_user": self.missing_user,
+            }
+
+    def _run(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = self._take_batch(block=True)
+            if batch:
+                self._write(batch)
+
+    def _take_batch(self, block: bool) -> List[dict]:
+        """
+        첫 기록은 기다렸다가 받고, 나머지는 이미 쌓인 만큼만 (batch_size까지)
+        -> 한가할 때는 바로 저장, 몰릴 때는 앞 배치를 커밋하는 동안 쌓인 기록이 다음 배치가 됨
+        """
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=_IDLE_POLL_SEC) if block else self._queue.get_nowait())
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _write(self, batch: List[dict]):
+        for attempt in range(self.retries):
+            try:
+                written, missing_food, missing_user = self._insert_batch(batch)
+                with self._lock:
+                    self.written += written
+                    self.batches += 1
+                    self.missing_food += len(missing_food)
+                    self.missing_user += len(missing_user)
+                # 동기 저장이면 404였을 기록 (응답은 이미 나갔으므로 복구할 수 있게 내용을 남김)
+                for reason, skipped in (("Food", missing_food), ("User", missing_user)):
+                    for r in skipped:
+                        print(f"[HistoryWriter] {reason} not found, history row skipped: user_id={r['user_id']} "
+                              f"barcode={r['barcode']} total_score={r['total_score']} grade={r['grade']} "
+                              f"enqueued_at={r['enqueued_at']:.3f}")
+                return
+            except Exception as e:
+                print(f"[HistoryWriter] Batch insert failed ({len(batch)} rows, attempt {attempt + 1}): {e}")
+                time.sleep(_RETRY_BACKOFF_SEC * (2 ** attempt))
+        with self._lock:
+            self.dropped += len(batch)
+        print(f"[HistoryWriter] Gave up on {len(batch)} rows")
+
+    def _insert_batch(self, batch: List[dict]) -> Tuple[int, List[dict], List[dict]]:
+        """배치 저장 -> (저장한 행 수, 제품이 없어서 뺀 기록, 유저가 없어서 뺀 기록)"""
+        db = self.session_factory()
+        try:
+            barcodes = {r["barcode"] for r in batch}
+            food_ids = dict(db.execute(select(Food.barcode, Food.food_id).where(Food.barcode.in_(barcodes))).all())
+            user_ids = {r["user_id"] for r in batch}
+            known_users = set(db.scalars(select(User.user_id).where(User.user_id.in_(user_ids))).all())
+            # scanned_at: DB 시계(NOW()) - 큐에서 기다린 시간 (동기 저장의 server_default와 같은 시계)
+            db_now = db.scalar(select(func.now()))
+            now = time.time()
+
+            rows, missing_food, missing_user = [], [], []
+            for r in batch:
+                food_id = food_ids.get(r["barcode"])
+                if food_id is None:
+                    missing_food.append(r)
+                    continue
+                if r["user_id"] not in known_users:
+                    missing_user.append(r)
+                    continue
+                rows.append({
+                    "user_id": r["user_id"],
+                    "food_id": food_id,
+                    "score_total": r["total_score"],
+                    "grade": r["grade"],
+                    "nutrition_score": r["nutrition_score"],
+                    "packaging_score": r["packaging_score"],
+                    "additives_score": r["additives_score"],
+                    "nutrition_weight": r["w_nutrition"],
+                    "packaging_weight": r["w_packaging"],
+                    "additives_weight": r["w_additives"],
+                    "scanned_at": db_now - timedelta(seconds=now - r["enqueued_at"]),
+                })
+            if rows:
+                # 여러 행 INSERT 1번 (INSERT ... VALUES (...), (...), ...)
+                db.execute(insert(ScanHistory).values(rows))
+                db.commit()
+            return len(rows), missing_food, missing_user
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+history_write_buffer = HistoryWriteBuffer()
+
+
+def get_history_write_buffer() -> HistoryWriteBuffer:
+    return history_write_buffer
@@ -1,15 +1,24 @@
 #routers/food_router.py
+import os
+from typing import Optional
 from fastapi import (
     APIRouter, Depends, UploadFile, 
-    File, HTTPException
+    File, HTTPException, Response, Header
 )
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from services.barcode_scanning_service import BarcodeScanningService
-from services.food_analysis_service import FoodAnalysisService
+from services.food_analysis_service import FoodAnalysisService, AsyncFoodAnalysisService
+from services.analysis_job_service import AnalysisJobService, background_job_service, wants_job
 from services.final_grade_calculation_service import FinalGradeCalculationService
 
 from models.dtos import (
     BarcodeScanResult,       # 0단계 응답
     AnalysisScoresDTO,       # 1단계 응답
+    BatchAnalysisRequest,    # 1단계 배치 요청
+    BatchAnalysisResponse,   # 1단계 배치 응답
+    ImageStatusDTO,          # 제품 이미지 상태
+    AnalysisJobDTO,          # 1단계 콜드 미스 작업 (202)
     GradeCalculationRequest, # 2단계 요청
     GradeResult              # 2단계 응답
 )
@@ -19,6 +28,11 @@ router = APIRouter(
     tags=["Foods API"]
 )
 
+# 1단계 분석 경로 선택 (.env)
+# - sync : 동기 경로 (anyio 스레드 + requests + 동기 세션)
+# - async: redis.asyncio + AsyncSession + httpx (콜드 미스가 스레드를 잡지 않음)
+ANALYSIS_PIPELINE_MODE = os.getenv("ANALYSIS_PIPELINE_MODE", "sync").lower()
+
 # -------------------------------------------------------------------
 # 0단계: 바코드 이미지 스캔 (이미지 -> 바코드 번호)
 # -------------------------------------------------------------------
@@ -45,23 +59,130 @@ async def scan_barcode_from_image(
 # -------------------------------------------------------------------
 # 1단계: 3가지 점수 분석 (DB/API 조회 및 분석)
 # -------------------------------------------------------------------
-@router.get("/analysis/{barcode}", response_model=AnalysisScoresDTO)
+def _job_accepted(job: dict) -> JSONResponse:
+    """콜드 미스 작업 접수 응답 (202 + 폴링 주소)"""
+    return JSONResponse(
+        status_code=202,
+        content=AnalysisJobDTO(**job).model_dump(),
+        headers={
+            "Location": f"/foods/analysis/jobs/{job['job_id']}",
+            "Retry-After": "1",
+            "Preference-Applied": "respond-async",
+        }
+    )
+
 def get_analysis_scores(
     barcode: str,
-    analysis_service: FoodAnalysisService = Depends(FoodAnalysisService)
+    prefer: Optional[str] = Header(None),
+    analysis_service: FoodAnalysisService = Depends(FoodAnalysisService),
+    job_service: AnalysisJobService = Depends(AnalysisJobService)
 ):
     """
     [1단계] 바코드 번호(str)를 받아 3가지 분석 점수를 반환합니다.
     (DB/캐시 조회 또는 신규 생성 파이프라인 실행)
+    작업 모드(ANALYSIS_COLD_MISS_MODE=job 또는 Prefer: respond-async)에서는
+    콜드 미스면 기다리지 않고 202 + job_id를 반환합니다. (/foods/analysis/jobs/{job_id})
+    """
+    if wants_job(prefer):
+        result = job_service.get_or_start(barcode)
+        if isinstance(result, dict):
+            return _job_accepted(result)
+        return Response(content=result, media_type="application/json")
+
+    # 캐시된 JSON을 그대로 내려보냄 (response_model 재검증/직렬화 생략)
+    payload = analysis_service.get_analysis_scores_json(barcode)
+    return Response(content=payload, media_type="application/json")
+
+async def get_analysis_scores_async(
+    barcode: str,
+    prefer: Optional[str] = Header(None),
+    analysis_service: AsyncFoodAnalysisService = Depends(AsyncFoodAnalysisService)
+):
+    """
+    [1단계] 바코드 번호(str)를 받아 3가지 분석 점수를 반환합니다. (비동기 경로, 응답은 동기 경로와 같음)
+    작업 모드의 콜드 미스 작업은 동기 경로와 같은 작업 스레드풀에서 돕니다.
+    """
+    if wants_job(prefer):
+        payload = await analysis_service.get_known_analysis_json(barcode)
+        if payload is not None:
+            return Response(content=payload, media_type="application/json")
+        # 작업 생성은 동기 Redis 호출 몇 번 -> 이벤트 루프 밖에서
+        jobs = background_job_service(analysis_service.repo.background_repo(), analysis_service.calculator)
+        return _job_accepted(await run_in_threadpool(jobs.start, barcode))
+
+    payload = await analysis_service.get_analysis_scores_json(barcode)
+    return Response(content=payload, media_type="application/json")
+
+router.add_api_route(
+    "/analysis/{barcode}",
+    get_analysis_scores_async if ANALYSIS_PIPELINE_MODE == "async" else get_analysis_scores,
+    methods=["GET"],
+    response_model=AnalysisScoresDTO,
+    responses={202: {"model": AnalysisJobDTO, "description": "콜드 미스 작업 접수 (작업 모드)"}}
+)
+
+# -------------------------------------------------------------------
+# 1단계 (작업 모드): 콜드 미스 작업 결과 폴링 / SSE
+# -------------------------------------------------------------------
+@router.get("/analysis/jobs/{job_id}", response_model=AnalysisJobDTO)
+def get_analysis_job(
+    job_id: str,
+    job_service: AnalysisJobService = Depends(AnalysisJobService)
+):
+    """
+    202로 받은 job_id의 진행 상태를 반환합니다.
+    status: pending / running / done(result 포함) / failed(error_status, error)
+    """
+    return job_service.get_job(job_id)
+
+@router.get("/analysis/jobs/{job_id}/events")
+def stream_analysis_job(
+    job_id: str,
+    job_service: AnalysisJobService = Depends(AnalysisJobService)
+):
+    """
+    작업 상태를 SSE(text/event-stream)로 보냅니다. done/failed 이벤트에 최종 결과가 담겨 있고 그 뒤 연결이 닫힙니다.
+    """
+    job_service.get_job(job_id)  # 없는 작업은 스트림 열기 전에 404
+    return StreamingResponse(
+        job_service.events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# -------------------------------------------------------------------
+# 1단계 (배치): 여러 바코드 한 번에 분석
+# -------------------------------------------------------------------
+@router.post("/analysis/batch", response_model=BatchAnalysisResponse)
+def get_analysis_scores_batch(
+    request_data: BatchAnalysisRequest,
+    analysis_service: FoodAnalysisService = Depends(FoodAnalysisService)
+):
+    """
+    [1단계 배치] 바코드 목록(최대 200개)을 한 번에 분석합니다.
+    바코드별로 status(200/404/422...)와 결과 또는 에러 메시지를 요청 순서대로 반환합니다.
     """
-    # ProductEvaluationService는 3대 분석 점수(DTO)만 반환
-    return analysis_service.get_analysis_scores(barcode)
+    return analysis_service.get_analysis_scores_batch(request_data.barcodes)
+
+# -------------------------------------------------------------------
+# 제품 이미지 상태 (이미지는 분석 응답 후 백그라운드에서 채워짐)
+# -------------------------------------------------------------------
+@router.get("/image-status/{barcode}", response_model=ImageStatusDTO)
+def get_image_status(
+    barcode: str,
+    analysis_service: FoodAnalysisService = Depends(FoodAnalysisService)
+):
+    """
+    분석 응답에 image_url이 비어 있으면 이걸로 확인합니다.
+    status: ready(image_url 있음) / pending(조회 중) / none(이미지 없음)
+    """
+    return analysis_service.get_image_status(barcode)
 
 # -------------------------------------------------------------------
 # 2단계: 최종 점수 계산 (실시간 가중치 적용)
 # -------------------------------------------------------------------
 @router.post("/calculate-grade", response_model=GradeResult)
-def calculate_final_grade(
+async def calculate_final_grade(
     # dtos.py에 정의된 '2단계 요청 DTO'를 사용
     request_data: GradeCalculationRequest,
     user_id: int,
@@ -72,6 +193,7 @@ def calculate_final_grade(
     [2단계] 1단계 결과(AnalysisScoresDTO)와 
     사용자 가중치(UserPrioritiesDTO)를 받아 
     최종 등급(GradeResult)을 계산
+    - HISTORY_WRITE_MODE=buffered면 기록은 큐에 넣고 바로 응답 -> scan_id는 None (배치 저장 후 /history/me에 나타남)
     """
     
     # 1. 요청 DTO에서 3대 점수와 가중치 추출
@@ -79,11 +201,31 @@ def calculate_final_grade(
     user_priorities = request_data.priorities
     
     # 2. 계산 위임
-    final_result = grade_service.calculate_and_save(
+    final_result = await grade_service.calculate_and_save(
         user_id=user_id,
         scores=analysis_scores,
         priorities=user_priorities,
         save_to_db=save_history
     )
     
-    return final_result
\ No newline at end of file
+    return final_result
+
+# -------------------------------------------------------------------
+# [관리] 네거티브 캐시 삭제 (외부 API에 없다고 기억해둔 바코드)
+# -------------------------------------------------------------------
+@router.delete("/negative-cache/{barcode}", summary="네거티브 캐시 삭제 (바코드 1개)")
+def purge_negative_cache_entry(
+    barcode: str,
+    analysis_service: FoodAnalysisService = Depends(FoodAnalysisService)
+):
+    """
+    식약처/공공데이터 쪽 데이터가 고쳐졌을 때,
+    해당 바코드를 다음 스캔부터 다시 외부 API로 조회하게 합니다.
+    """
+    return {"deleted": analysis_service.purge_negative_cache(barcode)}
+
+@router.delete("/negative-cache", summary="네거티브 캐시 전체 삭제")
+def purge_negative_cache_all(
+    analysis_service: FoodAnalysisService = Depends(FoodAnalysisService)
+):
+    return {"deleted": analysis_service.purge_negative_cache()}
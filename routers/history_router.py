@@ -1,30 +1,49 @@
 #routers/history_router.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from typing import List, Optional
 
-from database import get_db
-from models.dtos import ScanHistoryDTO, GradeCalculationRequest, GradeResult
+from models.dtos import ScanHistoryDTO, ScanHistoryPageDTO
 from services.history_service import HistoryService
-from services.final_grade_calculation_service import FinalGradeCalculationService
 
+def bind_user(request: Request, user_id: int):
+    """
+    요청 유저를 request.state에 기록 (모든 history 엔드포인트의 user_id)
+    -> 조회 세션 선택(database.get_async_read_db)의 read-your-writes 판단에 사용
+    """
+    request.state.user_id = user_id
+
+# 모든 엔드포인트가 AsyncSession(database.get_async_db)으로 DB를 기다림 (스레드풀 자리를 차지하지 않음)
 router = APIRouter(
     prefix="/history",  
-    tags=["Scan History"]
+    tags=["Scan History"],
+    dependencies=[Depends(bind_user)]
 )
 
 @router.get("/me", response_model=List[ScanHistoryDTO], summary="내 스캔 기록 목록 조회")
-def get_my_scan_history(
+async def get_my_scan_history(
     user_id: int,
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db),
     service: HistoryService = Depends(HistoryService)
 ):
     """
     현재 사용자의 최근 스캔 기록을 N개 반환
     """
-    return service.get_user_scan_history(user_id, skip=skip, limit=limit)
+    return await service.get_user_scan_history(user_id, skip=skip, limit=limit)
+
+# 커서 페이지 버전 (기존 /me의 skip/limit은 호환용으로 그대로 둠)
+@router.get("/me/page", response_model=ScanHistoryPageDTO, summary="내 스캔 기록 목록 조회 (커서 페이지)")
+async def get_my_scan_history_page(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    service: HistoryService = Depends(HistoryService)
+):
+    """
+    현재 사용자의 스캔 기록을 최신순으로 한 페이지씩 반환
+    - 응답의 next_cursor를 다음 요청의 cursor로 보내면 이어서 조회 (없으면 마지막 페이지)
+    """
+    return await service.get_user_scan_history_page(user_id, cursor=cursor, limit=limit)
 
 # ===================================================================
 # [READ] 특정 스캔 기록 상세 조회 (Detail)
@@ -34,7 +53,7 @@ def get_my_scan_history(
     response_model=ScanHistoryDTO,
     summary="특정 스캔 기록 상세 조회"
 )
-def get_scan_history_detail(
+async def get_scan_history_detail(
     scan_id: int,
     user_id: int,
     service: HistoryService = Depends(HistoryService)
@@ -43,7 +62,7 @@ def get_scan_history_detail(
     특정 기록(scan_id)의 상세 정보를 가져옵니다.
     (내 기록이 아니면 권한 에러를 낼 수도 있음)
     """
-    record = service.get_scan_history_by_id(scan_id, user_id)
+    record = await service.get_scan_history_by_id(scan_id, user_id)
     
     if not record:
         raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다.")
@@ -59,16 +78,15 @@ def get_scan_history_detail(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="스캔 기록 삭제"
 )
-def delete_scan_history(
+async def delete_scan_history(
     scan_id: int,
     user_id: int,
-    db: Session = Depends(get_db),
     service: HistoryService = Depends(HistoryService)
 ):
     """
     특정 스캔 기록을 삭제
     """
     # 1. 존재 여부 및 권한 확인
-    service.delete_scan_history(scan_id, user_id)
+    await service.delete_scan_history(scan_id, user_id)
     
-    return None # 204 No Content
\ No newline at end of file
+    return None # 204 No Content
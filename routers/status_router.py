@@ -0,0 +1,78 @@
+#routers/status_router.py
+from fastapi import APIRouter, Depends
+from redis import Redis
+import cache
+import rate_limiter
+import bulkhead
+import http_client
+import circuit_breaker
+import database
+from repositories.history_write_buffer import history_write_buffer
+
+router = APIRouter(
+    prefix="/status",
+    tags=["Status"]
+)
+
+@router.get("/redis-pool", summary="Redis 연결 풀 현황")
+def get_redis_pool_stats():
+    """
+    공유 Redis 연결 풀의 생성/대기/사용 중 연결 수 (풀 크기 조정용)
+    """
+    return cache.get_pool_stats()
+
+@router.get("/local-cache", summary="워커 내부 제품 캐시 현황")
+def get_local_cache_stats():
+    """
+    이 워커(프로세스)의 1차 제품 캐시 크기/히트율/퇴출 수
+    """
+    return cache.product_local_cache.stats()
+
+@router.get("/upstream-http", summary="외부 식품 API 연결 풀 현황")
+def get_upstream_http_stats():
+    """
+    호스트별 요청 수 / 새로 맺은 연결 수 / 연결 재사용률 / 재시도 수
+    (reuse_ratio가 낮으면 keep-alive가 끊기거나 풀 크기가 동시 요청 수보다 작은 것)
+    """
+    return http_client.get_http_stats()
+
+@router.get("/circuit-breakers", summary="외부 식품 API 서킷 브레이커 상태")
+def get_circuit_breaker_stats():
+    """
+    단계별(C005, I1250, C002, NUTRI, IMG) 브레이커 상태 / 최근 실패율 / 바로 실패시킨 호출 수
+    (이 워커 기준, open이면 retry_after초 뒤에 시험 호출)
+    """
+    return circuit_breaker.get_breaker_stats()
+
+@router.get("/upstream-quota", summary="외부 식품 API 호출량 한도 사용 현황")
+def get_upstream_quota_stats(redis: Redis = Depends(cache.get_redis_client)):
+    """
+    API 키 + 서비스별 오늘 사용량 / 일일 한도 / 남은 토큰 (Redis 공유 값)
+    local: 이 워커에서 우선순위별로 통과 / 줄 섬 / 포기(shed)한 호출 수
+    """
+    return rate_limiter.get_quota_stats(redis)
+
+@router.get("/bulkheads", summary="빠른 경로 / 외부 API 콜드 조회 동시 실행 현황")
+def get_bulkhead_stats():
+    """
+    upstream: 외부 API 콜드 조회 상한 / 진행 중 / 최대 / 거절(503) 수
+    threadpool: 동기 엔드포인트 스레드풀 크기와 사용 중인 스레드 수
+    """
+    return bulkhead.get_bulkhead_stats()
+
+@router.get("/history-writes", summary="스캔 기록 write-behind 큐 현황")
+def get_history_write_stats():
+    """
+    HISTORY_WRITE_MODE=buffered일 때 큐에 쌓인 기록 / 저장한 기록과 배치 수 /
+    큐가 가득 차서 바로 저장한 수(rejected) / 저장 실패로 버린 수(dropped) /
+    저장 시점에 제품 / 유저가 없어서 뺀 수(missing_food / missing_user) (이 워커 기준)
+    """
+    return history_write_buffer.stats()
+
+@router.get("/db-routing", summary="읽기 복제본 라우팅 현황")
+def get_db_routing_stats():
+    """
+    replicas: 설정된 읽기 복제본 수 (0이면 모든 읽기가 primary)
+    replica / primary / sticky: 조회 세션을 복제본 / primary / 방금 기록을 남긴 유저라 primary로 보낸 수 (이 워커 기준)
+    """
+    return database.get_read_routing_stats()
@@ -8,15 +8,15 @@ router = APIRouter(
 )
 
 @router.post("/signup", response_model=AuthResponse, summary="회원가입")
-def signup(
+async def signup(
     request: UserAuthRequest,
     service: UserService = Depends(UserService)
 ):
-    return service.signup(request)
+    return await service.signup(request)
 
 @router.post("/login", response_model=AuthResponse, summary="로그인")
-def login(
+async def login(
     request: UserAuthRequest,
     service: UserService = Depends(UserService)
 ):
-    return service.login(request)
\ No newline at end of file
+    return await service.login(request)
@@ -0,0 +1,132 @@
+# services/analysis_job_service.py
+"""
+콜드 미스 202 작업 모드 (ANALYSIS_COLD_MISS_MODE=job 또는 요청 헤더 Prefer: respond-async)
+- 캐시/DB에 있으면 평소처럼 200 + 분석 결과
+- 없으면 작업을 만들고 바로 202 + job_id 응답 -> 외부 API 조회 + 점수 계산은 작업 스레드풀에서
+  (모바일 클라이언트가 외부 API 5단계를 기다리다 타임아웃 나는 문제)
+- 앱은 GET /foods/analysis/jobs/{job_id} 폴링 또는 /foods/analysis/jobs/{job_id}/events (SSE)로 결과 수신
+- 작업 상태는 Redis에 저장 -> 어느 워커에 물어봐도 같은 답
+"""
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Optional, Union
+
+from fastapi import Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from repositories.analysis_job_repository import AnalysisJobRepository, DONE, FAILED
+from repositories.food_repository import FoodRepository
+from services.food_analysis_service import FoodAnalysisService
+from services.score_service import ScoreService
+
+ANALYSIS_COLD_MISS_MODE = os.getenv("ANALYSIS_COLD_MISS_MODE", "wait").lower()
+ANALYSIS_JOB_POLL_SEC = float(os.getenv("ANALYSIS_JOB_POLL_SEC", "0.5"))
+ANALYSIS_JOB_SSE_TIMEOUT_SEC = float(os.getenv("ANALYSIS_JOB_SSE_TIMEOUT", "60"))
+# 변화가 없어도 이 간격마다 주석 한 줄을 보냄 (프록시가 유휴 연결을 끊지 않게)
+SSE_KEEPALIVE_SEC = 15
+
+# 콜드 미스 작업 전용 스레드풀 (요청 스레드 / upstream bulkhead와 별도)
+_JOB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ANALYSIS_JOB_WORKERS", "8")),
+    thread_name_prefix="analysis-job"
+)
+
+
+def wants_job(prefer: Optional[str]) -> bool:
+    """202 작업 모드로 응답할지 (서버 설정 또는 요청 헤더 Prefer: respond-async)"""
+    return ANALYSIS_COLD_MISS_MODE == "job" or "respond-async" in (prefer or "").lower()
+
+
+def background_job_service(repo: FoodRepository, calculator: ScoreService) -> "AnalysisJobService":
+    """
+    비동기 분석 경로(ANALYSIS_PIPELINE_MODE=async)의 작업 모드용
+    repo: AsyncFoodRepository.background_repo() (작업 스레드는 동기 모드와 같은 코드로 돎)
+    """
+    return AnalysisJobService(
+        analysis=FoodAnalysisService(repo=repo, calculator=calculator),
+        jobs=AnalysisJobRepository(redis=repo.redis)
+    )
+
+
+class AnalysisJobService:
+    def __init__(
+        self,
+        analysis: FoodAnalysisService = Depends(FoodAnalysisService),
+        jobs: AnalysisJobRepository = Depends(AnalysisJobRepository)
+    ):
+        self.analysis = analysis
+        self.jobs = jobs
+
+    def get_or_start(self, barcode: str) -> Union[bytes, dict]:
+        """
+        캐시/DB로 응답할 수 있으면 분석 결과 JSON(bytes), 콜드 미스면 작업(dict)
+        같은 바코드 작업이 이미 진행 중이면 그 작업을 그대로 돌려줌 (외부 API 조회 1번)
+        """
+        payload = self.analysis.get_known_analysis_json(barcode)
+        if payload is not None:
+            return payload
+        return self.start(barcode)
+
+    def start(self, barcode: str) -> dict:
+        """콜드 미스 작업을 만들고 작업 스레드풀에 넣음 (같은 바코드 작업이 진행 중이면 그 작업)"""
+        job, created = self.jobs.create_or_get(barcode)
+        if created:
+            print(f"[Job] Cold miss, analysis job queued: {barcode} ({job['job_id']})")
+            _JOB_EXECUTOR.submit(self._run, dict(job))  # 응답용 job은 작업 스레드가 바꾸지 않게 복사본을 넘김
+        return job
+
+    def get_job(self, job_id: str) -> dict:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Analysis job not found (expired or unknown)")
+        return job
+
+    def _run(self, job: dict):
+        """작업 스레드: 별도 DB 세션으로 외부 API 조회 + 점수 계산 -> 결과/에러를 Redis에 기록"""
+        repo = self.analysis.repo
+        db = repo.session_factory()
+        try:
+            self.jobs.mark_running(job)
+            service = FoodAnalysisService(repo=repo._sibling(db), calculator=self.analysis.calculator)
+            self.jobs.complete(job, service.run_analysis_job(job["barcode"]))
+        except HTTPException as he:
+            self.jobs.fail(job, he.status_code, str(he.detail))
+        except Exception as e:
+            print(f"[Job] Analysis job failed ({job['barcode']}): {e}")
+            self.jobs.fail(job, 500, "Product lookup failed")
+        finally:
+            db.close()
+
+    async def events(self, job_id: str) -> AsyncIterator[str]:
+        """
+        SSE 스트림: 상태가 바뀔 때마다 event: pending / running / done / failed
+        done/failed(또는 ANALYSIS_JOB_SSE_TIMEOUT)에서 끝남 -> 끊기면 앱은 폴링으로 이어서 확인
+        """
+        started = last_sent = time.monotonic()
+        last_status = None
+        while True:
+            job = await run_in_threadpool(self.jobs.get, job_id)
+            if job is None:
+                yield _sse("failed", {"job_id": job_id, "status": FAILED, "error_status": 404,
+                                      "error": "Analysis job not found (expired or unknown)"})
+                return
+            if job["status"] != last_status:
+                last_status = job["status"]
+                last_sent = time.monotonic()
+                yield _sse(last_status, job)
+            if last_status in (DONE, FAILED):
+                return
+            if time.monotonic() - started >= ANALYSIS_JOB_SSE_TIMEOUT_SEC:
+                yield _sse("timeout", {"job_id": job_id, "status": last_status})
+                return
+            if time.monotonic() - last_sent >= SSE_KEEPALIVE_SEC:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(ANALYSIS_JOB_POLL_SEC)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -1,7 +1,6 @@
 import numpy as np
 from typing import Tuple, Dict
 from fastapi import Depends
-from sqlalchemy.orm import Session
 
 from models.dtos import (
     AnalysisScoresDTO, 
@@ -9,14 +8,18 @@ from models.dtos import (
     GradeResult,
     UserWeightsDTO
 )
+from database import mark_user_write_async
 from repositories.history_repository import HistoryRepository
+from repositories.history_write_buffer import HISTORY_WRITE_MODE, HistoryWriteBuffer, get_history_write_buffer
 
 # 기본 가중치 (사용자 입력 없을 시)
 DEFAULT_WEIGHTS = {"pkg": 0.333, "add": 0.333, "nut": 0.333}
 
 class FinalGradeCalculationService:
-    def __init__(self, scan_repo: HistoryRepository = Depends(HistoryRepository)):
+    def __init__(self, scan_repo: HistoryRepository = Depends(HistoryRepository),
+                 write_buffer: HistoryWriteBuffer = Depends(get_history_write_buffer)):
         self.scan_repo = scan_repo
+        self.write_buffer = write_buffer
 
     def _calculate_ahp(self, p: UserPrioritiesDTO) -> Dict[str, float]:
         """
@@ -67,7 +70,7 @@ class FinalGradeCalculationService:
             "nut": float(weights[2])
         }
 
-    def calculate_and_save(
+    async def calculate_and_save(
         self, 
         user_id: int, 
         scores: AnalysisScoresDTO, 
@@ -98,7 +101,7 @@ class FinalGradeCalculationService:
         # 4. [DB 저장]
         scan_id = None
         if save_to_db:
-            saved_record = self.scan_repo.create_scan_history(
+            record = dict(
                 user_id=user_id,
                 barcode=scores.barcode,
 
@@ -113,7 +116,15 @@ class FinalGradeCalculationService:
                 w_packaging=w_pkg,
                 w_additives=w_add
             )
-            scan_id = saved_record.scan_id
+            # write-behind 모드: 큐에 넣고 바로 응답 (scan_id는 배치 저장 후 /history/me에서 확인)
+            # 큐가 가득 차면 예전처럼 바로 저장
+            buffered = HISTORY_WRITE_MODE == "buffered" and self.write_buffer.enqueue(**record)
+            if buffered:
+                # 배치로 저장될 때까지 포함해서 이 유저의 기록 조회는 primary에서
+                await mark_user_write_async(user_id)
+            else:
+                saved_record = await self.scan_repo.create_scan_history(**record)
+                scan_id = saved_record.scan_id
 
         # 5. [결과 반환]
         calculated_weights = UserWeightsDTO(
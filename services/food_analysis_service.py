@@ -1,7 +1,10 @@
 # services/product_analysis_service.py
-from fastapi import Depends
-from models.dtos import AnalysisScoresDTO
-from repositories.food_repository import FoodRepository
+from typing import Optional, List
+from fastapi import Depends, HTTPException
+from models.dtos import AnalysisScoresDTO, BatchAnalysisItem, BatchAnalysisResponse
+from repositories.food_repository import FoodRepository, get_food_repository
+from repositories.async_food_repository import AsyncFoodRepository
+from deadline import Deadline
 from services.score_service import ScoreService
 
 class FoodAnalysisService:
@@ -14,21 +17,145 @@ class FoodAnalysisService:
     """
     def __init__(
         self,
-        repo: FoodRepository = Depends(FoodRepository),
+        repo: FoodRepository = Depends(get_food_repository),
         calculator: ScoreService = Depends(ScoreService)
     ):
         self.repo = repo
         self.calculator = calculator
 
-    def get_analysis_scores(self, barcode: str) -> AnalysisScoresDTO:
+    def get_analysis_scores(self, barcode: str, deadline: Optional[Deadline] = None) -> AnalysisScoresDTO:
         # ---------------------------------------------------------
         # [확보] 원본(Raw) 데이터 가져오기
         # ---------------------------------------------------------
-        raw_data = self.repo.get_raw_data(barcode)
+        raw_data = self.repo.get_raw_data(barcode, deadline)
         
         # ---------------------------------------------------------
         # [계산] ScoreService에게 계산 위임
         # ---------------------------------------------------------
         analysis_scores = self.calculator.calculate_all(raw_data)
 
-        return analysis_scores
\ No newline at end of file
+        return analysis_scores
+
+    def get_analysis_scores_json(self, barcode: str) -> bytes:
+        """
+        분석 결과를 JSON bytes로 반환 (캐시 히트면 검증/재계산 없이 그대로)
+        - 캐시 키에 점수 규칙 버전이 들어가 있어서 규칙이 바뀌면 자동으로 다시 계산
+        - 콜드 미스는 요청 하나당 시간 예산(ANALYSIS_DEADLINE_SEC) 안에서만 외부 API를 기다림
+          (못 채운 항목은 provisional로 표시, 이런 결과는 분석 캐시에 넣지 않음)
+        """
+        cached = self.repo.get_cached_analysis(barcode)
+        if cached:
+            return cached
+
+        analysis = self.get_analysis_scores(barcode, Deadline.for_analysis())
+        payload = analysis.model_dump_json().encode("utf-8")
+        if not analysis.provisional:
+            self.repo.cache_analysis(barcode, payload)
+        return payload
+
+    def get_known_analysis_json(self, barcode: str) -> Optional[bytes]:
+        """
+        외부 API 없이 응답할 수 있으면 분석 결과 JSON, 콜드 미스면 None (202 작업 모드에서 사용)
+        """
+        cached = self.repo.get_cached_analysis(barcode)
+        if cached:
+            return cached
+
+        raw_data = self.repo.find_raw_data(barcode)
+        if raw_data is None:
+            return None
+        return self._score_and_cache(barcode, raw_data)
+
+    def run_analysis_job(self, barcode: str) -> bytes:
+        """202 작업 워커용: 시간 예산 없이 외부 API까지 끝까지 조회해서 계산"""
+        return self._score_and_cache(barcode, self.repo.get_raw_data_for_job(barcode))
+
+    def _score_and_cache(self, barcode: str, raw_data) -> bytes:
+        analysis = self.calculator.calculate_all(raw_data)
+        payload = analysis.model_dump_json().encode("utf-8")
+        if not analysis.provisional:
+            self.repo.cache_analysis(barcode, payload)
+        return payload
+
+    def get_analysis_scores_batch(self, barcodes: List[str]) -> BatchAnalysisResponse:
+        """
+        여러 바코드를 한 번에 분석 (바코드별로 성공/실패를 따로 담아서 반환)
+        1. 분석 결과 캐시 (MGET)
+        2. 나머지는 repo.get_raw_data_batch (Redis MGET -> DB IN -> API)
+        3. 새로 계산한 결과는 파이프라인으로 캐싱 (provisional 결과는 단건과 같이 캐싱 안 함)
+        """
+        unique = list(dict.fromkeys(barcodes))
+        cached = self.repo.get_cached_analysis_many(unique)
+
+        items = {}
+        for barcode, payload in cached.items():
+            items[barcode] = BatchAnalysisItem(
+                barcode=barcode, status=200,
+                result=AnalysisScoresDTO.model_validate_json(payload)
+            )
+
+        computed = {}
+        misses = [b for b in unique if b not in cached]
+        raws = self.repo.get_raw_data_batch(misses) if misses else {}
+        for barcode, raw in raws.items():
+            if isinstance(raw, HTTPException):
+                items[barcode] = BatchAnalysisItem(barcode=barcode, status=raw.status_code, error=str(raw.detail))
+                continue
+            analysis = self.calculator.calculate_all(raw)
+            if not analysis.provisional:
+                computed[barcode] = analysis.model_dump_json().encode("utf-8")
+            items[barcode] = BatchAnalysisItem(barcode=barcode, status=200, result=analysis)
+        self.repo.cache_analysis_many(computed)
+
+        return BatchAnalysisResponse(results=[items[b] for b in barcodes])
+
+    def get_image_status(self, barcode: str) -> dict:
+        """제품 이미지 보강 상태 (ready / pending / none)"""
+        return self.repo.get_image_status(barcode)
+
+    def purge_negative_cache(self, barcode: Optional[str] = None) -> int:
+        """
+        외부 API 데이터가 고쳐졌을 때 '없는 제품' 캐시를 지움
+        (barcode 없으면 전체 삭제)
+        """
+        return self.repo.purge_negative_cache(barcode)
+
+
+class AsyncFoodAnalysisService:
+    """
+    FoodAnalysisService의 단건 분석 비동기 버전 (ANALYSIS_PIPELINE_MODE=async)
+    응답 형식 / 캐시 규칙(provisional 결과는 분석 캐시에 넣지 않음)은 동기 버전과 같음
+    """
+    def __init__(
+        self,
+        repo: AsyncFoodRepository = Depends(AsyncFoodRepository),
+        calculator: ScoreService = Depends(ScoreService)
+    ):
+        self.repo = repo
+        self.calculator = calculator
+
+    async def get_analysis_scores_json(self, barcode: str) -> bytes:
+        cached = await self.repo.get_cached_analysis(barcode)
+        if cached:
+            return cached
+
+        raw_data = await self.repo.get_raw_data(barcode, Deadline.for_analysis())
+        return await self._score_and_cache(barcode, raw_data)
+
+    async def get_known_analysis_json(self, barcode: str) -> Optional[bytes]:
+        """외부 API 없이 응답할 수 있으면 분석 결과 JSON, 콜드 미스면 None (202 작업 모드에서 사용)"""
+        cached = await self.repo.get_cached_analysis(barcode)
+        if cached:
+            return cached
+
+        raw_data = await self.repo.find_raw_data(barcode)
+        if raw_data is None:
+            return None
+        return await self._score_and_cache(barcode, raw_data)
+
+    async def _score_and_cache(self, barcode: str, raw_data) -> bytes:
+        analysis = self.calculator.calculate_all(raw_data)
+        payload = analysis.model_dump_json().encode("utf-8")
+        if not analysis.provisional:
+            await self.repo.cache_analysis(barcode, payload)
+        return payload
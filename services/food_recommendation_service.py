@@ -1,12 +1,12 @@
 from typing import List
 from fastapi import Depends, HTTPException, status
-from repositories.food_repository import FoodRepository
+from repositories.food_repository import FoodRepository, get_food_repository
 from models.dtos import RecommendationRequestDTO, RecommendationResultDTO
 
 class FoodRecommendationService:
     def __init__(
         self, 
-        food_repo: FoodRepository = Depends(FoodRepository)
+        food_repo: FoodRepository = Depends(get_food_repository)
     ):
         self.food_repo = food_repo
 
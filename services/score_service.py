@@ -9,6 +9,9 @@ from models.dtos import (
     AdditivesDetail
 )
 
+# 점수 규칙 버전 (구간표/점수표/계산식을 바꾸면 올릴 것 -> 분석 결과 캐시가 자동으로 새로 계산됨)
+SCORING_RULES_VERSION = "1"
+
 class ScoreService:
     """
     [점수 계산기]
@@ -37,7 +40,8 @@ class ScoreService:
             # 계산된 상세 점수들
             nutrition=nut_detail,
             packaging=pkg_detail,
-            additives=add_detail
+            additives=add_detail,
+            provisional=list(raw.provisional)
         )
 
     # =====================================================
@@ -0,0 +1,126 @@
+import pytest
+
+from jobs.catalog_sync import CatalogSyncJob
+from models.models import Food, NutritionFact, RecyclingInfo, Ingredient
+from tests.stub_upstream import sample_product
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+@pytest.fixture
+def catalog(upstream):
+    """스텁 서버에 제품 10개 (그중 1개는 포장재질이 비어 있음)"""
+    upstream.products = [sample_product(f"88000000000{i:02d}", f"R{i:04d}", name=f"제품{i}") for i in range(10)]
+    upstream.products[3]["FRMLC_MTRQLT"] = " "
+    return upstream
+
+
+class StopSync(Exception):
+    pass
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_sync_fills_all_tables(repo, catalog, db_session, tmp_path):
+    """
+    [성공 케이스]
+    페이지 단위로 받아 조인한 제품이 4개 테이블에 모두 저장되고,
+    실시간 조회라면 422가 났을 제품은 건너뛰는지 테스트합니다.
+    """
+    stats = CatalogSyncJob(repo, workdir=str(tmp_path), page_size=3, batch_size=4).run()
+
+    assert stats["saved"] == 9
+    assert stats["skipped"] == 1
+    assert db_session.query(Food).count() == 9
+    assert db_session.query(NutritionFact).count() == 9
+    assert db_session.query(RecyclingInfo).count() == 9
+    assert db_session.query(Ingredient).count() == 9
+
+    food = db_session.query(Food).filter(Food.barcode == "8800000000000").one()
+    assert food.prdlst_report_no == "R0000"
+    assert food.base_nutrition_score > 0
+    # 페이지 조회라서 제품 수만큼 부르지 않음
+    assert catalog.calls["C005"] == 4
+
+
+def test_sync_resumes_from_checkpoint(repo, catalog, db_session, tmp_path, monkeypatch):
+    """
+    [체크포인트]
+    첫 배치 저장 후 중단되어도, 다시 실행하면 보조 데이터를 다시 받지 않고
+    남은 C005 페이지부터 이어서 저장하는지 테스트합니다.
+    """
+    original_upsert = repo.upsert_products
+    calls = {"n": 0}
+
+    def crash_on_second_batch(dtos):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise StopSync()
+        return original_upsert(dtos)
+
+    monkeypatch.setattr(repo, "upsert_products", crash_on_second_batch)
+    with pytest.raises(StopSync):
+        CatalogSyncJob(repo, workdir=str(tmp_path), page_size=3, batch_size=4).run()
+    saved_before = db_session.query(Food).count()
+    lookup_calls = catalog.calls["I1250"]
+
+    monkeypatch.setattr(repo, "upsert_products", original_upsert)
+    stats = CatalogSyncJob(repo, workdir=str(tmp_path), page_size=3, batch_size=4).run()
+
+    assert 0 < saved_before < 9
+    assert db_session.query(Food).count() == 9
+    assert stats["saved"] == 9
+    assert catalog.calls["I1250"] == lookup_calls
+
+
+def test_resync_updates_existing_rows(repo, catalog, db_session, tmp_path):
+    """
+    [upsert]
+    이미 있는 제품을 다시 동기화하면 중복 없이 값만 바뀌는지 테스트합니다.
+    """
+    CatalogSyncJob(repo, workdir=str(tmp_path / "a"), page_size=5, batch_size=100).run()
+    catalog.products[0]["PRDLST_NM"] = "이름 바뀜"
+    catalog.products[0]["RAWMTRL_NM"] = "정제수, 구연산"
+
+    CatalogSyncJob(repo, workdir=str(tmp_path / "b"), page_size=5, batch_size=100).run()
+    db_session.expire_all()
+
+    assert db_session.query(Food).count() == 9
+    assert db_session.query(Ingredient).count() == 9
+    assert db_session.query(Food).filter(Food.barcode == "8800000000000").one().name == "이름 바뀜"
+
+
+def test_resync_invalidates_cached_products(repo, catalog, fake_redis, tmp_path):
+    """
+    [캐시 무효화]
+    동기화로 바뀐 제품은 워커 내부 캐시 / Redis 제품 캐시 / 분석 결과 캐시가 지워져서
+    다음 조회에서 예전 값이 아니라 DB의 새 값이 나가는지 테스트합니다.
+    """
+    CatalogSyncJob(repo, workdir=str(tmp_path / "a"), page_size=5, batch_size=100).run()
+    barcode = "8800000000000"
+    repo._cache_data(barcode, repo.get_raw_data(barcode))
+    repo.cache_analysis(barcode, b'{"barcode": "8800000000000"}')
+    catalog.products[0]["PRDLST_NM"] = "이름 바뀜"
+
+    CatalogSyncJob(repo, workdir=str(tmp_path / "b"), page_size=5, batch_size=100).run()
+
+    assert repo.local_cache.get(barcode) is None
+    assert repo.get_cached_analysis(barcode) is None
+    assert fake_redis.exists(f"product:{barcode}", f"product:fresh:{barcode}") == 0
+    assert repo.get_raw_data(barcode).name == "이름 바뀜"
+
+
+def test_transient_page_error_is_retried(repo, catalog, tmp_path):
+    """
+    [재시도]
+    페이지 조회가 일시적으로 503이면 스캔 경로와 같은 http_get 재시도로 넘어가서
+    동기화가 중단되지 않는지 테스트합니다.
+    """
+    catalog.failures = {"C005": 1, "NUTRI": 1}
+
+    stats = CatalogSyncJob(repo, workdir=str(tmp_path), page_size=3, batch_size=4).run()
+
+    assert stats["saved"] == 9
+    assert catalog.failures == {"C005": 0, "NUTRI": 0}
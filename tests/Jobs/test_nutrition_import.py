@@ -0,0 +1,103 @@
+import csv
+import json
+
+from jobs.nutrition_import import NutritionImportJob, iter_records, _iter_json_array
+from models.models import Food, NutritionFact, NutritionReference
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+FIELDS = ["itemMnftrRptNo", "nutConSrtrQua", "nat", "sugar", "fasat", "fatrn", "foodLv4Cd", "foodLv4Nm"]
+
+
+def dataset_rows(n: int, start: int = 0):
+    return [
+        {
+            "itemMnftrRptNo": f"R{i:04d}", "nutConSrtrQua": "100g", "nat": str(100 + i),
+            "sugar": "5", "fasat": "1", "fatrn": "0", "foodLv4Cd": "C01", "foodLv4Nm": "과자",
+        }
+        for i in range(start, start + n)
+    ]
+
+
+def write_csv(path, rows):
+    with path.open("w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_import_csv_in_batches(repo, db_session, tmp_path):
+    """
+    [성공 케이스]
+    CSV 파일을 배치 단위로 읽어 nutrition_reference에 저장하고,
+    보고번호가 없는 행은 건너뛰는지 테스트합니다.
+    """
+    rows = dataset_rows(7) + [{**dataset_rows(1)[0], "itemMnftrRptNo": " "}]
+    path = write_csv(tmp_path / "nutri.csv", rows)
+
+    stats = NutritionImportJob(repo, batch_size=3).run(str(path))
+
+    assert stats == {"imported": 7, "updated_foods": 0, "skipped": 1}
+    assert db_session.query(NutritionReference).count() == 7
+    ref = db_session.query(NutritionReference).filter(NutritionReference.report_no == "R0006").one()
+    assert ref.sodium_mg == "106"
+    assert ref.category_name == "과자"
+
+
+def test_iter_records_json_formats(tmp_path):
+    """
+    [파일 형식]
+    JSON 배열, {"records": [...]} 형태, JSON Lines를 모두 같은 행으로 읽는지 테스트합니다.
+    (청크 경계에 객체가 걸쳐도 이어서 파싱되는지 포함)
+    """
+    rows = dataset_rows(50)
+    (tmp_path / "a.json").write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+    (tmp_path / "b.json").write_text(json.dumps({"fields": [], "records": rows}, ensure_ascii=False), encoding="utf-8")
+    (tmp_path / "c.jsonl").write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in rows), encoding="utf-8")
+
+    assert list(iter_records(str(tmp_path / "a.json"))) == rows
+    assert list(iter_records(str(tmp_path / "b.json"))) == rows
+    assert list(iter_records(str(tmp_path / "c.jsonl"))) == rows
+    assert list(_iter_json_array(tmp_path / "b.json", key="records", chunk_size=64)) == rows
+
+
+def test_import_updates_existing_food_and_cache(repo, upstream, db_session, fake_redis, tmp_path):
+    """
+    [기존 제품 갱신]
+    이미 저장된 제품의 보고번호가 데이터셋에 있으면 영양성분/카테고리가 갱신되고
+    제품 캐시가 지워지는지 테스트합니다.
+    """
+    barcode, report_no = upstream.products[0]["BAR_CD"], upstream.products[0]["PRDLST_REPORT_NO"]
+    repo.get_raw_data(barcode)
+    assert fake_redis.exists(f"product:{barcode}")
+
+    row = {**dataset_rows(1)[0], "itemMnftrRptNo": report_no, "nat": "999", "foodLv4Nm": "음료"}
+    stats = NutritionImportJob(repo).run(str(write_csv(tmp_path / "nutri.csv", [row])))
+
+    assert stats["updated_foods"] == 1
+    db_session.expire_all()
+    food = db_session.query(Food).filter(Food.barcode == barcode).one()
+    assert food.category_name == "음료"
+    assert db_session.query(NutritionFact).filter(NutritionFact.barcode == barcode).one().sodium_mg == 999
+    assert not fake_redis.exists(f"product:{barcode}")
+
+
+def test_live_fetch_uses_local_nutrition(repo, upstream, tmp_path):
+    """
+    [실시간 조회]
+    데이터셋에 보고번호가 있으면 새 제품 조회 시 영양성분 API를 부르지 않는지 테스트합니다.
+    """
+    barcode, report_no = upstream.products[0]["BAR_CD"], upstream.products[0]["PRDLST_REPORT_NO"]
+    row = {**dataset_rows(1)[0], "itemMnftrRptNo": report_no, "nat": "321"}
+    NutritionImportJob(repo).run(str(write_csv(tmp_path / "nutri.csv", [row])))
+
+    dto = repo.get_raw_data(barcode)
+
+    assert dto.sodium_mg == "321"
+    assert upstream.calls.get("NUTRI", 0) == 0
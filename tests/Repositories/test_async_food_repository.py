@@ -0,0 +1,188 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from fastapi import HTTPException
+
+from tests.conftest import StubAdditiveService
+
+pytest.importorskip("httpx")
+fakeredis = pytest.importorskip("fakeredis")
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+@pytest.fixture
+def redis_server():
+    """동기 / 비동기 fakeredis가 같은 데이터를 보도록 서버 하나를 공유"""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def sync_redis(redis_server):
+    return fakeredis.FakeRedis(server=redis_server, decode_responses=True)
+
+
+@pytest.fixture
+def run_async(upstream, session_factory, async_session_factory, redis_server, sync_redis):
+    """
+    AsyncFoodRepository를 만들어 테스트 코루틴을 새 이벤트 루프에서 실행
+    (FakeAsyncRedis / httpx 클라이언트는 루프에 묶이므로 루프 안에서 만들고 끝나면 닫음)
+    """
+    import http_client
+    from cache import LocalTTLCache
+    from repositories.async_food_repository import AsyncFoodRepository
+    from services.score_service import ScoreService
+
+    def run(test_fn):
+        async def main():
+            repo = AsyncFoodRepository(
+                additive_service=StubAdditiveService(), score_service=ScoreService(),
+                redis=fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True),
+                sync_redis=sync_redis
+            )
+            repo.session_factory = async_session_factory
+            repo.sync_session_factory = session_factory
+            repo.local_cache = LocalTTLCache(maxsize=100, ttl=60)
+            repo.analysis_local_cache = LocalTTLCache(maxsize=100, ttl=60)
+            upstream.point(repo)
+            try:
+                return await test_fn(repo)
+            finally:
+                await http_client.close_async_http_client()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def wait_for_image(session_factory, barcode: str, timeout: float = 3.0):
+    from models.models import Food
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        db = session_factory()
+        try:
+            food = db.query(Food).filter(Food.barcode == barcode).first()
+            if food is not None and food.image_url:
+                return food.image_url
+        finally:
+            db.close()
+        time.sleep(0.05)
+    return None
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_async_cold_miss_saves_and_caches(run_async, upstream, session_factory, sync_redis):
+    """
+    [성공 케이스]
+    콜드 미스는 외부 API로 DTO를 만들어 DB/Redis에 저장하고,
+    두 번째 조회는 외부 API를 부르지 않으며, 이미지는 백그라운드(동기 리포지토리)에서 채워지는지 테스트합니다.
+    """
+    async def scenario(repo):
+        dto = await repo.get_raw_data("8801234567890")
+        repo.local_cache.clear()
+        again = await repo.get_raw_data("8801234567890")
+        from_db = await repo._get_from_db("8801234567890")
+        return dto, again, from_db
+
+    dto, again, from_db = run_async(scenario)
+
+    assert dto.packaging_material == "PET"
+    assert dto.additives_cnt == 1
+    assert again.barcode == dto.barcode
+    assert from_db.raw_materials == "정제수, 설탕, 구연산"
+    assert upstream.calls["C005"] == 1
+    assert wait_for_image(session_factory, "8801234567890") == "http://img.test/19780001001123.jpg"
+    # 이미지 저장 후 무효화 -> 다음 조회는 이미지 포함 값으로 다시 캐싱
+    assert sync_redis.get("product:8801234567890") is None
+
+
+def test_async_unknown_barcode_is_negative_cached(run_async, upstream, sync_redis):
+    """
+    [실패 케이스]
+    C005에 없는 바코드는 404가 나고, 다시 조회해도 외부 API를 부르지 않는지 테스트합니다.
+    (네거티브 캐시 키는 동기 경로와 같음)
+    """
+    async def scenario(repo):
+        errors = []
+        for _ in range(2):
+            try:
+                await repo.get_raw_data("0000000000000")
+            except HTTPException as he:
+                errors.append(he.status_code)
+        return errors
+
+    assert run_async(scenario) == [404, 404]
+    assert upstream.calls["C005"] == 1
+    assert sync_redis.get("product:miss:0000000000000") is not None
+
+
+def test_async_concurrent_requests_share_one_fetch(run_async, upstream):
+    """
+    [single-flight]
+    같은 바코드 동시 요청 20개가 외부 API 조회 1번으로 합쳐지는지 테스트합니다.
+    """
+    upstream.delays = {"C005": 0.2}
+
+    async def scenario(repo):
+        return await asyncio.gather(*[repo.get_raw_data("8801234567890") for _ in range(20)])
+
+    results = run_async(scenario)
+
+    assert len({dto.barcode for dto in results}) == 1
+    assert upstream.calls["C005"] == 1
+
+
+def test_sync_and_async_requests_share_one_fetch(run_async, repo, upstream):
+    """
+    [single-flight - 동기/비동기 혼합]
+    동기 경로가 조회 중인 바코드를 비동기 경로가 요청하면 같은 조회 결과를 기다리는지 테스트합니다.
+    """
+    upstream.delays = {"C005": 0.3}
+    sync_result = {}
+    worker = threading.Thread(target=lambda: sync_result.update(dto=repo.get_raw_data("8801234567890")))
+    worker.start()
+
+    async def scenario(async_repo):
+        await asyncio.sleep(0.1)
+        return await async_repo.get_raw_data("8801234567890")
+
+    dto = run_async(scenario)
+    worker.join()
+
+    assert dto.barcode == sync_result["dto"].barcode
+    assert upstream.calls["C005"] == 1
+
+
+def test_async_provisional_result_is_not_saved_or_cached(run_async, upstream, session_factory, sync_redis, monkeypatch):
+    """
+    [시간 예산]
+    예산 안에 못 채운 결과는 provisional로 응답하고, DB / 분석 캐시에는 넣지 않는지 테스트합니다.
+    """
+    import deadline
+    from services.food_analysis_service import AsyncFoodAnalysisService
+    from services.score_service import ScoreService
+
+    monkeypatch.setattr(deadline, "ANALYSIS_DEADLINE_SEC", 0.4)
+    upstream.delays = {"NUTRI": 1.0}
+
+    async def scenario(repo):
+        service = AsyncFoodAnalysisService(repo=repo, calculator=ScoreService())
+        return await service.get_analysis_scores_json("8801234567890")
+
+    payload = run_async(scenario)
+
+    assert json.loads(payload)["provisional"] == ["nutrition"]
+    assert sync_redis.get("analysis:v1:8801234567890") is None
+    assert sync_redis.get("product:fresh:8801234567890") is None
+    from models.models import Food
+    db = session_factory()
+    try:
+        assert db.query(Food).count() == 0
+    finally:
+        db.close()
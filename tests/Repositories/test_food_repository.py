@@ -0,0 +1,691 @@
+import time
+import threading
+import pytest
+from fastapi import HTTPException
+
+from repositories.food_repository import PROVISIONAL_CACHE_TTL_SEC, ProductLookupError
+from models.dtos import RawProductAPIDTO
+
+# (upstream / repo 픽스처는 tests/conftest.py)
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_fetch_full_data_sequence_builds_dto(repo):
+    """
+    [성공 케이스]
+    5개 API 응답을 합쳐서 RawProductAPIDTO 하나로 조립하는지 테스트합니다.
+    """
+    dto = repo._fetch_full_data_sequence("8801234567890")
+
+    assert isinstance(dto, RawProductAPIDTO)
+    assert dto.report_no == "19780001001123"
+    assert dto.packaging_material == "PET"
+    assert dto.sugar_g == "25"
+    assert dto.category_code == "0101"
+    assert dto.additives_cnt == 1
+    assert dto.image_url is None  # 이미지는 저장 후 백그라운드에서 채움
+
+
+def test_follow_up_calls_run_concurrently(repo, upstream):
+    """
+    [성능 케이스]
+    C005 이후 3개 API가 동시에 호출되어
+    전체 시간이 (C005 + 가장 느린 API 하나) 근처인지 테스트합니다.
+    """
+    upstream.delays = {"C005": 0.1, "I1250": 0.3, "C002": 0.3, "NUTRI": 0.3, "IMG": 0.3}
+
+    started = time.perf_counter()
+    repo._fetch_full_data_sequence("8801234567890")
+    elapsed = time.perf_counter() - started
+
+    # 순차 호출이면 1.3초 이상 걸림
+    assert elapsed < 0.9
+
+
+def test_unknown_barcode_raises_404_from_c005(repo, upstream):
+    """
+    [실패 케이스]
+    C005에 없는 바코드는 후속 API를 부르지 않고 404를 발생하는지 테스트합니다.
+    """
+    with pytest.raises(HTTPException) as exc_info:
+        repo._fetch_full_data_sequence("0000000000000")
+
+    assert exc_info.value.status_code == 404
+    assert "C005" in exc_info.value.detail
+    assert "I1250" not in upstream.calls
+
+
+def test_missing_api_keys_is_503_and_nothing_is_cached(repo, upstream, fake_redis):
+    """
+    [설정 오류]
+    외부 API 키가 없으면 500(None DTO) 대신 503을 내고,
+    외부 API 호출 / 캐시 / 네거티브 캐시 / 이미지 보강 없이 끝나는지 테스트합니다.
+    """
+    repo.data_go_kr_key = None
+
+    with pytest.raises(HTTPException) as exc_info:
+        repo.get_raw_data("8801234567890")
+
+    assert exc_info.value.status_code == 503
+    assert upstream.calls == {}
+    assert repo.local_cache.get("8801234567890") is None
+    assert fake_redis.keys("product:*") == []
+
+
+def test_step_errors_keep_sequential_priority(repo, monkeypatch):
+    """
+    [예외 케이스]
+    C002가 먼저 실패하더라도, I1250도 실패했다면
+    기존 순차 호출처럼 I1250 단계의 에러가 나가는지 테스트합니다.
+    """
+    def slow_i1250(report_no, deadline=None):
+        time.sleep(0.2)
+        raise HTTPException(status_code=422, detail="Essential Data Missing: Packaging Material is empty")
+
+    def fast_c002(report_no, deadline=None):
+        raise HTTPException(status_code=404, detail="Product not found in External API (C002)")
+
+    monkeypatch.setattr(repo, "_fetch_i1250", slow_i1250)
+    monkeypatch.setattr(repo, "_fetch_c002", fast_c002)
+
+    with pytest.raises(HTTPException) as exc_info:
+        repo._fetch_full_data_sequence("8801234567890")
+
+    assert exc_info.value.status_code == 422
+
+
+def test_concurrent_misses_fetch_once(repo, upstream):
+    """
+    [single-flight]
+    같은 바코드로 동시에 10개 요청이 와도 외부 API는 한 번만 호출되고
+    모든 요청이 같은 결과를 받는지 테스트합니다.
+    """
+    upstream.delays = {"C005": 0.2}
+    results, errors = [], []
+
+    def scan():
+        try:
+            results.append(repo._fetch_single_flight("8801234567890"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=scan) for _ in range(10)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    assert not errors
+    assert len(results) == 10
+    assert {r.report_no for r in results} == {"19780001001123"}
+    assert upstream.calls["C005"] == 1
+
+
+def test_waiters_receive_leader_error(repo, upstream):
+    """
+    [single-flight 실패]
+    리더 조회가 404로 끝나면 기다리던 요청들도 같은 404를 받는지 테스트합니다.
+    """
+    upstream.delays = {"C005": 0.2}
+    status_codes = []
+
+    def scan():
+        try:
+            repo._fetch_single_flight("0000000000000")
+        except HTTPException as e:
+            status_codes.append(e.status_code)
+
+    threads = [threading.Thread(target=scan) for _ in range(5)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    assert status_codes == [404] * 5
+    assert upstream.calls["C005"] == 1
+
+
+def test_other_worker_result_is_reused_after_lock(repo, upstream, fake_redis):
+    """
+    [워커 간 락]
+    다른 워커가 락을 잡고 있다가 결과를 캐시에 넣고 풀면,
+    이 워커는 외부 API를 다시 부르지 않고 캐시 결과를 쓰는지 테스트합니다.
+    """
+    other_worker = fake_redis.lock("lock:product:8801234567890", timeout=5, thread_local=False)
+    assert other_worker.acquire(blocking=False)
+
+    def finish_other_worker():
+        time.sleep(0.3)
+        dto = RawProductAPIDTO(barcode="8801234567890", name="다른 워커 결과",
+                               report_no="R-1", category_code=None, brand=None)
+        fake_redis.set("product:8801234567890", dto.model_dump_json())
+        other_worker.release()
+
+    threading.Thread(target=finish_other_worker).start()
+    dto = repo._fetch_single_flight("8801234567890")
+
+    assert dto.name == "다른 워커 결과"
+    assert "C005" not in upstream.calls
+
+
+def test_unknown_barcode_is_negative_cached(repo, upstream):
+    """
+    [네거티브 캐시]
+    외부 API에서 404로 끝난 바코드는 두 번째 조회부터
+    외부 API를 부르지 않고 같은 404(실패 단계 포함)를 바로 발생하는지 테스트합니다.
+    """
+    for _ in range(3):
+        with pytest.raises(ProductLookupError) as exc_info:
+            repo.get_raw_data("0000000000000")
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.step == "C005"
+
+    assert upstream.calls["C005"] == 1
+
+
+def test_transient_upstream_error_is_not_negative_cached(repo, fake_redis, monkeypatch):
+    """
+    [네거티브 캐시 예외]
+    타임아웃 같은 일시적 장애(일반 HTTPException)는 캐시하지 않는지 테스트합니다.
+    """
+    def broken_c005(barcode, deadline=None):
+        raise HTTPException(status_code=404, detail="Product not found (C005 Error)")
+
+    monkeypatch.setattr(repo, "_fetch_c005", broken_c005)
+
+    with pytest.raises(HTTPException):
+        repo.get_raw_data("8801234567890")
+
+    assert fake_redis.get("product:miss:8801234567890") is None
+
+
+def test_purge_negative_cache(repo, upstream):
+    """
+    [네거티브 캐시 삭제]
+    삭제 후에는 다시 외부 API로 조회하는지 테스트합니다.
+    """
+    for barcode in ("0000000000001", "0000000000002"):
+        with pytest.raises(ProductLookupError):
+            repo.get_raw_data(barcode)
+
+    assert repo.purge_negative_cache("0000000000001") == 1
+    assert repo.purge_negative_cache() == 1
+
+    with pytest.raises(ProductLookupError):
+        repo.get_raw_data("0000000000001")
+    assert upstream.calls["C005"] == 3
+
+
+def test_hot_product_is_served_from_local_cache(repo, fake_redis):
+    """
+    [2단 캐시]
+    한 번 조회된 제품은 Redis 없이 워커 내부 캐시에서 바로 나오는지 테스트합니다.
+    """
+    first = repo.get_raw_data("8801234567890")
+    fake_redis.flushall()  # Redis가 비어도
+
+    second = repo.get_raw_data("8801234567890")
+
+    assert second is first
+    assert repo.local_cache.stats()["hits"] >= 1
+
+
+def test_invalidate_product_clears_both_tiers(repo, fake_redis):
+    """
+    [무효화]
+    invalidate_product 후에는 워커 내부 캐시와 Redis 모두 비는지 테스트합니다.
+    """
+    repo.get_raw_data("8801234567890")
+    repo.invalidate_product("8801234567890")
+
+    assert repo.local_cache.get("8801234567890") is None
+    assert fake_redis.get("product:8801234567890") is None
+
+
+def test_stale_entry_is_served_and_refreshed_once(repo, upstream, fake_redis):
+    """
+    [stale-while-revalidate]
+    soft TTL이 지난 캐시는 기다림 없이 그대로 반환하고,
+    여러 번 조회해도 백그라운드 새로고침은 한 번만 도는지 테스트합니다.
+    """
+    stale = RawProductAPIDTO(barcode="8801234567890", name="예전 이름",
+                             report_no="19780001001123", category_code=None, brand=None)
+    fake_redis.set("product:8801234567890", stale.model_dump_json())  # fresh 표시 없음
+    upstream.delays = {"C005": 0.3}
+
+    started = time.perf_counter()
+    results = [repo.get_raw_data("8801234567890") for _ in range(5)]
+    elapsed = time.perf_counter() - started
+
+    assert {r.name for r in results} == {"예전 이름"}
+    assert elapsed < 0.3
+
+    # 백그라운드 새로고침이 끝나면 새 데이터 + fresh 표시가 생김
+    for _ in range(50):
+        if fake_redis.get("product:fresh:8801234567890"):
+            break
+        time.sleep(0.05)
+    assert fake_redis.get("product:fresh:8801234567890") == "1"
+    assert repo.get_raw_data("8801234567890").name == "테스트 음료"
+    assert upstream.calls["C005"] == 1
+
+
+def open_breaker(step: str):
+    import circuit_breaker
+
+    breaker = circuit_breaker.get_breaker(step)
+    for _ in range(breaker.min_calls):
+        breaker.record_failure()
+    assert breaker.state == circuit_breaker.OPEN
+    return breaker
+
+
+def test_upstream_5xx_opens_c005_breaker(repo, upstream, monkeypatch):
+    """
+    [서킷 브레이커]
+    C005가 계속 503이면 브레이커가 열리고, 그 뒤 요청은 외부 API 호출 없이 바로 503 + Retry-After가 나가는지 테스트합니다.
+    """
+    import circuit_breaker
+    import http_client
+
+    monkeypatch.setattr(http_client, "UPSTREAM_HTTP_RETRIES", 0)
+    breaker = circuit_breaker.get_breaker("C005")
+    upstream.failures = {"C005": 100}
+
+    for _ in range(breaker.min_calls):
+        with pytest.raises(HTTPException):
+            repo._fetch_full_data_sequence("8801234567890")
+    calls_before = upstream.calls["C005"]
+
+    with pytest.raises(HTTPException) as exc_info:
+        repo.get_raw_data("8801234567890")
+
+    assert exc_info.value.status_code == 503
+    assert int(exc_info.value.headers["Retry-After"]) >= 1
+    assert upstream.calls["C005"] == calls_before
+    # 일시 장애는 네거티브 캐시에 남지 않음
+    assert repo.redis.get("product:miss:8801234567890") is None
+
+
+def test_db_row_is_served_while_c005_breaker_is_open(repo, upstream):
+    """
+    [장애 모드]
+    C005 브레이커가 열려 있어도 DB에 있는 제품은 그대로 응답하는지 테스트합니다.
+    """
+    dto = repo._fetch_full_data_sequence("8801234567890")
+    repo._save_to_db_split(dto)
+    open_breaker("C005")
+
+    served = repo.get_raw_data("8801234567890")
+
+    assert served.barcode == "8801234567890"
+    assert upstream.calls["C005"] == 1
+
+
+def test_open_breaker_step_is_provisional_and_not_saved(repo, upstream, db_session):
+    """
+    [장애 모드]
+    C002 브레이커가 열려 있으면 C002를 부르지 않고 기본값 + provisional로 응답하며,
+    장애 중에 만든 기본값(첨가물 0개)이 DB / 긴 TTL 캐시에 저장되지 않는지 테스트합니다.
+    """
+    from models.models import Food
+
+    open_breaker("C002")
+
+    dto = repo.get_raw_data("8801234567890")
+
+    assert dto.provisional == ["additives"]
+    assert dto.additives_cnt == 0
+    assert "C002" not in upstream.calls
+    assert db_session.query(Food).filter(Food.barcode == "8801234567890").first() is None
+    assert repo.redis.ttl("product:8801234567890") <= PROVISIONAL_CACHE_TTL_SEC
+    assert repo.redis.get("product:fresh:8801234567890") is None
+    assert repo.local_cache.get("8801234567890") is None
+
+
+def wait_for(condition, timeout: float = 3.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_cold_miss_does_not_wait_for_image(repo, upstream, db_session):
+    """
+    [이미지 백그라운드 보강]
+    느린 이미지 API를 기다리지 않고 응답한 뒤, 백그라운드에서 Food.image_url을 채우고
+    제품 캐시를 지워서 다음 조회부터 이미지가 나가는지 테스트합니다.
+    """
+    from models.models import Food
+
+    upstream.delays = {"IMG": 1.0}
+
+    started = time.perf_counter()
+    dto = repo.get_raw_data("8801234567890")
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.8
+    assert dto.image_url is None
+    assert repo.get_image_status("8801234567890")["status"] == "pending"
+
+    assert wait_for(lambda: repo.redis.get("image:status:8801234567890") is None)
+    db_session.expire_all()
+    food = db_session.query(Food).filter(Food.barcode == "8801234567890").first()
+    assert food.image_url == "http://img.test/19780001001123.jpg"
+    assert repo.redis.get("product:8801234567890") is None
+    assert repo.get_image_status("8801234567890") == {
+        "barcode": "8801234567890", "status": "ready", "image_url": "http://img.test/19780001001123.jpg"
+    }
+
+
+def test_image_status_requeues_lost_enrichment(repo, upstream):
+    """
+    [이미지 상태]
+    이미지가 없는데 진행 중인 조회도 없으면(워커 재시작 등) 상태 조회 때 다시 큐에 넣는지 테스트합니다.
+    """
+    dto = repo._fetch_full_data_sequence("8801234567890")
+    repo._save_to_db_split(dto)
+
+    assert repo.get_image_status("8801234567890")["status"] == "pending"
+    assert wait_for(lambda: repo.get_image_status("8801234567890")["status"] == "ready")
+    assert upstream.calls["IMG"] == 1
+
+
+def test_image_status_for_unknown_product_is_404(repo):
+    """
+    [이미지 상태]
+    DB에 없는 제품은 404를 반환하는지 테스트합니다.
+    """
+    with pytest.raises(HTTPException) as exc_info:
+        repo.get_image_status("0000000000000")
+
+    assert exc_info.value.status_code == 404
+
+
+def test_slow_step_is_provisional_and_not_saved(repo, upstream, db_session):
+    """
+    [시간 예산]
+    느린 단계(영양성분 1초)는 남은 예산만큼만 기다리고 기본값 + provisional로 응답하며,
+    이 결과는 DB가 아니라 Redis에만 잠깐 저장되는지 테스트합니다.
+    """
+    import circuit_breaker
+    from deadline import Deadline
+    from models.models import Food
+
+    upstream.delays = {"NUTRI": 1.0}
+
+    started = time.perf_counter()
+    dto = repo.get_raw_data("8801234567890", Deadline(0.4))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.9
+    assert dto.provisional == ["nutrition"]
+    assert dto.packaging_material == "PET"
+    assert db_session.query(Food).filter(Food.barcode == "8801234567890").first() is None
+    assert repo.redis.get("product:8801234567890") is not None
+    assert repo.redis.get("product:fresh:8801234567890") is None
+    # 예산 때문에 끊은 타임아웃은 외부 API 장애로 세지 않음
+    assert circuit_breaker.get_breaker("NUTRI").snapshot()["failures"] == 0
+
+
+def test_c005_past_deadline_returns_504(repo, upstream):
+    """
+    [시간 예산]
+    C005도 끝내지 못하면 보고번호가 없으므로 504가 나가고 네거티브 캐시에는 남지 않는지 테스트합니다.
+    """
+    from deadline import Deadline
+
+    upstream.delays = {"C005": 0.5}
+
+    with pytest.raises(HTTPException) as exc_info:
+        repo.get_raw_data("8801234567890", Deadline(0.2))
+
+    assert exc_info.value.status_code == 504
+    assert repo.redis.get("product:miss:8801234567890") is None
+
+
+def test_provisional_result_is_filled_in_by_refresh(repo, upstream):
+    """
+    [나중에 채우기]
+    provisional 결과가 캐시에서 다시 조회되면 뒤에서 예산 없이 다시 가져와 전부 채워지는지 테스트합니다.
+    """
+    from deadline import Deadline
+
+    upstream.delays = {"NUTRI": 1.0}
+    repo.get_raw_data("8801234567890", Deadline(0.4))
+    upstream.delays = {}
+
+    served = repo.get_raw_data("8801234567890")
+    assert served.provisional == ["nutrition"]
+
+    assert wait_for(lambda: repo.redis.get("product:fresh:8801234567890"))
+    filled = repo.get_raw_data("8801234567890")
+    assert filled.provisional == []
+    assert filled.sugar_g == "25"
+
+
+def test_c005_daily_quota_exhausted_returns_503(repo, upstream, monkeypatch):
+    """
+    [호출량 한도]
+    C005 일일 한도를 다 쓰면 외부 API를 부르지 않고 바로 503 + Retry-After(KST 자정까지)가 나가는지 테스트합니다.
+    """
+    import rate_limiter
+
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setitem(rate_limiter._policies, "C005", rate_limiter.RateLimitPolicy(100, 100, 1))
+
+    repo.get_raw_data("8801234567890")
+    with pytest.raises(HTTPException) as exc_info:
+        repo.get_raw_data("8809999999999")
+
+    assert exc_info.value.status_code == 503
+    assert int(exc_info.value.headers["Retry-After"]) >= 1
+    assert upstream.calls["C005"] == 1
+    assert repo.redis.get("product:miss:8809999999999") is None
+
+
+def test_each_retry_takes_its_own_token(repo, upstream, monkeypatch):
+    """
+    [호출량 한도]
+    일시적인 503 뒤 재시도도 외부 API 호출 1회로 세서 토큰을 하나씩 더 쓰는지,
+    재시도에서 한도를 넘으면 외부 API 장애가 아니라 한도 초과(503 + Retry-After)로 끝나는지 테스트합니다.
+    """
+    import circuit_breaker
+    import http_client
+    import rate_limiter
+
+    monkeypatch.setattr(http_client, "UPSTREAM_HTTP_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setitem(rate_limiter._policies, "C005", rate_limiter.RateLimitPolicy(100, 100, 2))
+    upstream.failures = {"C005": 1}
+
+    repo.get_raw_data("8801234567890")
+    assert upstream.calls["C005"] == 2
+    assert rate_limiter.stats.snapshot()["C005"][rate_limiter.INTERACTIVE]["allowed"] == 2
+
+    # 일일 한도 2개를 다 씀 -> 재시도가 필요한 다음 조회는 첫 요청부터 한도 초과
+    upstream.failures = {"C005": 1}
+    with pytest.raises(HTTPException) as exc_info:
+        repo.get_raw_data("8809999999999")
+    assert exc_info.value.status_code == 503
+    assert upstream.calls["C005"] == 2
+    assert circuit_breaker.get_breaker("C005").snapshot()["failures"] == 0
+
+
+def test_follow_up_step_over_quota_is_provisional(repo, upstream, monkeypatch):
+    """
+    [호출량 한도]
+    후속 단계(영양성분)가 한도에 걸리면 기다리지 않고 provisional로 응답하는지 테스트합니다.
+    """
+    import rate_limiter
+
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setitem(rate_limiter._policies, "NUTRI", rate_limiter.RateLimitPolicy(0.1, 1, 0))
+    rate_limiter.acquire(repo.redis, "NUTRI", repo._api_key("NUTRI"))  # 버킷을 비워둠
+
+    dto = repo.get_raw_data("8801234567890")
+
+    assert dto.provisional == ["nutrition"]
+    assert upstream.calls.get("NUTRI", 0) == 0
+
+
+def test_cold_misses_over_bulkhead_limit_fail_fast(repo, upstream, session_factory, monkeypatch):
+    """
+    [bulkhead]
+    외부 API 콜드 조회 자리가 다 차면 다음 콜드 미스는 기다리지 않고 503 + Retry-After를 받고,
+    DB에 있는 제품은 그 사이에도 바로 응답하는지 테스트합니다.
+    """
+    import bulkhead
+    from tests.stub_upstream import sample_product
+
+    monkeypatch.setattr(bulkhead.upstream_bulkhead, "limit", 1)
+    monkeypatch.setattr(bulkhead.upstream_bulkhead, "max_wait", 0)
+    upstream.products += [sample_product("8800000000201", "R201"), sample_product("8800000000202", "R202")]
+    hot = repo._fetch_full_data_sequence("8801234567890")
+    repo._save_to_db_split(hot)
+    upstream.delays = {"C005": 0.5}
+
+    other = repo._sibling(session_factory())
+    slow = threading.Thread(target=other.get_raw_data, args=("8800000000201",))
+    slow.start()
+    assert wait_for(lambda: bulkhead.upstream_bulkhead.active == 1)
+
+    started = time.perf_counter()
+    with pytest.raises(HTTPException) as exc_info:
+        repo.get_raw_data("8800000000202")
+    served = repo.get_raw_data("8801234567890")
+    elapsed = time.perf_counter() - started
+    slow.join()
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == str(bulkhead.upstream_bulkhead.retry_after)
+    assert served.barcode == "8801234567890"
+    assert elapsed < 0.2
+    assert bulkhead.upstream_bulkhead.snapshot()["rejected"] == 1
+    assert repo.redis.get("product:miss:8800000000202") is None
+
+
+def test_batch_leaves_upstream_slots_for_single_lookups(repo, upstream, monkeypatch):
+    """
+    [bulkhead - 배치]
+    배치 분석의 콜드 조회는 upstream 상한의 절반까지만 써서,
+    배치가 도는 중에도 단건 콜드 미스는 503 없이 upstream 자리를 얻는지 테스트합니다.
+    """
+    import bulkhead
+    from tests.stub_upstream import sample_product
+
+    monkeypatch.setattr(bulkhead.upstream_bulkhead, "limit", 2)
+    monkeypatch.setattr(bulkhead.upstream_bulkhead, "max_wait", 0)
+    monkeypatch.setattr(bulkhead.batch_bulkhead, "limit", bulkhead.batch_limit(8, 2))
+    batch = [f"88000000003{i:02d}" for i in range(4)]
+    upstream.products += [sample_product(b, f"R{b}") for b in batch + ["8800000000399"]]
+    upstream.delays = {"C005": 0.3}
+
+    results = {}
+    runner = threading.Thread(target=lambda: results.update(repo.get_raw_data_batch(batch)))
+    runner.start()
+    assert wait_for(lambda: bulkhead.batch_bulkhead.active == 1)
+
+    single = repo._sibling(repo.session_factory()).get_raw_data("8800000000399")
+    runner.join()
+
+    assert single.barcode == "8800000000399"
+    assert all(not isinstance(r, HTTPException) for r in results.values())
+    assert bulkhead.batch_bulkhead.snapshot()["peak"] == 1
+    assert bulkhead.upstream_bulkhead.snapshot()["rejected"] == 0
+
+
+def test_cold_fetch_releases_db_connection(repo, monkeypatch):
+    """
+    [bulkhead]
+    외부 API를 기다리는 동안에는 요청 세션이 DB 연결(트랜잭션)을 잡고 있지 않은지 테스트합니다.
+    """
+    seen = {}
+
+    def fake_single_flight(barcode, deadline=None):
+        seen["in_transaction"] = repo.db.in_transaction()
+        raise HTTPException(status_code=404, detail="stub")
+
+    monkeypatch.setattr(repo, "_fetch_single_flight", fake_single_flight)
+
+    with pytest.raises(HTTPException):
+        repo.get_raw_data("8800000000299")
+
+    assert seen["in_transaction"] is False
+
+
+def test_slow_upstream_call_holds_no_db_connection(repo, session_factory, monkeypatch):
+    """
+    [bulkhead]
+    느린 외부 API 호출 중에는 (락 뒤 재확인 / 영양성분 표 조회를 거친 뒤에도)
+    DB 연결 풀에서 빌려간 연결이 하나도 없는지 테스트합니다.
+    """
+    import repositories.food_repository as food_repository
+    from models.models import Food
+
+    pool = session_factory.kw["bind"].pool
+    checked_out = []
+    real_http_get = food_repository.http_get
+
+    def slow_http_get(*args, **kwargs):
+        checked_out.append(pool.checkedout())
+        time.sleep(0.05)
+        return real_http_get(*args, **kwargs)
+
+    monkeypatch.setattr(food_repository, "http_get", slow_http_get)
+    repo.db.query(Food).count()  # 요청 세션이 먼저 연결을 잡은 상태에서 시작
+
+    dto = repo.get_raw_data("8801234567890")
+    seen = list(checked_out)  # 응답 뒤 백그라운드 이미지 조회는 제외
+
+    assert dto.barcode == "8801234567890"
+    assert len(seen) >= 4
+    assert set(seen) == {0}
+
+
+def test_save_split_is_idempotent_upsert(repo, db_session):
+    """
+    [upsert 저장]
+    같은 제품을 두 번 저장해도 에러/중복 행 없이 마지막 값으로 갱신되고,
+    백그라운드로 채운 image_url은 비어 있는 새 값으로 지워지지 않는지 테스트합니다.
+    """
+    from models.models import Food, NutritionFact, RecyclingInfo, Ingredient
+
+    dto = repo._fetch_full_data_sequence("8801234567890")
+    repo._save_to_db_split(dto)
+    db_session.query(Food).filter(Food.barcode == dto.barcode).update({"image_url": "http://img.test/x.jpg"})
+    db_session.commit()
+
+    repo._save_to_db_split(dto.model_copy(update={"name": "새 이름", "packaging_material": "유리"}))
+    db_session.expire_all()
+
+    food = db_session.query(Food).filter(Food.barcode == dto.barcode).one()
+    assert food.name == "새 이름"
+    assert food.image_url == "http://img.test/x.jpg"
+    assert db_session.query(RecyclingInfo).filter(RecyclingInfo.barcode == dto.barcode).one().material == "유리"
+    assert db_session.query(NutritionFact).filter(NutritionFact.barcode == dto.barcode).count() == 1
+    assert db_session.query(Ingredient).filter(Ingredient.barcode == dto.barcode).count() == 1
+
+
+def test_save_split_uses_one_statement_per_table(repo, db_session):
+    """
+    [upsert 저장]
+    제품 1개 저장이 테이블당 1번(+ 원재료 삭제 1번)의 왕복으로 끝나는지 테스트합니다.
+    """
+    from sqlalchemy import event
+
+    dto = repo._fetch_full_data_sequence("8801234567890")
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("INSERT", "DELETE", "UPDATE")):
+            statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        repo._save_to_db_split(dto)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert len(statements) == 5
@@ -0,0 +1,170 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from models.models import Food, ScanHistory, User
+from repositories.history_repository import HistoryRepository
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+@pytest.fixture
+def run_repo(db_session, async_session_factory):
+    """
+    유저 2명 + 제품 1개 + 스캔 기록 25개 (+ 다른 유저 기록 1개)
+    (3개씩 같은 시각 -> scanned_at이 같은 행 사이 순서는 scan_id로 정해져야 함)
+    테스트 코루틴에 AsyncSession으로 만든 HistoryRepository를 넘겨 새 이벤트 루프에서 실행
+    """
+    db_session.add(User(user_id=1, login_id="tester", password_hash="x"))
+    db_session.add(User(user_id=2, login_id="other", password_hash="x"))
+    db_session.add(Food(food_id=1, barcode="8801234567890", name="테스트 음료"))
+    base = datetime(2024, 1, 1)
+    for i in range(25):
+        db_session.add(ScanHistory(scan_id=i + 1, user_id=1, food_id=1, score_total=50, grade="B",
+                                   scanned_at=base + timedelta(hours=i // 3)))
+    db_session.add(ScanHistory(scan_id=100, user_id=2, food_id=1, score_total=50, grade="B", scanned_at=base))
+    db_session.commit()
+
+    def run(test_fn):
+        async def main():
+            async with async_session_factory() as db:
+                return await test_fn(HistoryRepository(db=db))
+
+        return asyncio.run(main())
+
+    return run
+
+
+async def walk_pages(repo, limit: int):
+    pages, cursor = [], None
+    while True:
+        page = await repo.get_user_scan_history_page(1, cursor=cursor, limit=limit)
+        pages.append([item.scan_id for item in page.items])
+        if page.next_cursor is None:
+            return pages
+        cursor = page.next_cursor
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_cursor_pages_match_offset_order(run_repo):
+    """
+    [커서 페이지]
+    커서로 끝까지 넘긴 결과가 offset 목록과 같은 순서(최신순, 같은 시각은 scan_id 역순)이고,
+    빠지거나 겹치는 행이 없으며, 마지막 페이지에서 next_cursor가 None인지 테스트합니다.
+    """
+    async def scenario(repo):
+        listed = await repo.get_user_scan_history(1, skip=0, limit=100)
+        return await walk_pages(repo, limit=10), [item.scan_id for item in listed]
+
+    pages, offset_ids = run_repo(scenario)
+
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert sum(pages, []) == offset_ids
+    assert offset_ids == list(range(25, 0, -1))
+
+
+def test_cursor_is_stable_when_new_scans_arrive(run_repo, db_session):
+    """
+    [커서 페이지]
+    첫 페이지를 받은 뒤 새 스캔이 저장돼도 다음 페이지가 밀리지 않는지 테스트합니다.
+    (offset은 새 행만큼 앞 페이지 행이 다시 나옴)
+    """
+    async def scenario(repo):
+        first = await repo.get_user_scan_history_page(1, limit=10)
+        db_session.add(ScanHistory(scan_id=26, user_id=1, food_id=1, score_total=50, grade="B",
+                                   scanned_at=datetime(2024, 2, 1)))
+        db_session.commit()
+        return await repo.get_user_scan_history_page(1, cursor=first.next_cursor, limit=10)
+
+    second = run_repo(scenario)
+
+    assert [item.scan_id for item in second.items] == list(range(15, 5, -1))
+
+
+def test_invalid_cursor_is_400(run_repo):
+    """
+    [실패 케이스]
+    깨진 커서는 500이 아니라 400인지 테스트합니다.
+    """
+    async def scenario(repo):
+        with pytest.raises(HTTPException) as exc_info:
+            await repo.get_user_scan_history_page(1, cursor="not-a-cursor")
+        return exc_info.value.status_code
+
+    assert run_repo(scenario) == 400
+
+
+def test_reads_do_not_load_orm_entities(run_repo):
+    """
+    [컬럼 조회]
+    목록/커서 페이지/상세 조회가 ORM 객체를 만들지 않고(세션 identity map이 비어 있음)
+    제품 이름까지 채운 DTO를 돌려주는지 테스트합니다.
+    """
+    async def scenario(repo):
+        listed = await repo.get_user_scan_history(1, limit=5)
+        page = await repo.get_user_scan_history_page(1, limit=5)
+        detail = await repo.get_scan_history_by_id(25, 1)
+        others = await repo.get_scan_history_by_id(100, 1)
+        return listed, page, detail, others, len(repo.db.sync_session.identity_map)
+
+    listed, page, detail, others, loaded = run_repo(scenario)
+
+    assert loaded == 0
+    assert listed[0].product_name == "테스트 음료"
+    assert page.items[0].scan_id == detail.scan_id == 25
+    assert others is None
+
+
+def test_create_and_get_by_id(run_repo):
+    """
+    [저장/상세]
+    바코드로 제품을 찾아 기록을 저장하고, 본인 기록만 상세 조회되는지 테스트합니다.
+    """
+    async def scenario(repo):
+        saved = await repo.create_scan_history(1, "8801234567890", 77.5, "A", 80, 70, 60, 1, 1, 1)
+        mine = await repo.get_scan_history_by_id(saved.scan_id, 1)
+        others = await repo.get_scan_history_by_id(saved.scan_id, 2)
+        return mine, others
+
+    mine, others = run_repo(scenario)
+
+    assert mine.total_score == 77.5
+    assert mine.grade == "A"
+    assert others is None
+
+
+def test_create_for_unknown_barcode_is_404(run_repo):
+    """
+    [실패 케이스]
+    없는 바코드로 기록을 저장하면 404인지 테스트합니다.
+    """
+    async def scenario(repo):
+        with pytest.raises(HTTPException) as exc_info:
+            await repo.create_scan_history(1, "0000000000000", 1, "C", 1, 1, 1, 1, 1, 1)
+        return exc_info.value.status_code
+
+    assert run_repo(scenario) == 404
+
+
+def test_delete_only_own_record(run_repo):
+    """
+    [삭제]
+    다른 사람 기록은 지워지지 않고, 본인 기록은 지워지는지 테스트합니다.
+    """
+    async def scenario(repo):
+        return (
+            await repo.delete_scan_history(1, 2),
+            await repo.delete_scan_history(1, 1),
+            await repo.get_scan_history_by_id(1, 1),
+        )
+
+    denied, deleted, after = run_repo(scenario)
+
+    assert denied is False
+    assert deleted is True
+    assert after is None
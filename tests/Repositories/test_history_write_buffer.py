@@ -0,0 +1,179 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, select
+
+from models.dtos import AdditivesDetail, AnalysisScoresDTO, NutritionDetail, PackagingDetail, UserPrioritiesDTO
+from models.models import Food, ScanHistory, User
+from repositories.history_repository import HistoryRepository
+from repositories.history_write_buffer import HistoryWriteBuffer
+from services.final_grade_calculation_service import FinalGradeCalculationService
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+@pytest.fixture
+def seeded(db_session):
+    """유저 1명 + 제품 1개"""
+    db_session.add(User(user_id=1, login_id="tester", password_hash="x"))
+    db_session.add(Food(food_id=1, barcode="8801234567890", name="테스트 음료"))
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def buffer(seeded, session_factory):
+    b = HistoryWriteBuffer(session_factory=session_factory, maxsize=100, batch_size=50)
+    yield b
+    b.close()
+
+
+def make_record(barcode: str = "8801234567890", score: float = 70.0) -> dict:
+    return dict(user_id=1, barcode=barcode, total_score=score, grade="C",
+                nutrition_score=70, packaging_score=70, additives_score=70,
+                w_nutrition=0.33, w_packaging=0.33, w_additives=0.33)
+
+
+def count_inserts(session_factory) -> list:
+    """scan_history INSERT 문 실행 횟수 기록"""
+    inserts = []
+    engine = session_factory.kw["bind"]
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, params, ctx, many:
+                 inserts.append(statement) if statement.startswith("INSERT INTO scan_history") else None)
+    return inserts
+
+
+def saved_rows(session_factory):
+    db = session_factory()
+    try:
+        return db.execute(select(ScanHistory).order_by(ScanHistory.scan_id)).scalars().all()
+    finally:
+        db.close()
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_buffered_rows_are_written_in_batches(buffer, session_factory):
+    """
+    [배치 저장]
+    큐에 넣은 기록이 close() 후 모두 저장되고, 기록 수보다 훨씬 적은 INSERT로 저장되는지 테스트합니다.
+    """
+    inserts = count_inserts(session_factory)
+    # 저장 스레드가 첫 배치를 커밋하는 동안 나머지가 쌓이도록 한 번에 넣음
+    for i in range(40):
+        assert buffer.enqueue(**make_record(score=50 + i)) is True
+
+    buffer.close()
+
+    rows = saved_rows(session_factory)
+    assert len(rows) == 40
+    assert rows[0].food_id == 1
+    assert len(inserts) < 40
+    assert buffer.stats()["written"] == 40
+
+
+def test_rows_keep_request_order(buffer, async_session_factory):
+    """
+    [정렬]
+    scanned_at이 저장 시각이 아니라 큐에 넣은 시각 순서를 따라서 /history/me 최신순이 요청 순서와 같은지 테스트합니다.
+    """
+    for i in range(5):
+        buffer.enqueue(**make_record(score=50 + i))
+    buffer.close()
+
+    async def read_history():
+        async with async_session_factory() as db:
+            return await HistoryRepository(db=db).get_user_scan_history(1)
+
+    history = asyncio.run(read_history())
+    assert [h.total_score for h in history] == [54, 53, 52, 51, 50]
+
+
+def test_unknown_barcode_is_dropped_without_losing_batch(buffer, session_factory):
+    """
+    [실패 케이스]
+    없는 바코드 기록만 빠지고 같은 배치의 다른 기록은 저장되며,
+    빠진 기록은 저장 실패(dropped)와 따로 missing_food로 세는지 테스트합니다.
+    """
+    buffer.enqueue(**make_record())
+    buffer.enqueue(**make_record(barcode="0000000000000"))
+    buffer.close()
+
+    stats = buffer.stats()
+    assert len(saved_rows(session_factory)) == 1
+    assert stats["missing_food"] == 1
+    assert stats["dropped"] == 0
+    assert stats["written"] == 1
+
+
+def test_unknown_user_is_dropped_without_losing_batch(buffer, session_factory):
+    """
+    [실패 케이스 - 유저]
+    FK 검사를 켠 DB에서도 없는 user_id 기록 하나 때문에 배치 전체가 실패하지 않고,
+    그 기록만 빠져서 missing_user로 세는지 테스트합니다.
+    """
+    engine = session_factory.kw["bind"]
+    engine.dispose()  # 새 연결부터 FK 검사를 켬
+    event.listen(engine, "connect", lambda conn, record: conn.execute("PRAGMA foreign_keys=ON"))
+
+    buffer.enqueue(**make_record())
+    buffer.enqueue(**dict(make_record(), user_id=99))
+    buffer.close()
+
+    stats = buffer.stats()
+    assert len(saved_rows(session_factory)) == 1
+    assert stats["missing_user"] == 1
+    assert stats["dropped"] == 0
+    assert stats["written"] == 1
+
+
+def test_full_queue_rejects_and_close_drains(seeded, session_factory):
+    """
+    [큐 상한 / 종료]
+    큐가 가득 차면 enqueue가 False를 돌려주고, 종료 후에도 새 기록은 받지 않으며,
+    저장 스레드가 없어도 close()가 남은 기록을 모두 저장하는지 테스트합니다.
+    """
+    buffer = HistoryWriteBuffer(session_factory=session_factory, maxsize=3, batch_size=2)
+    buffer.start = lambda: None  # 저장 스레드 없이 큐만 채움
+
+    results = [buffer.enqueue(**make_record()) for _ in range(4)]
+    buffer.close()
+
+    assert results == [True, True, True, False]
+    assert len(saved_rows(session_factory)) == 3
+    assert buffer.enqueue(**make_record()) is False
+
+
+def test_grade_service_buffers_history(seeded, session_factory, async_session_factory, buffer, monkeypatch):
+    """
+    [calculate-grade]
+    buffered 모드에서는 요청 경로에서 DB에 쓰지 않고 scan_id 없이 응답하며, 기록은 배치로 저장되는지 테스트합니다.
+    큐가 가득 차면 예전처럼 바로 저장해서 scan_id를 돌려주는지도 확인합니다.
+    """
+    import services.final_grade_calculation_service as module
+
+    monkeypatch.setattr(module, "HISTORY_WRITE_MODE", "buffered")
+    scores = AnalysisScoresDTO(
+        barcode="8801234567890", name="테스트 음료",
+        nutrition=NutritionDetail(score=80, sodium_mg=0, sugar_g=0, sat_fat_g=0, trans_fat_g=0),
+        packaging=PackagingDetail(score=70, material="PET"),
+        additives=AdditivesDetail(score=60, count=1),
+    )
+
+    async def calculate():
+        async with async_session_factory() as db:
+            service = FinalGradeCalculationService(scan_repo=HistoryRepository(db=db), write_buffer=buffer)
+            return await service.calculate_and_save(1, scores, UserPrioritiesDTO(), save_to_db=True)
+
+    result = asyncio.run(calculate())
+    assert result.scan_id is None
+    buffer.close()
+    assert len(saved_rows(session_factory)) == 1
+
+    # 종료된 큐(= 가득 찬 큐와 같은 경우)는 바로 저장
+    fallback = asyncio.run(calculate())
+    assert fallback.scan_id is not None
+    assert len(saved_rows(session_factory)) == 2
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from models.dtos import UserAuthRequest
+from repositories.user_repository import UserRepository
+from services.user_service import UserService
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+@pytest.fixture
+def run_repo(async_session_factory):
+    """AsyncSession으로 만든 UserRepository를 새 이벤트 루프에서 테스트 코루틴에 넘김"""
+    def run(test_fn):
+        async def main():
+            async with async_session_factory() as db:
+                return await test_fn(UserRepository(db=db))
+
+        return asyncio.run(main())
+
+    return run
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_create_and_find_user(run_repo):
+    """
+    [저장/조회]
+    유저를 만들고 아이디로 다시 찾을 수 있는지 테스트합니다.
+    """
+    async def scenario(repo):
+        created = await repo.create_user("tester", "hashed")
+        found = await repo.get_user_by_login_id("tester")
+        missing = await repo.get_user_by_login_id("nobody")
+        return created, found, missing
+
+    created, found, missing = run_repo(scenario)
+
+    assert found.user_id == created.user_id
+    assert found.password_hash == "hashed"
+    assert missing is None
+
+
+def test_signup_and_login(run_repo):
+    """
+    [UserService]
+    회원가입/로그인이 중복 아이디, 비밀번호 검증 규칙대로 동작하는지 테스트합니다.
+    """
+    async def scenario(repo):
+        service = UserService(repo=repo)
+        req = UserAuthRequest(login_id="tester", password="password123")
+        signed_up = await service.signup(req)
+        logged_in = await service.login(req)
+        with pytest.raises(HTTPException) as duplicate:
+            await service.signup(req)
+        with pytest.raises(HTTPException) as wrong_pw:
+            await service.login(UserAuthRequest(login_id="tester", password="wrong-password"))
+        return signed_up, logged_in, duplicate.value, wrong_pw.value
+
+    signed_up, logged_in, duplicate, wrong_pw = run_repo(scenario)
+
+    assert logged_in.user_id == signed_up.user_id
+    assert duplicate.status_code == 400
+    assert wrong_pw.status_code == 400
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from repositories.analysis_job_repository import AnalysisJobRepository
+from services.analysis_job_service import AnalysisJobService, wants_job
+from services.food_analysis_service import FoodAnalysisService
+from services.score_service import ScoreService
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+@pytest.fixture
+def job_service(repo, fake_redis):
+    return AnalysisJobService(
+        analysis=FoodAnalysisService(repo=repo, calculator=ScoreService()),
+        jobs=AnalysisJobRepository(redis=fake_redis)
+    )
+
+
+def wait_for_job(job_service, job_id: str, timeout: float = 3.0) -> dict:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        job = job_service.get_job(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def collect_events(job_service, job_id: str):
+    async def run():
+        return [chunk async for chunk in job_service.events(job_id)]
+    return asyncio.run(run())
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_cold_miss_returns_job_without_waiting(job_service, upstream, fake_redis):
+    """
+    [202 작업]
+    콜드 미스는 외부 API를 기다리지 않고 작업을 돌려주고, 작업이 끝나면 결과가 Redis에 남으며
+    다음 요청부터는 분석 결과가 바로 나가는지 테스트합니다.
+    """
+    upstream.delays = {"C005": 0.3}
+
+    started = time.perf_counter()
+    job = job_service.get_or_start("8801234567890")
+    elapsed = time.perf_counter() - started
+
+    assert isinstance(job, dict)
+    assert job["status"] == "pending"
+    assert elapsed < 0.2
+
+    done = wait_for_job(job_service, job["job_id"])
+    assert done["status"] == "done"
+    assert done["result"]["barcode"] == "8801234567890"
+    assert fake_redis.get("analysis:job:barcode:8801234567890") is None
+
+    # 작업이 넘긴 이미지 보강(IMG)이 그 사이 끝나면 image_url만 채워진 결과가 다시 계산될 수 있음
+    payload = job_service.get_or_start("8801234567890")
+    served = json.loads(payload)
+    served.pop("image_url", None)
+    done["result"].pop("image_url", None)
+    assert served == done["result"]
+
+
+def test_concurrent_cold_misses_share_one_job(job_service, upstream):
+    """
+    [202 작업]
+    같은 바코드 콜드 미스가 동시에 여러 번 와도 작업 1개, 외부 API 조회 1번인지 테스트합니다.
+    """
+    upstream.delays = {"C005": 0.3}
+    job_ids = []
+
+    def start():
+        job_ids.append(job_service.get_or_start("8801234567890")["job_id"])
+
+    threads = [threading.Thread(target=start) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(set(job_ids)) == 1
+    wait_for_job(job_service, job_ids[0])
+    assert upstream.calls["C005"] == 1
+
+
+def test_job_is_visible_from_another_worker(job_service, repo, fake_redis, upstream):
+    """
+    [Redis 작업 저장소]
+    작업을 만든 워커가 아니어도 같은 Redis만 보면 작업 상태를 응답할 수 있는지 테스트합니다.
+    """
+    job = job_service.get_or_start("8801234567890")
+    wait_for_job(job_service, job["job_id"])
+
+    other_worker = AnalysisJobRepository(redis=fake_redis)
+    assert other_worker.get(job["job_id"])["status"] == "done"
+
+
+def test_unknown_barcode_job_fails_with_404(job_service, upstream):
+    """
+    [실패]
+    외부 API에 없는 바코드는 작업이 404로 실패하고, 다음 요청은 네거티브 캐시로 바로 404가 나는지 테스트합니다.
+    """
+    job = job_service.get_or_start("0000000000000")
+    failed = wait_for_job(job_service, job["job_id"])
+
+    assert failed["status"] == "failed"
+    assert failed["error_status"] == 404
+
+    with pytest.raises(HTTPException) as exc_info:
+        job_service.get_or_start("0000000000000")
+    assert exc_info.value.status_code == 404
+
+
+def test_unknown_job_id_is_404(job_service):
+    """
+    [조회]
+    없는(만료된) 작업 id는 404인지 테스트합니다.
+    """
+    with pytest.raises(HTTPException) as exc_info:
+        job_service.get_job("missing")
+
+    assert exc_info.value.status_code == 404
+
+
+def test_events_stream_until_done(job_service, upstream):
+    """
+    [SSE]
+    이벤트 스트림이 상태가 바뀔 때마다 보내고, 마지막 done 이벤트에 분석 결과를 담은 뒤 끝나는지 테스트합니다.
+    """
+    upstream.delays = {"C005": 0.3}
+    job = job_service.get_or_start("8801234567890")
+
+    chunks = collect_events(job_service, job["job_id"])
+
+    events = [c.split("\n")[0] for c in chunks]
+    assert events[-1] == "event: done"
+    last = json.loads(chunks[-1].split("\n")[1][len("data: "):])
+    assert last["result"]["barcode"] == "8801234567890"
+
+
+def test_wants_job(monkeypatch):
+    """
+    [모드 선택]
+    서버 설정이 wait여도 요청 헤더 Prefer: respond-async면 작업 모드인지 테스트합니다.
+    """
+    import services.analysis_job_service as module
+
+    monkeypatch.setattr(module, "ANALYSIS_COLD_MISS_MODE", "wait")
+    assert wants_job(None) is False
+    assert wants_job("respond-async, wait=5") is True
+
+    monkeypatch.setattr(module, "ANALYSIS_COLD_MISS_MODE", "job")
+    assert wants_job(None) is True
@@ -0,0 +1,153 @@
+import json
+import pytest
+
+from services.food_analysis_service import FoodAnalysisService
+from services.score_service import ScoreService
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+class CountingScoreService(ScoreService):
+    """calculate_all이 몇 번 불렸는지 세는 ScoreService"""
+    def __init__(self):
+        self.calls = 0
+
+    def calculate_all(self, raw):
+        self.calls += 1
+        return super().calculate_all(raw)
+
+
+@pytest.fixture
+def calculator():
+    return CountingScoreService()
+
+
+@pytest.fixture
+def analysis_service(repo, calculator):
+    return FoodAnalysisService(repo=repo, calculator=calculator)
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_analysis_json_is_cached(analysis_service, calculator, fake_redis):
+    """
+    [분석 결과 캐시]
+    두 번째 요청부터는 점수를 다시 계산하지 않고 같은 JSON bytes를 반환하는지 테스트합니다.
+    """
+    first = analysis_service.get_analysis_scores_json("8801234567890")
+    analysis_service.repo.analysis_local_cache.clear()  # Redis 경로도 확인
+    second = analysis_service.get_analysis_scores_json("8801234567890")
+
+    assert first == second
+    assert json.loads(first)["barcode"] == "8801234567890"
+    assert calculator.calls == 1
+    assert fake_redis.get("analysis:v1:8801234567890") is not None
+
+
+def test_rewritten_product_drops_cached_analysis(analysis_service, calculator):
+    """
+    [무효화]
+    제품 캐시가 다시 써지면 계산된 분석 결과도 버려져서 다시 계산되는지 테스트합니다.
+    """
+    analysis_service.get_analysis_scores_json("8801234567890")
+    dto = analysis_service.repo.get_raw_data("8801234567890")
+    analysis_service.repo._cache_data("8801234567890", dto)
+
+    analysis_service.get_analysis_scores_json("8801234567890")
+
+    assert calculator.calls == 2
+
+
+def test_batch_analysis_mixes_hits_and_errors(analysis_service, upstream, calculator):
+    """
+    [배치 분석]
+    캐시 히트 / 신규 조회 / 없는 바코드가 섞여 있어도
+    요청 순서대로 바코드별 결과와 에러를 돌려주는지 테스트합니다.
+    """
+    from tests.stub_upstream import sample_product
+
+    upstream.products.append(sample_product("8800000000002", "20000000000002", name="두번째"))
+    analysis_service.get_analysis_scores_json("8801234567890")  # 미리 캐시
+
+    response = analysis_service.get_analysis_scores_batch(
+        ["8800000000002", "8801234567890", "0000000000000", "8800000000002"]
+    )
+
+    statuses = [(item.barcode, item.status) for item in response.results]
+    assert statuses == [
+        ("8800000000002", 200),
+        ("8801234567890", 200),
+        ("0000000000000", 404),
+        ("8800000000002", 200),
+    ]
+    assert response.results[0].result.name == "두번째"
+    assert "C005" in response.results[2].error
+    assert calculator.calls == 2
+
+
+def test_batch_analysis_reads_db_in_one_pass(analysis_service, fake_redis, upstream):
+    """
+    [배치 분석 - DB]
+    Redis가 비어 있어도 DB에 있는 제품은 외부 API 없이 IN 조회로 가져오는지 테스트합니다.
+    """
+    from tests.stub_upstream import sample_product
+
+    barcodes = [f"88000000001{i:02d}" for i in range(10)]
+    upstream.products.extend(sample_product(b, f"R{b}") for b in barcodes)
+    analysis_service.get_analysis_scores_batch(barcodes)   # API -> DB 저장
+    fake_redis.flushall()
+    analysis_service.repo.local_cache.clear()
+    analysis_service.repo.analysis_local_cache.clear()
+    # 첫 조회가 백그라운드로 넘긴 이미지 보강(IMG)은 아직 도는 중일 수 있으므로 제외하고 비교
+    def lookup_calls():
+        return {k: v for k, v in upstream.calls.items() if k != "IMG"}
+
+    calls_before = lookup_calls()
+
+    response = analysis_service.get_analysis_scores_batch(barcodes)
+
+    assert all(item.status == 200 for item in response.results)
+    assert lookup_calls() == calls_before
+
+
+def test_provisional_analysis_is_not_cached(analysis_service, upstream, fake_redis, monkeypatch):
+    """
+    [시간 예산]
+    예산이 모자라 provisional로 나간 분석 결과는 분석 캐시에 넣지 않는지 테스트합니다.
+    """
+    import deadline
+
+    monkeypatch.setattr(deadline, "ANALYSIS_DEADLINE_SEC", 0.4)
+    upstream.delays = {"NUTRI": 1.0}
+
+    payload = analysis_service.get_analysis_scores_json("8801234567890")
+
+    assert json.loads(payload)["provisional"] == ["nutrition"]
+    assert fake_redis.get("analysis:v1:8801234567890") is None
+
+
+def test_batch_provisional_analysis_is_not_cached(analysis_service, upstream, fake_redis):
+    """
+    [배치 분석 - 장애 모드]
+    배치에서도 브레이커가 열려 provisional로 나간 분석 결과는 분석 캐시에 넣지 않고,
+    같은 배치의 온전한 결과만 캐싱하는지 테스트합니다.
+    """
+    import circuit_breaker
+    from tests.stub_upstream import sample_product
+
+    upstream.products.append(sample_product("8800000000002", "20000000000002", name="두번째"))
+    analysis_service.get_analysis_scores_batch(["8800000000002"])
+    fake_redis.delete("analysis:v1:8800000000002")
+    analysis_service.repo.analysis_local_cache.clear()
+    breaker = circuit_breaker.get_breaker("C002")
+    for _ in range(breaker.min_calls):
+        breaker.record_failure()
+
+    response = analysis_service.get_analysis_scores_batch(["8801234567890", "8800000000002"])
+
+    assert response.results[0].result.provisional == ["additives"]
+    assert response.results[1].result.provisional == []
+    assert fake_redis.get("analysis:v1:8801234567890") is None
+    assert fake_redis.get("analysis:v1:8800000000002") is not None
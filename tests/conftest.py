@@ -0,0 +1,128 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# 프로젝트 루트(main.py 위치)를 import 경로에 추가
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+# database.py는 import 시점에 엔진을 만들기 때문에 테스트용 URL을 미리 넣어둠
+# (실제 접속은 각 테스트에서 필요할 때만 일어남)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("FOOD_API_KEY", "test-food-key")
+os.environ.setdefault("DATA_GO_KR_API_KEY", "test-data-key")
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """서킷 브레이커는 프로세스 전역이라 테스트마다 closed로 되돌림"""
+    import circuit_breaker
+
+    circuit_breaker.reset_breakers()
+    yield
+    circuit_breaker.reset_breakers()
+
+
+@pytest.fixture(autouse=True)
+def reset_bulkhead():
+    """bulkhead 지표도 프로세스 전역이라 테스트마다 초기화"""
+    import bulkhead
+
+    bulkhead.upstream_bulkhead.reset()
+    bulkhead.batch_bulkhead.reset()
+    bulkhead.async_upstream_bulkhead.reset()
+
+
+@pytest.fixture(autouse=True)
+def disable_rate_limit(monkeypatch):
+    """호출량 한도는 tests/test_rate_limiter.py에서만 켬 (다른 테스트의 동시 호출이 줄 서지 않게)"""
+    import rate_limiter
+
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_ENABLED", False)
+    rate_limiter.stats.reset()
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """
+    테이블이 만들어진 SQLite 세션 생성기 (MySQL 대신 사용)
+    - 파일 DB: 스레드마다 별도 연결 (연결 1개를 공유하면 동시 저장 트랜잭션이 서로 섞임)
+    """
+    from database import Base
+    from models import models  # noqa: F401 (테이블 등록)
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def async_session_factory(session_factory):
+    """
+    session_factory와 같은 SQLite 파일을 보는 AsyncSession 생성기 (history / auth 리포지토리용)
+    - NullPool: 테스트마다 asyncio.run으로 새 이벤트 루프를 쓰므로 연결을 루프 사이에 재사용하지 않음
+    """
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    url = session_factory.kw["bind"].url.set(drivername="sqlite+aiosqlite")
+    engine = create_async_engine(url, poolclass=NullPool, connect_args={"timeout": 30})
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture
+def db_session(session_factory):
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def fake_redis():
+    """실제 Redis 대신 사용하는 인메모리 Redis (락 해제에 lua 필요: pip install "fakeredis[lua]")"""
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+class StubAdditiveService:
+    """DB 없이 첨가물 개수를 세는 가짜 AdditiveService"""
+    def calculate_count(self, raw_text: str):
+        found = [x.strip() for x in raw_text.split(",") if x.strip() == "구연산"]
+        return len(found), ", ".join(found)
+
+
+@pytest.fixture
+def upstream():
+    """제품 1개가 들어있는 로컬 스텁 API 서버"""
+    from tests.stub_upstream import StubUpstream, sample_product
+
+    stub = StubUpstream(products=[sample_product("8801234567890", "19780001001123")]).start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def repo(upstream, db_session, session_factory, fake_redis):
+    """스텁 서버 + SQLite + fakeredis에 연결된 FoodRepository"""
+    from cache import LocalTTLCache
+    from repositories.food_repository import FoodRepository
+    from services.score_service import ScoreService
+
+    r = FoodRepository(db=db_session, additive_service=StubAdditiveService(),
+                       score_service=ScoreService(), redis=fake_redis)
+    # 테스트끼리 워커 내부 캐시가 섞이지 않게 새로 만듦
+    r.local_cache = LocalTTLCache(maxsize=100, ttl=60)
+    r.analysis_local_cache = LocalTTLCache(maxsize=100, ttl=60)
+    r.session_factory = session_factory
+    return upstream.point(r)
@@ -0,0 +1,166 @@
+# tests/stub_upstream.py
+"""
+식약처(C005/I1250/C002) + 공공데이터포털(영양성분/이미지) API 흉내내는 로컬 스텁 서버
+- 테스트와 benchmarks/ 스크립트에서 같이 사용
+- delays로 서비스별 응답 지연(초)을 줄 수 있음
+- failures로 서비스별로 다음 N번 호출을 503으로 실패시킬 수 있음
+"""
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, unquote
+
+
+def sample_product(barcode: str, report_no: str, name: str = "테스트 음료") -> dict:
+    """스텁 서버에 넣을 제품 1개 (각 API의 원본 필드명 그대로)"""
+    return {
+        "BAR_CD": barcode,
+        "PRDLST_REPORT_NO": report_no,
+        "PRDLST_NM": name,
+        "BSSH_NM": "테스트식품",
+        "FRMLC_MTRQLT": "PET",
+        "RAWMTRL_NM": "정제수, 설탕, 구연산",
+        "nutConSrtrQua": "500ml",
+        "nat": "20",
+        "sugar": "25",
+        "fasat": "0",
+        "fatrn": "0",
+        "foodLv4Cd": "0101",
+        "foodLv4Nm": "탄산음료",
+        "imgurl1": f"http://img.test/{report_no}.jpg",
+    }
+
+
+class _Unavailable(Exception):
+    pass
+
+
+class StubUpstream:
+    def __init__(self, products=None, delays=None):
+        self.products = list(products or [])
+        self.delays = dict(delays or {})   # {"C005": 0.2, "NUTRI": 0.5, ...}
+        self.failures = {}                 # {"C005": 2} -> 다음 2번은 503
+        self.calls = {}                    # 서비스별 호출 횟수
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    # -----------------------------------------------------
+    # 서버 수명주기
+    # -----------------------------------------------------
+    def start(self) -> "StubUpstream":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive (Content-Length 항상 보냄)
+
+            def do_GET(self):
+                status, body = stub.handle(self.path)
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            request_queue_size = 512  # 동시 연결 수백 개 (부하 테스트/벤치마크)
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def point(self, repo):
+        """FoodRepository의 API 주소를 스텁 서버로 바꿔줌"""
+        repo.base_url_food = f"{self.url}/api"
+        repo.base_url_nutri = f"{self.url}/nutri"
+        repo.base_url_img = f"{self.url}/img"
+        return repo
+
+    # -----------------------------------------------------
+    # 요청 처리
+    # -----------------------------------------------------
+    def handle(self, raw_path: str):
+        try:
+            return self._route(raw_path)
+        except _Unavailable as e:
+            return 503, {"error": f"{e} unavailable (stub)"}
+
+    def _route(self, raw_path: str):
+        parsed = urlparse(raw_path)
+        parts = [unquote(p) for p in parsed.path.strip("/").split("/")]
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+        if parts[0] == "nutri":
+            self._hit("NUTRI")
+            if "itemMnftrRptNo" in query:
+                rows = self._filter("PRDLST_REPORT_NO", query["itemMnftrRptNo"])
+            else:
+                # 보고번호 없이 부르면 전체 목록 페이지 조회 (pageNo, numOfRows)
+                size = int(query.get("numOfRows", "10"))
+                page_no = int(query.get("pageNo", "1"))
+                rows = self.products[(page_no - 1) * size:page_no * size]
+            items = []
+            for r in rows:
+                item = self._pick(r, ["nutConSrtrQua", "nat", "sugar", "fasat", "fatrn", "foodLv4Cd", "foodLv4Nm"])
+                item["itemMnftrRptNo"] = r["PRDLST_REPORT_NO"]
+                items.append(item)
+            return 200, {"response": {"body": {"items": items, "totalCount": len(self.products)}}}
+
+        if parts[0] == "img":
+            self._hit("IMG")
+            rows = self._filter("PRDLST_REPORT_NO", query.get("prdlstReportNo"))
+            items = [{"item": {"imgurl1": r["imgurl1"]}} for r in rows]
+            return 200, {"body": {"items": items}}
+
+        # /api/{key}/{service}/json/{start}/{end}[/FIELD=value]
+        service = parts[2]
+        self._hit(service)
+        start, end = int(parts[4]), int(parts[5])
+        rows = self.products
+        if len(parts) > 6 and "=" in parts[6]:
+            field, value = parts[6].split("=", 1)
+            field = "PRDLST_REPORT_NO" if field == "PRDLST_REPORT_NO" else "BAR_CD"
+            rows = self._filter(field, value)
+        page = rows[start - 1:end]
+        fields = {
+            "C005": ["BAR_CD", "PRDLST_REPORT_NO", "PRDLST_NM", "BSSH_NM"],
+            "I1250": ["PRDLST_REPORT_NO", "FRMLC_MTRQLT"],
+            "C002": ["PRDLST_REPORT_NO", "RAWMTRL_NM"],
+        }[service]
+        return 200, {service: {"total_count": str(len(rows)), "row": [self._pick(r, fields) for r in page]}}
+
+    def _hit(self, service: str):
+        with self._lock:
+            self.calls[service] = self.calls.get(service, 0) + 1
+            failing = self.failures.get(service, 0) > 0
+            if failing:
+                self.failures[service] -= 1
+        delay = self.delays.get(service, 0)
+        if delay:
+            time.sleep(delay)
+        if failing:
+            raise _Unavailable(service)
+
+    def _filter(self, field: str, value):
+        return [p for p in self.products if p.get(field) == value]
+
+    @staticmethod
+    def _pick(row: dict, fields) -> dict:
+        return {f: row.get(f) for f in fields}
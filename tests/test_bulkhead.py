@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from bulkhead import Bulkhead, BulkheadFull, upstream_limit
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_rejects_when_full():
+    """
+    [상한]
+    자리가 다 차면 기다리지 않고 BulkheadFull을 던지고, 나가면 다시 받는지 테스트합니다.
+    """
+    bh = Bulkhead("upstream", limit=2, max_wait=0, retry_after=3)
+
+    with bh.slot(), bh.slot():
+        assert bh.active == 2
+        with pytest.raises(BulkheadFull) as exc:
+            with bh.slot():
+                pass
+        assert exc.value.retry_after == 3
+
+    with bh.slot():
+        pass
+    assert bh.snapshot() == {"limit": 2, "active": 0, "peak": 2, "admitted": 3, "rejected": 1}
+
+
+def test_waits_up_to_max_wait():
+    """
+    [대기]
+    max_wait 안에 자리가 나면 들어가는지 테스트합니다.
+    """
+    bh = Bulkhead("upstream", limit=1, max_wait=1.0)
+    entered = threading.Event()
+
+    def hold():
+        with bh.slot():
+            entered.set()
+            time.sleep(0.1)
+
+    t = threading.Thread(target=hold)
+    t.start()
+    entered.wait()
+    started = time.perf_counter()
+    with bh.slot():
+        waited = time.perf_counter() - started
+    t.join()
+
+    assert 0.05 <= waited < 1.0
+    assert bh.rejected == 0
+
+
+def test_max_wait_is_capped_by_caller():
+    """
+    [대기]
+    호출 쪽 max_wait(남은 예산)가 더 짧으면 그만큼만 기다리는지 테스트합니다.
+    """
+    bh = Bulkhead("upstream", limit=1, max_wait=5.0)
+
+    with bh.slot():
+        started = time.perf_counter()
+        with pytest.raises(BulkheadFull):
+            with bh.slot(max_wait=0.05):
+                pass
+        assert time.perf_counter() - started < 0.5
+
+
+def test_upstream_limit_stays_below_db_pool():
+    """
+    [상한]
+    upstream 상한이 DB 연결 풀(pool_size + max_overflow)보다 크면 풀보다 1 작게 줄이는지 테스트합니다.
+    """
+    assert upstream_limit(16, pool_size=5, max_overflow=10) == 14
+    assert upstream_limit(8, pool_size=5, max_overflow=10) == 8
+    assert upstream_limit(4, pool_size=1, max_overflow=0) == 1
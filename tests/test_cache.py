@@ -0,0 +1,45 @@
+import cache
+
+
+def test_clients_share_one_pool():
+    """
+    get_redis()로 만든 클라이언트들이 같은 연결 풀을 쓰는지 테스트합니다.
+    (실제 Redis 접속은 하지 않음)
+    """
+    try:
+        a = cache.get_redis()
+        b = next(cache.get_redis_client())
+
+        assert a.connection_pool is b.connection_pool
+        stats = cache.get_pool_stats()
+        assert stats["initialized"] is True
+        assert stats["max_connections"] == cache.REDIS_MAX_CONNECTIONS
+        assert stats["in_use_connections"] == 0
+    finally:
+        cache.close_redis_pool()
+
+    assert cache.get_pool_stats()["initialized"] is False
+
+
+def test_local_cache_lru_and_ttl():
+    """
+    LocalTTLCache가 크기 초과 시 가장 오래 안 쓴 항목을 버리고,
+    TTL이 지난 항목은 반환하지 않는지 테스트합니다.
+    """
+    local = cache.LocalTTLCache(maxsize=2, ttl=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")          # a를 최근 사용으로
+    local.set("c", 3)       # b가 밀려남
+
+    assert local.get("b") is None
+    assert local.get("a") == 1
+    assert local.get("c") == 3
+
+    local.set("d", 4, ttl=0)
+    assert local.get("d") is None
+
+    stats = local.stats()
+    assert stats["evictions"] == 2
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 3
@@ -0,0 +1,117 @@
+from circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock):
+    return CircuitBreaker("C005", failure_rate=0.5, min_calls=4, window_sec=60,
+                          open_sec=30, half_open_calls=2, clock=clock)
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_opens_when_failure_rate_reaches_threshold():
+    """
+    [open]
+    최소 호출 수를 채우고 실패율이 기준 이상이면 열리고, 열린 동안은 호출을 막는지 테스트합니다.
+    """
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED      # 최소 호출 수(4) 전에는 안 열림
+
+    breaker.record_success()
+    assert breaker.state == OPEN        # 3/4 = 75%
+    assert breaker.allow() is False
+    assert breaker.retry_after() == 30
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_old_failures_leave_the_window():
+    """
+    [슬라이딩 윈도우]
+    window_sec보다 오래된 실패는 실패율 계산에서 빠지는지 테스트합니다.
+    """
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 61
+    breaker.record_failure()
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["calls"] == 2
+
+
+def test_half_open_probes_close_on_success():
+    """
+    [half_open -> closed]
+    open_sec가 지나면 시험 호출을 half_open_calls개만 내보내고, 모두 성공하면 닫히는지 테스트합니다.
+    """
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.allow() is True
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False     # 시험 호출은 2개까지
+
+    breaker.record_success()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow() is True
+
+
+def test_half_open_probe_failure_reopens():
+    """
+    [half_open -> open]
+    시험 호출이 하나라도 실패하면 다시 open_sec 동안 열리는지 테스트합니다.
+    """
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.allow() is True
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+    assert breaker.snapshot()["opened_count"] == 2
+
+
+def test_lost_probe_is_replaced_after_open_sec():
+    """
+    [시험 호출 유실]
+    시험 호출 결과가 오지 않아도(요청 취소 등) open_sec 뒤에는 새 시험 호출을 내보내는지 테스트합니다.
+    """
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.allow() and breaker.allow()
+    assert breaker.allow() is False
+
+    clock.now += 30
+    assert breaker.allow() is True
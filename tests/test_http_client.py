@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+
+import http_client
+from tests.stub_upstream import StubUpstream, sample_product
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+@pytest.fixture
+def stub():
+    s = StubUpstream(products=[sample_product("8801234567890", "19780001001123")]).start()
+    yield s
+    s.stop()
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients(monkeypatch):
+    """테스트마다 새 세션/지표, 재시도 대기는 짧게"""
+    monkeypatch.setattr(http_client, "UPSTREAM_HTTP_BACKOFF_BASE", 0.001)
+    http_client.close_http_session()
+    http_client.retry_stats.reset()
+    http_client.async_stats.reset()
+    yield
+    http_client.close_http_session()
+
+
+def c005_url(stub) -> str:
+    return f"{stub.url}/api/key/C005/json/1/5/BAR_CD=8801234567890"
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_sync_requests_reuse_one_connection(stub):
+    """
+    [keep-alive]
+    같은 호스트로 10번 GET 해도 TCP 연결은 1개만 맺고 재사용하는지 테스트합니다.
+    """
+    for _ in range(10):
+        assert http_client.http_get(c005_url(stub), timeout=3).status_code == 200
+
+    host = stub.url.split("//")[1]
+    stats = http_client.get_http_stats()["hosts"][host]
+    assert stats["requests"] == 10
+    assert stats["new_connections"] == 1
+    assert stats["reuse_ratio"] == 0.9
+
+
+def test_sync_retries_503_then_succeeds(stub):
+    """
+    [재시도]
+    일시적인 503은 백오프 후 다시 요청해서 성공 응답을 돌려주는지 테스트합니다.
+    """
+    stub.failures = {"C005": 2}
+
+    r = http_client.http_get(c005_url(stub), timeout=3)
+
+    assert r.status_code == 200
+    assert stub.calls["C005"] == 3
+    assert http_client.get_http_stats()["retries"][stub.url.split("//")[1]]["retries"] == 2
+
+
+def test_before_attempt_runs_for_every_request(stub):
+    """
+    [시도마다 훅]
+    before_attempt(호출량 한도 토큰)가 첫 요청과 재시도마다 한 번씩 불리고,
+    훅에서 난 예외는 요청 없이 그대로 나가는지 테스트합니다.
+    """
+    stub.failures = {"C005": 2}
+    attempts = []
+
+    r = http_client.http_get(c005_url(stub), timeout=3, before_attempt=lambda: attempts.append(1))
+
+    assert r.status_code == 200
+    assert len(attempts) == stub.calls["C005"] == 3
+
+    def refuse():
+        raise RuntimeError("no token")
+
+    with pytest.raises(RuntimeError):
+        http_client.http_get(c005_url(stub), timeout=3, before_attempt=refuse)
+    assert stub.calls["C005"] == 3
+
+
+def run_async(coro_fn):
+    """공유 AsyncClient는 이벤트 루프에 묶이므로 asyncio.run 안에서 만들고 닫음"""
+    pytest.importorskip("httpx")
+
+    async def run():
+        try:
+            return await coro_fn()
+        finally:
+            await http_client.close_async_http_client()
+    return asyncio.run(run())
+
+
+def test_async_requests_reuse_one_connection(stub):
+    """
+    [keep-alive - 비동기]
+    비동기 클라이언트도 같은 호스트로 10번 GET 할 때 연결 1개를 재사용하고,
+    현황은 동기와 같은 hosts 항목에 합쳐서 나오는지 테스트합니다.
+    """
+    async def fetch_ten():
+        return [(await http_client.http_get_async(c005_url(stub), timeout=3)).status_code for _ in range(10)]
+
+    assert run_async(fetch_ten) == [200] * 10
+
+    stats = http_client.get_http_stats()["hosts"][stub.url.split("//")[1]]
+    assert stats["requests"] == 10
+    assert stats["new_connections"] == 1
+    assert stats["reuse_ratio"] == 0.9
+
+
+def test_async_before_attempt_runs_for_every_request(stub):
+    """
+    [시도마다 훅 - 비동기]
+    503 재시도까지 before_attempt 코루틴이 시도마다 한 번씩 불리는지 테스트합니다.
+    """
+    stub.failures = {"C005": 2}
+    attempts = []
+
+    async def take_token():
+        attempts.append(1)
+
+    async def fetch():
+        return await http_client.http_get_async(c005_url(stub), timeout=3, before_attempt=take_token)
+
+    assert run_async(fetch).status_code == 200
+    assert len(attempts) == stub.calls["C005"] == 3
+
+
+def test_sync_gives_up_after_max_retries(stub):
+    """
+    [재시도 한도]
+    계속 503이면 UPSTREAM_HTTP_RETRIES번까지만 재시도하고 마지막 응답을 그대로 돌려주는지 테스트합니다.
+    """
+    stub.failures = {"C005": 10}
+
+    r = http_client.http_get(c005_url(stub), timeout=3)
+
+    assert r.status_code == 503
+    assert stub.calls["C005"] == http_client.UPSTREAM_HTTP_RETRIES + 1
+
+
+def test_backoff_has_jitter_and_cap(monkeypatch):
+    """
+    [백오프]
+    대기시간이 0 ~ min(MAX, BASE * 2^attempt) 사이에서 매번 달라지는지 테스트합니다.
+    """
+    monkeypatch.setattr(http_client, "UPSTREAM_HTTP_BACKOFF_BASE", 0.1)
+    monkeypatch.setattr(http_client, "UPSTREAM_HTTP_BACKOFF_MAX", 0.3)
+
+    samples = [http_client._backoff(5) for _ in range(50)]
+
+    assert all(0 <= s <= 0.3 for s in samples)
+    assert len(set(samples)) > 1
@@ -0,0 +1,183 @@
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+import migrations
+from tests.conftest import StubAdditiveService
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+@pytest.fixture
+def engine(tmp_path):
+    """빈 SQLite 파일 DB (테이블은 각 테스트에서 마이그레이션으로 만듦)"""
+    e = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    yield e
+    e.dispose()
+
+
+@pytest.fixture
+def captured_sql(engine):
+    """리포지토리가 실제로 보낸 SELECT 문과 파라미터 기록"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+def query_plan(engine, statement: str, parameters) -> str:
+    """SQLite EXPLAIN QUERY PLAN 결과의 detail 줄을 합친 문자열"""
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def assert_uses_index(plan: str, table: str, index: str):
+    assert f"SCAN {table}\n" not in plan + "\n", plan
+    assert index in plan, plan
+
+
+def schema_snapshot(engine) -> dict:
+    """표별 컬럼(이름/타입/NULL/PK) + 인덱스 + 유니크 + 외래키 (schema_migrations 제외)"""
+    inspector = inspect(engine)
+    snapshot = {}
+    for table in inspector.get_table_names():
+        if table == migrations.schema_migrations.name:
+            continue
+        snapshot[table] = {
+            "columns": sorted((c["name"], str(c["type"]), c["nullable"], c["primary_key"])
+                              for c in inspector.get_columns(table)),
+            "indexes": sorted((i["name"], tuple(i["column_names"]), bool(i["unique"]))
+                              for i in inspector.get_indexes(table)),
+            "unique": sorted(tuple(u["column_names"]) for u in inspector.get_unique_constraints(table)),
+            "foreign_keys": sorted((tuple(f["constrained_columns"]), f["referred_table"],
+                                    tuple(f["referred_columns"]), f["options"].get("ondelete"))
+                                   for f in inspector.get_foreign_keys(table)),
+        }
+    return snapshot
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_upgrade_creates_schema_and_is_idempotent(engine):
+    """
+    [마이그레이션]
+    빈 DB에 테이블과 인덱스를 만들고 버전을 기록하며, 다시 실행하면 아무것도 하지 않는지 테스트합니다.
+    """
+    assert [m.VERSION for m in migrations.pending_migrations(engine)] == [1, 2, 3]
+
+    assert migrations.upgrade(engine) == [1, 2, 3]
+    assert migrations.upgrade(engine) == []
+    assert migrations.applied_versions(engine) == [1, 2, 3]
+    assert migrations.pending_migrations(engine) == []
+
+    inspector = inspect(engine)
+    assert {"ix_foods_prdlst_report_no", "ix_foods_category_code_report_no"} <= {
+        i["name"] for i in inspector.get_indexes("foods")}
+    assert {i["name"] for i in inspector.get_indexes("scan_history")} == {"ix_scan_history_user_cursor"}
+
+
+def test_upgrade_matches_models_create_all(engine, tmp_path):
+    """
+    [마이그레이션]
+    빈 DB에 마이그레이션만 적용한 스키마가 현재 모델로 create_all 한 스키마와 같은지 테스트합니다.
+    (버전 파일에 적어둔 DDL과 모델이 어긋나면 실패 -> 모델을 바꿨으면 새 버전 추가)
+    """
+    from database import Base
+    from models import models  # noqa: F401 (테이블 등록)
+
+    migrations.upgrade(engine)
+    expected_engine = create_engine(f"sqlite:///{tmp_path / 'create_all.db'}")
+    try:
+        Base.metadata.create_all(bind=expected_engine)
+        assert schema_snapshot(engine) == schema_snapshot(expected_engine)
+    finally:
+        expected_engine.dispose()
+
+
+def test_indexes_are_added_to_existing_tables(engine):
+    """
+    [기존 DB]
+    예전 create_all로 만든(인덱스 없는) 운영 DB에도 표를 건드리지 않고 인덱스만 추가되는지 테스트합니다.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE foods (food_id INTEGER PRIMARY KEY, barcode VARCHAR(50) UNIQUE, "
+                          "prdlst_report_no VARCHAR(50), category_code VARCHAR(32), name VARCHAR(300))"))
+        conn.execute(text("INSERT INTO foods (food_id, barcode, prdlst_report_no, category_code, name) "
+                          "VALUES (1, '8801234567890', 'R1', 'C1', '기존 제품')"))
+
+    migrations.upgrade(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT name FROM foods")).scalar_one() == "기존 제품"
+    assert "ix_foods_category_code_report_no" in {i["name"] for i in inspect(engine).get_indexes("foods")}
+
+
+def test_cursor_index_replaces_v0002_index(engine):
+    """
+    [v0003]
+    v0002까지 적용된 DB의 스캔 기록 인덱스가 커서 페이지용 인덱스로 교체되는지 테스트합니다.
+    (각 버전의 DDL이 고정돼 있으므로 target=2면 v0002 시점 인덱스가 그대로 만들어짐)
+    """
+    migrations.upgrade(engine, target=2)
+    assert {i["name"] for i in inspect(engine).get_indexes("scan_history")} == {"ix_scan_history_user_scanned"}
+
+    assert migrations.upgrade(engine) == [3]
+    assert {i["name"] for i in inspect(engine).get_indexes("scan_history")} == {"ix_scan_history_user_cursor"}
+
+
+def test_repository_queries_use_indexes(engine, captured_sql, fake_redis):
+    """
+    [EXPLAIN]
+    get_food_by_report_no / find_alternatives / 스캔 기록 목록·커서 페이지 쿼리가 표 전체를 훑지 않고
+    마이그레이션으로 만든 인덱스를 쓰는지 테스트합니다.
+    """
+    if engine.dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN 결과 형식은 SQLite 전용 (MySQL EXPLAIN은 다른 형식)")
+    from repositories.food_repository import FoodRepository
+    from repositories.history_repository import history_list_query, history_page_query
+    from services.score_service import ScoreService
+
+    migrations.upgrade(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        food_repo = FoodRepository(db=db, additive_service=StubAdditiveService(),
+                                   score_service=ScoreService(), redis=fake_redis)
+
+        captured_sql.clear()
+        food_repo.get_food_by_report_no("19780001001123")
+        assert_uses_index(query_plan(engine, *captured_sql[0]), "foods", "ix_foods_prdlst_report_no")
+
+        captured_sql.clear()
+        food_repo.find_alternatives("C1", "19780001001123")
+        assert_uses_index(query_plan(engine, *captured_sql[0]), "foods", "ix_foods_category_code_report_no")
+
+        captured_sql.clear()
+        # HistoryRepository(AsyncSession)와 같은 쿼리를 동기 세션으로 실행해서 SQL만 받아옴
+        db.execute(history_list_query(1, 0, 20)).all()
+        plan = query_plan(engine, *captured_sql[0])
+        # 필요한 컬럼만 조회하므로 scan_history 표 본문은 읽지 않음
+        assert_uses_index(plan, "scan_history", "COVERING INDEX ix_scan_history_user_cursor")
+        # 최신순 정렬도 인덱스 순서로 (따로 정렬하지 않음)
+        assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+
+        # 커서 페이지: 커서 위치부터 인덱스 범위 검색, 정렬 없음
+        from datetime import datetime
+        from repositories.history_repository import encode_history_cursor
+        from models.models import ScanHistory
+
+        cursor = encode_history_cursor(ScanHistory(scan_id=10, scanned_at=datetime(2024, 1, 1)))
+        captured_sql.clear()
+        db.execute(history_page_query(1, cursor, 20)).all()
+        plan = query_plan(engine, *captured_sql[0])
+        assert_uses_index(plan, "scan_history", "ix_scan_history_user_cursor")
+        assert "TEMP B-TREE" not in plan
+    finally:
+        db.close()
@@ -0,0 +1,162 @@
+import fakeredis
+import pytest
+
+import rate_limiter
+from rate_limiter import QuotaExceeded, RateLimitPolicy, INTERACTIVE, BACKGROUND
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+@pytest.fixture
+def redis(monkeypatch):
+    # 등록된 Lua 스크립트도 테스트마다 새로
+    monkeypatch.setattr(rate_limiter, "_acquire_script", None)
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def limit(monkeypatch):
+    """한도를 켜고 C005 정책을 테스트 값으로 바꿈"""
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_ENABLED", True)
+
+    def _set(per_sec=10.0, burst=2.0, daily=0):
+        monkeypatch.setitem(rate_limiter._policies, "C005", RateLimitPolicy(per_sec, burst, daily))
+    return _set
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_burst_then_shed(redis, limit):
+    """
+    [초당 한도]
+    버킷에 쌓인 만큼은 바로 통과하고, 기다릴 수 없으면(max_wait=0) 바로 포기하는지 테스트합니다.
+    """
+    limit(per_sec=1, burst=2)
+
+    assert rate_limiter.acquire(redis, "C005", "key", INTERACTIVE, max_wait=0) == 0
+    assert rate_limiter.acquire(redis, "C005", "key", INTERACTIVE, max_wait=0) == 0
+    with pytest.raises(QuotaExceeded) as exc:
+        rate_limiter.acquire(redis, "C005", "key", INTERACTIVE, max_wait=0)
+
+    assert exc.value.reason == "rate"
+    assert exc.value.retry_after >= 1
+    assert rate_limiter.stats.snapshot()["C005"][INTERACTIVE] == {"allowed": 2, "shed": 1}
+
+
+def test_queues_until_token_refills(redis, limit):
+    """
+    [대기]
+    토큰이 곧 채워지면 최대 대기 시간 안에서 줄 섰다가 통과하는지 테스트합니다.
+    """
+    limit(per_sec=10, burst=1)
+
+    rate_limiter.acquire(redis, "C005", "key", INTERACTIVE)
+    waited = rate_limiter.acquire(redis, "C005", "key", INTERACTIVE, max_wait=0.5)
+
+    assert 0.05 <= waited < 0.5
+    entry = rate_limiter.stats.snapshot()["C005"][INTERACTIVE]
+    assert entry["allowed"] == 2
+    assert entry["queued"] == 1
+
+
+def test_keys_have_separate_buckets(redis, limit):
+    """
+    [API 키별]
+    API 키가 다르면 버킷도 따로 쓰는지 테스트합니다.
+    """
+    limit(per_sec=1, burst=1)
+
+    rate_limiter.acquire(redis, "C005", "key-a", INTERACTIVE, max_wait=0)
+    rate_limiter.acquire(redis, "C005", "key-b", INTERACTIVE, max_wait=0)
+    with pytest.raises(QuotaExceeded):
+        rate_limiter.acquire(redis, "C005", "key-a", INTERACTIVE, max_wait=0)
+
+
+def test_background_leaves_reserve_for_interactive(redis, limit):
+    """
+    [우선순위]
+    background는 버킷의 일부를 남겨두고 멈추고, 남은 토큰은 interactive가 쓸 수 있는지 테스트합니다.
+    """
+    limit(per_sec=0.1, burst=4)  # reserve 0.5 -> background는 2개까지
+
+    rate_limiter.acquire(redis, "C005", "key", BACKGROUND, max_wait=0)
+    rate_limiter.acquire(redis, "C005", "key", BACKGROUND, max_wait=0)
+    with pytest.raises(QuotaExceeded):
+        rate_limiter.acquire(redis, "C005", "key", BACKGROUND, max_wait=0)
+
+    assert rate_limiter.acquire(redis, "C005", "key", INTERACTIVE, max_wait=0) == 0
+    assert rate_limiter.acquire(redis, "C005", "key", INTERACTIVE, max_wait=0) == 0
+
+
+def test_daily_limit_and_background_share(redis, limit):
+    """
+    [일일 한도]
+    background는 일일 한도의 일부(80%)까지만 쓰고, interactive는 한도 끝까지 쓴 뒤 daily로 막히는지 테스트합니다.
+    """
+    limit(per_sec=1000, burst=1000, daily=5)
+
+    for _ in range(4):
+        rate_limiter.acquire(redis, "C005", "key", BACKGROUND)
+    with pytest.raises(QuotaExceeded) as exc:
+        rate_limiter.acquire(redis, "C005", "key", BACKGROUND)
+    assert exc.value.reason == "daily"
+
+    rate_limiter.acquire(redis, "C005", "key", INTERACTIVE)
+    with pytest.raises(QuotaExceeded) as exc:
+        rate_limiter.acquire(redis, "C005", "key", INTERACTIVE)
+    assert exc.value.reason == "daily"
+    assert 0 < exc.value.retry_after <= 86401
+
+
+def test_quota_stats(redis, limit, monkeypatch):
+    """
+    [지표]
+    /status/upstream-quota 응답에 오늘 사용량과 사용 비율이 나오는지 테스트합니다.
+    """
+    monkeypatch.setenv("FOOD_API_KEY", "food-key")
+    limit(per_sec=10, burst=10, daily=100)
+
+    for _ in range(3):
+        rate_limiter.acquire(redis, "C005", "food-key", INTERACTIVE)
+    stats = rate_limiter.get_quota_stats(redis)
+
+    entry = stats["steps"]["C005"]
+    assert stats["enabled"] is True
+    assert entry["used_today"] == 3
+    assert entry["daily_usage_ratio"] == 0.03
+    assert entry["background_daily_limit"] == 80
+    assert entry["local"][INTERACTIVE]["allowed"] == 3
+
+
+def test_lua_script_is_registered_once(redis, limit, monkeypatch):
+    """
+    [스크립트 재사용]
+    Lua 스크립트는 첫 acquire 때 1번만 등록하고, 이후 호출은 같은 Script 객체로 실행하는지 테스트합니다.
+    """
+    limit(burst=10.0)
+    registered = []
+    original = redis.register_script
+    monkeypatch.setattr(redis, "register_script", lambda script: registered.append(script) or original(script))
+
+    for _ in range(5):
+        rate_limiter.acquire(redis, "C005", "key", INTERACTIVE, max_wait=0)
+
+    assert len(registered) == 1
+    assert rate_limiter.stats.snapshot()["C005"][INTERACTIVE]["allowed"] == 5
+
+
+def test_redis_error_fails_open(limit, monkeypatch):
+    """
+    [Redis 장애]
+    Redis를 못 쓰면 한도 없이 통과시키는지 테스트합니다. (조회 자체를 막지 않음)
+    """
+    limit()
+    monkeypatch.setattr(rate_limiter, "_acquire_script", None)
+
+    class BrokenRedis:
+        def register_script(self, script):
+            raise ConnectionError("redis down")
+
+    assert rate_limiter.acquire(BrokenRedis(), "C005", "key", INTERACTIVE) == 0.0
@@ -0,0 +1,233 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import cache
+import database
+from models.models import Food, ScanHistory, User
+
+TestClient = pytest.importorskip("fastapi.testclient").TestClient
+
+# -------------------------------------------------------------------
+# 테스트 설정 및 픽스처(Fixture)
+# -------------------------------------------------------------------
+
+def make_async(path):
+    """같은 SQLite 파일의 AsyncSession 생성기 (history 엔드포인트용, 요청마다 새 연결)"""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    return async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool),
+                              expire_on_commit=False)
+
+
+def make_db(path) -> sessionmaker:
+    """유저 2명 + 제품 1개가 들어있는 SQLite 파일 DB"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    database.Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.add_all([User(user_id=1, login_id="u1", password_hash="x"), User(user_id=2, login_id="u2", password_hash="x"),
+                Food(food_id=1, barcode="8801234567890", prdlst_report_no="R1", category_code="C1", name="음료")])
+    db.commit()
+    db.close()
+    return factory
+
+
+@pytest.fixture
+def primary(tmp_path):
+    return make_db(tmp_path / "primary.db")
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """
+    read-your-writes 표시용 fakeredis (동기 / redis.asyncio 클라이언트가 같은 서버를 봄)
+    비동기 클라이언트는 호출마다 새로 만듦 (테스트마다 이벤트 루프가 다름)
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(cache, "get_async_redis",
+                        lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch, fake_redis):
+    """
+    읽기 복제본 1개 설정 (primary와 같은 스키마, 스캔 기록은 아직 복제 안 된 상태)
+    동기 세션(foods 조회)과 AsyncSession(history) 둘 다 같은 복제본 파일로
+    """
+    pytest.importorskip("aiosqlite")
+    factory = make_db(tmp_path / "replica.db")
+    monkeypatch.setattr(database, "_replica_sessionmakers", [factory])
+    monkeypatch.setattr(database, "_async_replica_sessionmakers", [make_async(tmp_path / "replica.db")])
+    monkeypatch.setattr(cache, "get_redis", lambda: fake_redis)
+    return factory
+
+
+@pytest.fixture
+def async_primary(tmp_path, primary):
+    pytest.importorskip("aiosqlite")
+    return make_async(tmp_path / "primary.db")
+
+
+@pytest.fixture
+def client(async_primary):
+    from routers import history_router
+
+    async def primary_db():
+        async with async_primary() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(history_router.router)
+    app.dependency_overrides[database.get_async_db] = primary_db
+    with TestClient(app) as c:
+        yield c
+
+
+def as_request(user_id=None):
+    """get_read_db에 넘길 요청 (request.state.user_id만 사용)"""
+    state = SimpleNamespace(user_id=user_id) if user_id is not None else SimpleNamespace()
+    return SimpleNamespace(state=state)
+
+
+def add_scan(factory, user_id: int = 1):
+    db = factory()
+    db.add(ScanHistory(user_id=user_id, food_id=1, score_total=70, grade="C"))
+    db.commit()
+    db.close()
+
+# -------------------------------------------------------------------
+# 테스트 케이스
+# -------------------------------------------------------------------
+
+def test_reads_go_to_replica(client, primary, replica):
+    """
+    [복제본 라우팅]
+    GET /history/me는 복제본에서 읽는지 테스트합니다. (primary에만 있는 기록은 아직 안 보임)
+    """
+    add_scan(primary)
+
+    assert client.get("/history/me", params={"user_id": 1}).json() == []
+
+    add_scan(replica)
+    assert len(client.get("/history/me", params={"user_id": 1}).json()) == 1
+
+
+def test_read_your_writes_sticks_to_primary(client, primary, async_primary, replica, fake_redis):
+    """
+    [read-your-writes]
+    기록을 남긴 유저는 잠시 동안 primary에서 읽어 방금 기록이 바로 보이고,
+    다른 유저는 계속 복제본에서 읽는지 테스트합니다.
+    """
+    from repositories.history_repository import HistoryRepository
+
+    async def save():
+        async with async_primary() as db:
+            await HistoryRepository(db=db).create_scan_history(1, "8801234567890", 70, "C", 70, 70, 70, 1, 1, 1)
+
+    asyncio.run(save())
+    add_scan(primary, user_id=2)
+
+    assert fake_redis.ttl("ryw:user:1") > 0
+    assert len(client.get("/history/me", params={"user_id": 1}).json()) == 1
+    assert client.get("/history/me", params={"user_id": 2}).json() == []
+
+
+def test_delete_sticks_to_primary(client, primary, replica, fake_redis):
+    """
+    [read-your-writes]
+    DELETE /history/{scan_id}도 기록 변경으로 보고, 그 유저의 다음 조회는 primary에서 읽는지 테스트합니다.
+    (복제본에는 아직 지워지지 않은 기록이 남아 있음)
+    """
+    add_scan(primary)
+    add_scan(replica)
+
+    # 다른 유저의 기록은 지울 수 없음 (표시도 남기지 않음)
+    assert client.delete("/history/1", params={"user_id": 2}).status_code == 404
+    assert fake_redis.exists("ryw:user:2") == 0
+
+    assert client.delete("/history/1", params={"user_id": 1}).status_code == 204
+    assert fake_redis.ttl("ryw:user:1") > 0
+    assert client.get("/history/me", params={"user_id": 1}).json() == []
+
+
+def test_without_replica_reads_share_request_session(primary):
+    """
+    [복제본 없음]
+    READ_REPLICA_URLS가 없으면 조회 세션이 요청의 primary 세션 그대로인지 테스트합니다. (연결을 더 쓰지 않음)
+    """
+    db = primary()
+    try:
+        reads = database.get_read_db(as_request(1), db=db)
+        assert next(reads) is db
+    finally:
+        db.close()
+
+
+def test_redis_error_falls_back_to_primary(primary, replica, monkeypatch):
+    """
+    [실패 케이스]
+    최근 기록 여부를 Redis에서 확인할 수 없으면 primary에서 읽는지 테스트합니다.
+    """
+    def broken():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(cache, "get_redis", broken)
+    db = primary()
+    try:
+        assert next(database.get_read_db(as_request(1), db=db)) is db
+        # 유저가 없는 조회(추천 등)는 Redis를 보지 않고 복제본
+        assert next(database.get_read_db(as_request(), db=db)) is not db
+    finally:
+        db.close()
+
+
+def test_food_repository_reads_from_replica(primary, replica, fake_redis):
+    """
+    [FoodRepository]
+    get_food_repository로 만든 리포지토리는 보고번호 조회/추천 후보를 복제본에서 읽고,
+    저장은 primary 세션으로 하는지 테스트합니다.
+    """
+    from repositories.food_repository import get_food_repository
+    from services.score_service import ScoreService
+    from tests.conftest import StubAdditiveService
+
+    db, read_db = primary(), replica()
+    try:
+        repo = get_food_repository(db=db, read_db=read_db, additive_service=StubAdditiveService(),
+                                   score_service=ScoreService(), redis=fake_redis)
+        read_db.query(Food).filter(Food.food_id == 1).update({"name": "복제본 음료"})
+        read_db.commit()
+
+        assert repo.get_food_by_report_no("R1").name == "복제본 음료"
+        assert [f.name for f in repo.find_alternatives("C1", "R0")] == ["복제본 음료"]
+        assert repo.db is db
+    finally:
+        db.close()
+        read_db.close()
+
+
+def test_read_session_does_not_take_user_id():
+    """
+    [요청 유저]
+    조회 세션(get_read_db)을 쓰는 엔드포인트의 OpenAPI에 user_id 쿼리 파라미터가 생기지 않는지 테스트합니다.
+    (클라이언트가 ?user_id=로 primary에 고정할 수 없음)
+    """
+    from fastapi import Depends
+    from repositories.food_repository import get_food_repository
+
+    app = FastAPI()
+
+    @app.get("/foods/report/{report_no}")
+    def by_report_no(report_no: str, repo=Depends(get_food_repository)):
+        return None
+
+    op = app.openapi()["paths"]["/foods/report/{report_no}"]["get"]
+    assert [p["name"] for p in op["parameters"]] == ["report_no"]